@@ -0,0 +1,379 @@
+"""End-to-end latency and throughput of the MCP server over stdio.
+
+Starts the mock REST server (benchmarks/mock_server.py) on a background
+thread, launches mcp-obsidian as a subprocess pointed at it and drives it
+over real MCP stdio with scripted agent workloads. Reports p50/p95/p99
+latency per tool, throughput, and the server process's CPU time and peak
+RSS. Results are written as JSON so runs can be compared across commits.
+
+Usage:
+    uv run python benchmarks/bench_e2e.py [--workload mixed] [--calls 500] [--concurrency 4]
+    uv run python benchmarks/bench_e2e.py --output before.json
+    uv run python benchmarks/bench_e2e.py --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import resource
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_server import Faults, MockVault, running  # noqa: E402
+from vault_gen import WORDS as VAULT_WORDS  # noqa: E402
+
+Call = tuple[str, dict]
+CallFactory = Callable[[random.Random, "Corpus"], Call]
+
+# Words that are also tags in generated vaults
+WORDS = VAULT_WORDS[:12]
+H1 = re.compile(r"^# (.+)$", re.MULTILINE)
+H2 = re.compile(r"^## (.+)$", re.MULTILINE)
+
+
+class Corpus:
+    """What the workloads know about the vault: note paths and headings."""
+
+    def __init__(self, vault: MockVault):
+        self.notes = sorted(p for p in vault.notes if p.endswith(".md") and "/" in p)
+        self.folders = sorted({p.rsplit("/", 1)[0] for p in self.notes})
+        self.headings = {}
+        for path in self.notes:
+            content = vault.notes[path].content
+            title, sections = H1.search(content), H2.findall(content)
+            if title and sections:
+                self.headings[path] = [f"{title.group(1)}::{s}" for s in sections]
+        self.sectioned = sorted(self.headings)
+
+    def note(self, rng: random.Random) -> str:
+        return rng.choice(self.notes)
+
+    def heading(self, rng: random.Random) -> tuple[str, str]:
+        path = rng.choice(self.sectioned)
+        return path, rng.choice(self.headings[path])
+
+
+def read_note(rng, corpus):
+    return "obsidian_get_file_contents", {"filepath": corpus.note(rng)}
+
+
+def read_batch(rng, corpus):
+    return "obsidian_batch_get_file_contents", {
+        "filepaths": [corpus.note(rng) for _ in range(5)]
+    }
+
+
+def list_dir(rng, corpus):
+    return "obsidian_list_files_in_dir", {"dirpath": rng.choice(corpus.folders)}
+
+
+def outline(rng, corpus):
+    return "obsidian_get_outline", {"filepath": rng.choice(corpus.sectioned)}
+
+
+def section(rng, corpus):
+    path, heading = corpus.heading(rng)
+    return "obsidian_get_section", {"filepath": path, "target_type": "heading", "target": heading}
+
+
+def resolve(rng, corpus):
+    name = corpus.note(rng).rsplit("/", 1)[-1][:-3]
+    return "obsidian_resolve_note", {"query": name[: rng.randint(3, len(name))].lower()}
+
+
+def patch_heading(rng, corpus):
+    path, heading = corpus.heading(rng)
+    return "obsidian_patch_content", {
+        "filepath": path,
+        "operation": rng.choice(["append", "append", "prepend"]),
+        "target_type": "heading",
+        "target": heading,
+        "content": f"- {' '.join(rng.choices(WORDS, k=6))}",
+    }
+
+
+def patch_frontmatter(rng, corpus):
+    return "obsidian_patch_content", {
+        "filepath": rng.choice(corpus.sectioned),
+        "operation": "replace",
+        "target_type": "frontmatter",
+        "target": "status",
+        "content": rng.choice(["todo", "active", "done"]),
+    }
+
+
+def append(rng, corpus):
+    return "obsidian_append_content", {
+        "filepath": corpus.note(rng),
+        "content": f"\n{' '.join(rng.choices(WORDS, k=10))}\n",
+    }
+
+
+def simple_search(rng, corpus):
+    # A note title: selective, like most agent searches
+    return "obsidian_simple_search", {"query": corpus.note(rng).rsplit("/", 1)[-1][:-3].lower()}
+
+
+def complex_search(rng, corpus):
+    return "obsidian_complex_search", {"query": {"in": [rng.choice(WORDS), {"var": "tags"}]}}
+
+
+def dataview(rng, corpus):
+    return "obsidian_dataview_query", {
+        "query": f"TABLE status, rating FROM #{rng.choice(WORDS)} SORT rating DESC LIMIT 20"
+    }
+
+
+def recent_changes(rng, corpus):
+    return "obsidian_get_recent_changes", {"limit": 10, "days": rng.choice([7, 30, 90])}
+
+
+# Weighted call mixes
+WORKLOADS: dict[str, list[tuple[int, CallFactory]]] = {
+    "read": [(60, read_note), (15, list_dir), (10, read_batch), (10, section), (5, outline)],
+    "patch": [(50, patch_heading), (20, patch_frontmatter), (20, append), (10, read_note)],
+    "search": [(40, simple_search), (25, complex_search), (25, dataview), (10, recent_changes)],
+    "mixed": [
+        (10, resolve),
+        (10, outline),
+        (15, section),
+        (20, read_note),
+        (15, simple_search),
+        (5, dataview),
+        (5, recent_changes),
+        (10, patch_heading),
+        (5, append),
+        (5, list_dir),
+    ],
+}
+
+
+def script(workload: str, corpus: Corpus, calls: int, seed: int) -> list[Call]:
+    rng = random.Random(seed)
+    weights, factories = zip(*WORKLOADS[workload])
+    return [rng.choices(factories, weights)[0](rng, corpus) for _ in range(calls)]
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "calls": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+    }
+
+
+def children_peak_rss_mb() -> float | None:
+    """Peak RSS of this process's live children, from /proc (Linux only)."""
+    if not os.path.isdir("/proc"):
+        return None
+    peak = None
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                fields = dict(line.split(":", 1) for line in f if ":" in line)
+        except OSError:
+            continue
+        if int(fields.get("PPid", "0")) == os.getpid() and "VmHWM" in fields:
+            peak = max(peak or 0.0, int(fields["VmHWM"].split()[0]) / 1024)
+    return peak
+
+
+async def run_workload(args, command: list[str], env: dict, calls: list[Call]) -> dict:
+    params = StdioServerParameters(command=command[0], args=command[1:], env=env)
+    samples: dict[str, list[float]] = {}
+    errors: dict[str, int] = {}
+    response_bytes = 0
+    queue = iter(enumerate(calls))
+
+    async def worker(session: ClientSession):
+        nonlocal response_bytes
+        for index, (tool, arguments) in queue:
+            start = time.perf_counter()
+            result = await session.call_tool(tool, arguments)
+            elapsed = time.perf_counter() - start
+            if index < args.warmup:
+                continue
+            samples.setdefault(tool, []).append(elapsed)
+            errors[tool] = errors.get(tool, 0) + bool(result.isError)
+            response_bytes += sum(len(getattr(c, "text", "")) for c in result.content)
+
+    cpu_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    with open(os.devnull, "w") as errlog:
+        async with stdio_client(params, errlog=errlog) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                started = time.perf_counter()
+                await asyncio.gather(*(worker(session) for _ in range(args.concurrency)))
+                wall = time.perf_counter() - started
+                peak_rss = children_peak_rss_mb()
+    cpu_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    if peak_rss is None:
+        # ru_maxrss is in KiB on Linux and bytes on macOS
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+        peak_rss = cpu_after.ru_maxrss / scale
+    measured = sum(len(s) for s in samples.values())
+    everything = [t for s in samples.values() for t in s]
+    return {
+        "calls": measured,
+        "seconds": round(wall, 3),
+        "throughput_per_second": round(len(calls) / wall, 1),
+        "latency": summarize(everything),
+        "tools": {
+            tool: summarize(times) | {"errors": errors[tool]}
+            for tool, times in sorted(samples.items())
+        },
+        "response_bytes": response_bytes,
+        "cpu_seconds": round(
+            (cpu_after.ru_utime - cpu_before.ru_utime) + (cpu_after.ru_stime - cpu_before.ru_stime),
+            3,
+        ),
+        "peak_rss_mb": round(peak_rss, 1),
+    }
+
+
+def git_revision() -> tuple[str, bool]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            text=True,
+        )
+        dirty = bool(status.stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+
+
+def compare(previous: dict, current: dict, threshold: float) -> bool:
+    """Print p50/p95 changes per tool; return True if any got slower than
+    ``threshold`` (a fraction)."""
+    regressed = False
+    print(f"\nvs {previous.get('commit', '?')}:")
+    print(f"{'workload':<8} {'tool':<36} {'p50 ms':>17} {'p95 ms':>17}")
+    for name, result in current["workloads"].items():
+        before = previous.get("workloads", {}).get(name)
+        if before is None:
+            continue
+        rows = [("(all)", before["latency"], result["latency"])] + [
+            (tool, before["tools"][tool], stats)
+            for tool, stats in result["tools"].items()
+            if tool in before["tools"]
+        ]
+        for tool, old, new in rows:
+            cells = []
+            for key in ("p50_ms", "p95_ms"):
+                change = (new[key] - old[key]) / old[key] if old[key] else 0.0
+                flag = "!" if change > threshold else " "
+                regressed |= change > threshold
+                cells.append(f"{old[key]:>6.1f}->{new[key]:>6.1f}{change:>+4.0%}{flag}")
+            print(f"{name:<8} {tool:<36} {cells[0]:>17} {cells[1]:>17}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--workload", choices=[*WORKLOADS, "all"], default="all", help="Call mix to run"
+    )
+    parser.add_argument("--calls", type=int, default=500, help="Calls per workload")
+    parser.add_argument("--warmup", type=int, default=20, help="Leading calls not measured")
+    parser.add_argument("--concurrency", type=int, default=4, help="Calls in flight")
+    parser.add_argument("--notes", type=int, default=2000, help="Synthetic vault size")
+    parser.add_argument("--vault", help="Serve this vault directory instead")
+    parser.add_argument("--latency", type=float, default=0.002, help="Mock REST latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.002)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--server-command",
+        default=f"{shlex.quote(sys.executable)} -c 'import mcp_obsidian; mcp_obsidian.main()'",
+        help="Command that starts the MCP server",
+    )
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10, help="Slowdown flagged by --compare"
+    )
+    args = parser.parse_args()
+
+    workloads = list(WORKLOADS) if args.workload == "all" else [args.workload]
+    commit, dirty = git_revision()
+    results = {
+        "commit": commit,
+        "dirty": dirty,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        "workloads": {},
+    }
+
+    print(f"{'workload':<8} {'calls/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'cpu s':>7} {'rss MB':>7}")
+    for name in workloads:
+        # A fresh vault and server per workload, so writes don't leak across
+        vault = (
+            MockVault.from_directory(args.vault)
+            if args.vault
+            else MockVault.synthetic(args.notes, args.seed)
+        )
+        calls = script(name, Corpus(vault), args.calls + args.warmup, args.seed)
+        faults = Faults(latency=args.latency, jitter=args.jitter, seed=args.seed)
+        with running(vault, faults) as server:
+            host, port = server.server_address
+            env = os.environ | {
+                "OBSIDIAN_API_KEY": "mock-api-key",
+                "OBSIDIAN_PROTOCOL": "http",
+                "OBSIDIAN_HOST": host,
+                "OBSIDIAN_PORT": str(port),
+            }
+            result = asyncio.run(
+                run_workload(args, shlex.split(args.server_command), env, calls)
+            )
+        results["workloads"][name] = result
+        latency = result["latency"]
+        print(
+            f"{name:<8} {result['throughput_per_second']:>8.1f} {latency['p50_ms']:>8.2f} "
+            f"{latency['p95_ms']:>8.2f} {latency['p99_ms']:>8.2f} "
+            f"{result['cpu_seconds']:>7.2f} {result['peak_rss_mb']:>7.1f}"
+        )
+        for tool, stats in result["tools"].items():
+            errors = f"  ({stats['errors']} errors)" if stats["errors"] else ""
+            print(f"  {tool:<36} n={stats['calls']:<5} p50 {stats['p50_ms']:>7.2f} "
+                  f"p95 {stats['p95_ms']:>7.2f} p99 {stats['p99_ms']:>7.2f}{errors}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nWrote {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            if compare(json.load(f), results, args.threshold):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
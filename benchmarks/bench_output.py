@@ -0,0 +1,105 @@
+"""Compare result size and encode time across output formats.
+
+Builds synthetic payloads shaped like the largest tool results (a vault
+listing, simple-search matches and a Dataview table) and reports bytes and
+median encode time for every format.
+
+Usage:
+    uv run python benchmarks/bench_output.py [--files 20000] [--repeat 20]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from mcp_obsidian import output
+from mcp_obsidian.output import format_output
+
+WORDS = "meeting notes project garden daily review inbox idea book travel café über".split()
+
+
+def vault_listing(files: int) -> list[str]:
+    return [
+        f"{random.choice(WORDS).title()}/{' '.join(random.sample(WORDS, 3))} {i}.md"
+        for i in range(files)
+    ]
+
+
+def search_results(files: int) -> list[dict]:
+    # Shape of obsidian_simple_search output
+    return [
+        {
+            "filename": path,
+            "score": round(random.random() * 10, 3),
+            "matches": [
+                {
+                    "context": " ".join(random.choices(WORDS, k=20)),
+                    "match_position": {"start": 40, "end": 47},
+                }
+                for _ in range(3)
+            ],
+        }
+        for path in vault_listing(files // 10)
+    ]
+
+
+def dataview_table(files: int) -> list[dict]:
+    # Shape of obsidian_dataview_query TABLE output
+    return [
+        {
+            "filename": path,
+            "result": {
+                "status": random.choice(["todo", "done"]),
+                "tags": random.sample(WORDS, 2),
+                "rating": random.randint(1, 5),
+            },
+        }
+        for path in vault_listing(files // 4)
+    ]
+
+
+def measure(data, output_format: str, repeat: int) -> tuple[int, float]:
+    text = format_output(data, output_format)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        format_output(data, output_format)
+        timings.append(time.perf_counter() - start)
+    return len(text.encode("utf-8")), statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(0)
+    payloads = {
+        "listing": vault_listing(args.files),
+        "search": search_results(args.files),
+        "dataview": dataview_table(args.files),
+    }
+
+    variants = [("pretty", "pretty", False), ("compact (json)", "compact", True)]
+    if output.orjson is not None:
+        variants.append(("compact (orjson)", "compact", False))
+    variants.append(("raw", "raw", False))
+
+    print(f"{'payload':<10} {'format':<17} {'bytes':>11} {'vs pretty':>10} {'ms':>8}")
+    orjson = output.orjson
+    for name, data in payloads.items():
+        baseline = None
+        for label, output_format, force_stdlib in variants:
+            output.orjson = None if force_stdlib else orjson
+            size, ms = measure(data, output_format, args.repeat)
+            baseline = baseline or size
+            print(
+                f"{name:<10} {label:<17} {size:>11,} {size / baseline:>9.0%} {ms:>8.2f}"
+            )
+        output.orjson = orjson
+
+
+if __name__ == "__main__":
+    main()
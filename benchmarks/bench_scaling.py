@@ -0,0 +1,184 @@
+"""Tool latency against vault size.
+
+For each vault size, generates a synthetic vault (benchmarks/vault_gen.py,
+cached on disk between runs), serves it with the mock REST server and
+times a set of tool calls through the tool handlers: once with a fresh
+client (cold caches) and then repeatedly (warm). Prints a table per tool
+and can save JSON and plot latency against size.
+
+The mock answers requests in Python, so absolute numbers include its
+cost; compare how each tool's latency grows with the vault.
+
+Usage:
+    uv run python benchmarks/bench_scaling.py [--sizes 1000,10000,100000] [--plot scaling.png]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_server import Faults, MockVault, running  # noqa: E402
+from vault_gen import WORDS, write_vault  # noqa: E402
+
+from mcp_obsidian import server, tools  # noqa: E402
+from mcp_obsidian.obsidian import Obsidian  # noqa: E402
+
+
+def probes(vault: MockVault) -> dict[str, tuple[str, dict]]:
+    """Tool calls to time, built from the vault's contents."""
+    daily = max(p for p in vault.notes if p.startswith("Daily/"))
+    note = min(p for p in vault.notes if not p.startswith("Daily/"))
+    title = note.rsplit("/", 1)[-1][:-3]
+    day = daily.rsplit("/", 1)[-1][:-3]
+    return {
+        "list_vault": ("obsidian_list_files_in_vault", {}),
+        "list_recursive": ("obsidian_list_files_recursive", {"max_items": 100}),
+        "resolve_note": ("obsidian_resolve_note", {"query": title[:8].lower()}),
+        "read_daily": ("obsidian_get_file_contents", {"filepath": daily}),
+        "outline_daily": ("obsidian_get_outline", {"filepath": daily}),
+        "patch_daily": (
+            "obsidian_patch_content",
+            {
+                "filepath": daily,
+                "operation": "append",
+                "target_type": "heading",
+                "target": f"{day}::Log",
+                "content": "- benchmark entry",
+            },
+        ),
+        "simple_search": ("obsidian_simple_search", {"query": title.lower()}),
+        "complex_search": (
+            "obsidian_complex_search",
+            {"query": {"in": [WORDS[0], {"var": "tags"}]}, "max_items": 100},
+        ),
+        "dataview": (
+            "obsidian_dataview_query",
+            {"query": f"TABLE status, rating FROM #{WORDS[1]} SORT rating DESC LIMIT 20"},
+        ),
+    }
+
+
+def timed(handler: tools.ToolHandler, arguments: dict) -> float | None:
+    start = time.perf_counter()
+    try:
+        handler.run_tool(arguments)
+    except Exception as e:
+        print(f"  {handler.name} failed: {e}", file=sys.stderr)
+        return None
+    return time.perf_counter() - start
+
+
+def vault_for(cache_dir: str, notes: int, args) -> str:
+    """Path of the generated vault for ``notes``, generating it if needed."""
+    path = os.path.join(cache_dir, f"notes-{notes}-seed-{args.seed}-daily-{args.daily_kb}k")
+    if not os.path.isdir(path):
+        print(f"generating {notes} notes into {path} ...", file=sys.stderr)
+        partial = f"{path}.partial-{os.getpid()}"
+        write_vault(partial, notes=notes, seed=args.seed, daily_kb=args.daily_kb)
+        os.rename(partial, path)
+    return path
+
+
+def measure(notes: int, args) -> dict:
+    vault = MockVault.from_directory(vault_for(args.cache_dir, notes, args))
+    results = {}
+    with running(vault, Faults(latency=args.latency)) as mock:
+        host, port = mock.server_address
+        for name, (tool, arguments) in probes(vault).items():
+            handler = server.get_tool_handler(tool)
+            # A fresh client per probe, so the first call sees cold caches
+            tools._client = Obsidian(api_key="mock-api-key", protocol="http", host=host, port=port)
+            cold = timed(handler, arguments)
+            warm = [timed(handler, arguments) for _ in range(args.repeat)]
+            warm = [t for t in warm if t is not None]
+            results[name] = {
+                "cold_ms": None if cold is None else round(cold * 1000, 2),
+                "warm_ms": round(statistics.median(warm) * 1000, 2) if warm else None,
+            }
+    return {"files": len(vault.notes), "tools": results}
+
+
+def plot(results: dict, path: str) -> None:
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib is not installed; skipping the plot", file=sys.stderr)
+        return
+
+    sizes = sorted(results, key=int)
+    fig, axes = plt.subplots(1, 2, figsize=(12, 5), sharey=True)
+    for ax, key in zip(axes, ("cold_ms", "warm_ms")):
+        for name in results[sizes[0]]["tools"]:
+            points = [
+                (int(size), results[size]["tools"][name][key])
+                for size in sizes
+                if results[size]["tools"][name][key] is not None
+            ]
+            if points:
+                ax.plot(*zip(*points), marker="o", label=name)
+        ax.set(xscale="log", yscale="log", xlabel="notes", title=key.split("_")[0])
+        ax.grid(True, which="both", alpha=0.3)
+    axes[0].set_ylabel("latency (ms)")
+    axes[1].legend(fontsize="small")
+    fig.tight_layout()
+    fig.savefig(path)
+    print(f"Wrote {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default="1000,5000,20000",
+        help="Comma-separated note counts (up to 500000)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Warm calls per tool")
+    parser.add_argument("--daily-kb", type=int, default=64, help="Size of daily notes")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock REST latency (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--cache-dir",
+        default=os.path.join(tempfile.gettempdir(), "mcp-obsidian-vaults"),
+        help="Where generated vaults are kept between runs",
+    )
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--plot", help="Save a latency-vs-size plot (needs matplotlib)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = {}
+    for notes in sizes:
+        results[str(notes)] = measure(notes, args)
+
+    names = list(results[str(sizes[0])]["tools"])
+    header = "".join(f"{size:>18,}" for size in sizes)
+    print(f"{'tool (cold / warm ms)':<16}{header}")
+    for name in names:
+        cells = []
+        for size in sizes:
+            stats = results[str(size)]["tools"][name]
+            cold, warm = (
+                "err" if stats[k] is None else f"{stats[k]:.1f}" for k in ("cold_ms", "warm_ms")
+            )
+            cells.append(f"{cold + ' / ' + warm:>18}")
+        print(f"{name:<16}{''.join(cells)}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+        print(f"Wrote {args.output}")
+    if args.plot:
+        plot(results, args.plot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Server cold start: import cost and time to first response.
+
+MCP clients spawn a server process per session, so startup is paid on
+every connection. This benchmark reports:
+
+- the import profile of mcp_obsidian.server (python -X importtime),
+  heaviest direct imports first, and whether modules that should load
+  lazily (the HTTP stack, the REST client) were imported at startup;
+- wall time from spawning the server to its initialize response, its
+  tools/list response and a first tool call answered by the mock REST
+  server, as the median of several runs.
+
+It exits with status 1 if a lazy module is imported at startup or the
+median time to initialize exceeds the budget, so it can gate CI.
+
+Usage:
+    uv run python benchmarks/bench_startup.py [--runs 10] [--budget-ms 1500]
+"""
+
+import argparse
+import json
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_server import MockVault, running  # noqa: E402
+
+# Modules that must not be imported before the first tool call needs them
+LAZY_MODULES = ("requests", "urllib3", "mcp_obsidian.obsidian", "mcp_obsidian.outline")
+
+
+def import_profile(python: str, env: dict) -> list[tuple[str, int, int, int]]:
+    """(module, depth, self us, cumulative us) for importing the server."""
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", "import mcp_obsidian.server"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), depth, int(own), int(cumulative)))
+    return modules
+
+
+def start_once(command: list[str], env: dict) -> dict[str, float]:
+    """Spawn the server and time its first responses, in ms since spawn."""
+    messages = [
+        {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "initialize",
+            "params": {
+                "protocolVersion": "2025-06-18",
+                "capabilities": {},
+                "clientInfo": {"name": "bench_startup", "version": "0"},
+            },
+        },
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+        {
+            "jsonrpc": "2.0",
+            "id": 3,
+            "method": "tools/call",
+            "params": {"name": "obsidian_list_files_in_vault", "arguments": {}},
+        },
+    ]
+    names = {1: "initialize", 2: "tools_list", 3: "first_call"}
+    timings: dict[str, float] = {}
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        command,
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        for message in messages:
+            process.stdin.write(json.dumps(message) + "\n")
+            process.stdin.flush()
+            if "id" not in message:
+                continue
+            while True:
+                line = process.stdout.readline()
+                if not line:
+                    raise RuntimeError("server exited during startup")
+                reply = json.loads(line)
+                if reply.get("id") == message["id"]:
+                    break
+            if "error" in reply or reply.get("result", {}).get("isError"):
+                raise RuntimeError(f"{message['method']} failed: {reply}")
+            timings[names[message["id"]]] = (time.perf_counter() - start) * 1000
+    finally:
+        process.stdin.close()
+        process.wait(timeout=10)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Server starts to time")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=1500.0,
+        help="Fail if the median time to initialize exceeds this",
+    )
+    parser.add_argument("--top", type=int, default=12, help="Direct imports to list")
+    parser.add_argument(
+        "--server-command",
+        default=f"{shlex.quote(sys.executable)} -c 'import mcp_obsidian; mcp_obsidian.main()'",
+        help="Command that starts the server build to test",
+    )
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    command = shlex.split(args.server_command)
+    env = os.environ | {"OBSIDIAN_API_KEY": "mock-api-key"}
+    modules = import_profile(command[0], env)
+    total = next(cumulative for name, _, _, cumulative in modules if name == "mcp_obsidian.server")
+    loaded = {name for name, *_ in modules}
+    eager = [name for name in LAZY_MODULES if name in loaded]
+
+    print(f"import mcp_obsidian.server: {total / 1000:.1f} ms")
+    direct = sorted((m for m in modules if m[1] == 1), key=lambda m: -m[3])
+    for name, _, _, cumulative in direct[: args.top]:
+        print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+    ours = sorted((m for m in modules if m[0].startswith("mcp_obsidian")), key=lambda m: -m[2])
+    print("mcp_obsidian modules (self time):")
+    for name, _, own, _ in ours:
+        print(f"  {own / 1000:>8.1f} ms  {name}")
+    print(f"lazy modules imported at startup: {', '.join(eager) or 'none'}\n")
+
+    with running(MockVault.synthetic(200)) as mock:
+        host, port = mock.server_address
+        env |= {"OBSIDIAN_PROTOCOL": "http", "OBSIDIAN_HOST": host, "OBSIDIAN_PORT": str(port)}
+        runs = [start_once(command, env) for _ in range(args.runs)]
+
+    medians = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+    for key, value in medians.items():
+        print(f"{key:<12} median {value:>8.1f} ms  (min {min(run[key] for run in runs):.1f})")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {"import_ms": total / 1000, "eager_lazy_modules": eager, "startup_ms": medians},
+                f,
+                indent=2,
+            )
+        print(f"Wrote {args.output}")
+
+    failures = []
+    if eager:
+        failures.append(f"imported at startup: {', '.join(eager)}")
+    if medians["initialize"] > args.budget_ms:
+        failures.append(
+            f"time to initialize {medians['initialize']:.0f} ms exceeds {args.budget_ms:.0f} ms"
+        )
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
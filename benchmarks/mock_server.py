@@ -0,0 +1,1106 @@
+"""Local stand-in for the Obsidian Local REST API.
+
+Serves the parts of openapi.yaml the client uses (vault files and
+directories, simple search, JsonLogic and a Dataview DQL subset, periodic
+notes, the active note, commands) from an in-memory copy of an on-disk or
+synthetic vault. Latency and errors can be injected per endpoint class, so
+throughput and tail latency can be measured reproducibly without Obsidian.
+Only the standard library is used; writes never touch the source vault.
+
+Usage:
+    python benchmarks/mock_server.py --vault ~/Notes
+    python benchmarks/mock_server.py --notes 5000 --latency 0.005 --error-rate 0.01
+
+Then run the MCP server against it:
+    OBSIDIAN_PROTOCOL=http OBSIDIAN_API_KEY=mock-api-key uv run mcp-obsidian
+"""
+
+import argparse
+import fnmatch
+import functools
+import json
+import os
+import random
+import re
+import ssl
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+
+DEFAULT_API_KEY = "mock-api-key"
+
+# Endpoint classes, as in mcp_obsidian.timeouts.DEFAULT_TIMEOUTS
+ENDPOINTS = ("list", "read", "write", "search", "query", "command")
+
+PERIODIC_FOLDERS = {
+    "daily": "Daily",
+    "weekly": "Weekly",
+    "monthly": "Monthly",
+    "quarterly": "Quarterly",
+    "yearly": "Yearly",
+}
+
+COMMANDS = [
+    {"id": "app:go-back", "name": "Navigate back"},
+    {"id": "app:reload", "name": "Reload app without saving"},
+    {"id": "editor:save-file", "name": "Save current file"},
+    {"id": "editor:toggle-bold", "name": "Toggle bold"},
+    {"id": "global-search:open", "name": "Search: Search in all files"},
+    {"id": "graph:open", "name": "Graph view: Open graph view"},
+]
+
+SKIPPED_DIRS = {".obsidian", ".trash", ".git"}
+
+
+class ApiError(Exception):
+    """An error response in the REST API's {"errorCode", "message"} shape."""
+
+    def __init__(self, status: int, code: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+
+def periodic_name(period: str, day: date) -> str:
+    """File stem of the periodic note covering ``day``."""
+    if period == "daily":
+        return day.isoformat()
+    if period == "weekly":
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    if period == "monthly":
+        return f"{day.year}-{day.month:02d}"
+    if period == "quarterly":
+        return f"{day.year}-Q{(day.month - 1) // 3 + 1}"
+    if period == "yearly":
+        return str(day.year)
+    raise ApiError(400, 40060, f"Unknown period '{period}'")
+
+
+# --- Note metadata ---------------------------------------------------------
+
+FRONTMATTER = re.compile(r"\A---\r?\n(.*?)\r?\n---(?:\r?\n|\Z)", re.DOTALL)
+INLINE_TAG = re.compile(r"(?<![\w#&])#([\w/-]*[A-Za-z_/-][\w/-]*)")
+HEADING = re.compile(r"^(#{1,6})[ \t]+(.+?)[ \t#]*$")
+
+
+def _scalar(text: str) -> Any:
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "'\"":
+        return text[1:-1]
+    if text in ("", "~", "null"):
+        return None
+    if text in ("true", "false"):
+        return text == "true"
+    if text.startswith("[") and text.endswith("]"):
+        return [_scalar(item) for item in text[1:-1].split(",") if item.strip()]
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_frontmatter(content: str) -> dict:
+    """Parse the flat YAML subset notes use: scalars, inline and block lists."""
+    match = FRONTMATTER.match(content)
+    if not match:
+        return {}
+    data: dict[str, Any] = {}
+    key = None
+    for line in match.group(1).splitlines():
+        stripped = line.strip()
+        if stripped.startswith("- ") and key is not None:
+            if not isinstance(data[key], list):
+                data[key] = []
+            data[key].append(_scalar(stripped[2:]))
+        elif ":" in line and not line[0].isspace():
+            key, _, value = line.partition(":")
+            key = key.strip()
+            data[key] = _scalar(value)
+    return data
+
+
+def dump_frontmatter(data: dict) -> str:
+    lines = []
+    for key, value in data.items():
+        if isinstance(value, list):
+            lines.append(f"{key}:")
+            lines.extend(f"  - {json.dumps(item)}" for item in value)
+        else:
+            lines.append(f"{key}: {'' if value is None else json.dumps(value)}")
+    return "---\n" + "\n".join(lines) + "\n---\n"
+
+
+def note_tags(content: str, frontmatter: dict) -> list[str]:
+    tags = frontmatter.get("tags") or []
+    if isinstance(tags, str):
+        tags = tags.replace(",", " ").split()
+    body = content[FRONTMATTER.match(content).end() :] if frontmatter else content
+    inline = INLINE_TAG.findall(body)
+    return list(dict.fromkeys(str(tag).lstrip("#") for tag in [*tags, *inline]))
+
+
+# --- Vault -----------------------------------------------------------------
+
+
+class Note:
+    __slots__ = ("content", "ctime", "mtime", "metadata")
+
+    def __init__(self, content: str, ctime: float, mtime: float):
+        self.content = content
+        self.ctime = ctime
+        self.mtime = mtime
+        # (frontmatter, tags), parsed on first use; notes are replaced on write
+        self.metadata: tuple[dict, list[str]] | None = None
+
+
+class MockVault:
+    """Thread-safe in-memory vault keyed by path relative to the vault root."""
+
+    def __init__(self, notes: dict[str, str] | None = None, active: str | None = None):
+        now = time.time() * 1000
+        self.notes: dict[str, Note] = {
+            path: Note(content, now, now) for path, content in (notes or {}).items()
+        }
+        self.active = active or next(iter(sorted(self.notes)), None)
+        self.lock = threading.RLock()
+
+    @classmethod
+    def from_directory(cls, root: str) -> "MockVault":
+        """Load every text file under ``root``, skipping .obsidian, .git, .trash."""
+        vault = cls()
+        for directory, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if d not in SKIPPED_DIRS)
+            for filename in sorted(filenames):
+                full = os.path.join(directory, filename)
+                path = os.path.relpath(full, root).replace(os.sep, "/")
+                with open(full, encoding="utf-8", errors="replace") as f:
+                    content = f.read()
+                stat = os.stat(full)
+                vault.notes[path] = Note(content, stat.st_ctime * 1000, stat.st_mtime * 1000)
+        vault.active = next(iter(sorted(vault.notes)), None)
+        return vault
+
+    @classmethod
+    def synthetic(cls, notes: int = 1000, seed: int = 0, **spec: Any) -> "MockVault":
+        """A generated vault (see vault_gen.generate() for ``spec``)."""
+        try:
+            from .vault_gen import generate
+        except ImportError:
+            # Run as a script rather than imported from the benchmarks package
+            from vault_gen import generate
+
+        vault = cls()
+        for path, content, mtime in generate(notes=notes, seed=seed, **spec):
+            vault.notes[path] = Note(content, mtime * 1000, mtime * 1000)
+        vault.active = next(iter(vault.notes), None)
+        return vault
+
+    def get(self, path: str) -> Note:
+        note = self.notes.get(path)
+        if note is None:
+            raise ApiError(404, 40400, "Not Found")
+        return note
+
+    def put(self, path: str, content: str) -> None:
+        now = time.time() * 1000
+        existing = self.notes.get(path)
+        self.notes[path] = Note(content, existing.ctime if existing else now, now)
+
+    def delete(self, path: str) -> None:
+        self.get(path)
+        del self.notes[path]
+
+    def listing(self, directory: str) -> list[str]:
+        """Immediate children of ``directory`` ("" or "dir/"), dirs ending "/"."""
+        entries = set()
+        for path in self.notes:
+            if path.startswith(directory):
+                name, slash, _ = path[len(directory) :].partition("/")
+                entries.add(name + slash)
+        if not entries and directory:
+            raise ApiError(404, 40400, "Not Found")
+        return sorted(entries)
+
+    def note_json(self, path: str) -> dict:
+        note = self.get(path)
+        if note.metadata is None:
+            frontmatter = parse_frontmatter(note.content)
+            note.metadata = frontmatter, note_tags(note.content, frontmatter)
+        frontmatter, tags = note.metadata
+        return {
+            "content": note.content,
+            "frontmatter": frontmatter,
+            "path": path,
+            "stat": {
+                "ctime": int(note.ctime),
+                "mtime": int(note.mtime),
+                "size": len(note.content.encode("utf-8")),
+            },
+            "tags": tags,
+        }
+
+    def periodic_path(self, period: str, day: date | None = None) -> str:
+        if period not in PERIODIC_FOLDERS:
+            raise ApiError(400, 40060, f"Unknown period '{period}'")
+        return f"{PERIODIC_FOLDERS[period]}/{periodic_name(period, day or date.today())}.md"
+
+
+# --- Search ----------------------------------------------------------------
+
+
+def simple_search(vault: MockVault, query: str, context_length: int, limit: int) -> list:
+    """Case-insensitive search; a note matches if it contains every word."""
+    terms = [re.escape(word) for word in query.lower().split()]
+    if not terms:
+        return []
+    pattern = re.compile("|".join(terms), re.IGNORECASE)
+    results = []
+    for path, note in vault.notes.items():
+        lowered = note.content.lower()
+        if not all(word in lowered for word in query.lower().split()):
+            continue
+        matches = [
+            {
+                "match": {"start": m.start(), "end": m.end()},
+                "context": note.content[
+                    max(0, m.start() - context_length) : m.end() + context_length
+                ],
+            }
+            for _, m in zip(range(limit), pattern.finditer(note.content))
+        ]
+        results.append({"filename": path, "score": -len(matches), "matches": matches})
+    results.sort(key=lambda r: r["score"])
+    return results
+
+
+def _var(data: Any, path: Any, default: Any = None) -> Any:
+    if path in (None, ""):
+        return data
+    for part in str(path).split("."):
+        if isinstance(data, dict) and part in data:
+            data = data[part]
+        elif isinstance(data, list) and part.isdigit() and int(part) < len(data):
+            data = data[int(part)]
+        else:
+            return default
+    return data
+
+
+def _compare(op: str, values: list) -> bool:
+    try:
+        pairs = zip(values, values[1:])
+        if op == "<":
+            return all(a < b for a, b in pairs)
+        if op == "<=":
+            return all(a <= b for a, b in pairs)
+        if op == ">":
+            return values[0] > values[1]
+        return values[0] >= values[1]
+    except TypeError:
+        return False
+
+
+def json_logic(rule: Any, data: Any) -> Any:
+    """Evaluate a JsonLogic rule, plus the API's glob and regexp operators."""
+    if isinstance(rule, list):
+        return [json_logic(item, data) for item in rule]
+    if not isinstance(rule, dict) or len(rule) != 1:
+        return rule
+    op, args = next(iter(rule.items()))
+    if not isinstance(args, list):
+        args = [args]
+
+    if op in ("and", "or"):
+        value = None
+        for arg in args:
+            value = json_logic(arg, data)
+            if bool(value) != (op == "and"):
+                return value
+        return value
+    if op == "if":
+        for i in range(0, len(args) - 1, 2):
+            if json_logic(args[i], data):
+                return json_logic(args[i + 1], data)
+        return json_logic(args[-1], data) if len(args) % 2 else None
+
+    values = [json_logic(arg, data) for arg in args]
+    if op == "var":
+        return _var(data, *values[:2])
+    if op in ("==", "==="):
+        return values[0] == values[1]
+    if op in ("!=", "!=="):
+        return values[0] != values[1]
+    if op == "!":
+        return not values[0]
+    if op == "!!":
+        return bool(values[0])
+    if op in ("<", "<=", ">", ">="):
+        return _compare(op, values)
+    if op == "in":
+        return isinstance(values[1], (str, list)) and values[0] in values[1]
+    if op == "cat":
+        return "".join("" if v is None else str(v) for v in values)
+    if op == "glob":
+        return isinstance(values[1], str) and fnmatch.fnmatchcase(values[1], values[0])
+    if op == "regexp":
+        return isinstance(values[1], str) and re.search(values[0], values[1]) is not None
+    raise ApiError(400, 40010, f"Unrecognized operation {op}")
+
+
+def jsonlogic_search(vault: MockVault, rule: Any) -> list:
+    results = []
+    for path in list(vault.notes):
+        result = json_logic(rule, vault.note_json(path))
+        if result:
+            results.append({"filename": path, "result": result})
+    return results
+
+
+# DQL subset: TABLE <expr [AS "name"]>, ... [FROM <#tag|"folder">]
+# [WHERE <expr>] [SORT <expr> [ASC|DESC], ...] [LIMIT <n>]
+
+DQL_TOKEN = re.compile(
+    r"\s*(?:(?P<string>\"(?:[^\"\\]|\\.)*\")|(?P<number>\d+(?:\.\d+)?)"
+    r"|(?P<tag>#[\w/-]+)|(?P<name>[A-Za-z_][\w.-]*)"
+    r"|(?P<op>>=|<=|!=|=|<|>|\+|-|\(|\)|,|!))"
+)
+CLAUSES = {"from", "where", "sort", "limit", "group", "flatten"}
+DURATION_UNITS = {
+    "second": 1, "minute": 60, "hour": 3600, "day": 86400, "week": 604800,
+    "month": 30 * 86400, "year": 365 * 86400,
+}
+
+
+class _DQL:
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens: list[tuple[str, str, int, int]] = []
+        position = 0
+        while text[position:].strip():
+            match = DQL_TOKEN.match(text, position)
+            if not match:
+                raise ApiError(400, 40070, f"Cannot parse query near '{text[position:][:20]}'")
+            self.tokens.append((match.lastgroup, match.group(match.lastgroup),
+                                match.start(match.lastgroup), match.end()))
+            position = match.end()
+        self.i = 0
+
+    def peek(self, offset: int = 0) -> str:
+        i = self.i + offset
+        return self.tokens[i][1] if i < len(self.tokens) else ""
+
+    def keyword(self, *words: str) -> bool:
+        if self.peek().lower() in words:
+            self.i += 1
+            return True
+        return False
+
+    def take(self, expected: str | None = None) -> str:
+        value = self.peek()
+        if expected is not None and value.lower() != expected:
+            raise ApiError(400, 40070, f"Expected '{expected}' in query, got '{value}'")
+        self.i += 1
+        return value
+
+    # Expressions compile to functions of a note-json dict
+
+    def expr(self):
+        left = self.conjunction()
+        while self.keyword("or"):
+            left = functools.partial(lambda a, b, n: a(n) or b(n), left, self.conjunction())
+        return left
+
+    def conjunction(self):
+        left = self.negation()
+        while self.keyword("and"):
+            left = functools.partial(lambda a, b, n: a(n) and b(n), left, self.negation())
+        return left
+
+    def negation(self):
+        if self.peek() == "!":
+            self.take()
+            inner = self.negation()
+            return lambda n: not inner(n)
+        return self.comparison()
+
+    def comparison(self):
+        left = self.sum()
+        op = self.peek()
+        if op in ("=", "!=", "<", "<=", ">", ">="):
+            self.take()
+            right = self.sum()
+            return lambda n: _dql_compare(op, left(n), right(n))
+        return left
+
+    def sum(self):
+        left = self.primary()
+        while self.peek() in ("+", "-"):
+            sign = 1 if self.take() == "+" else -1
+            right = self.primary()
+            left = functools.partial(
+                lambda a, b, s, n: _dql_add(a(n), b(n), s), left, right, sign
+            )
+        return left
+
+    def primary(self):
+        kind, value = self.tokens[self.i][:2] if self.i < len(self.tokens) else ("", "")
+        self.i += 1
+        if kind == "string":
+            text = json.loads(value)
+            return lambda n: text
+        if kind == "number":
+            number = float(value) if "." in value else int(value)
+            return lambda n: number
+        if value == "(":
+            inner = self.expr()
+            self.take(")")
+            return inner
+        if value == "-":
+            inner = self.primary()
+            return lambda n: -inner(n)
+        if kind != "name":
+            raise ApiError(400, 40070, f"Unexpected '{value}' in query")
+        if value.lower() in ("true", "false", "null"):
+            literal = {"true": True, "false": False, "null": None}[value.lower()]
+            return lambda n: literal
+        if self.peek() == "(":
+            return self.call(value.lower())
+        return lambda n: _dql_field(n, value)
+
+    def call(self, name: str):
+        self.take("(")
+        if name == "dur":
+            start = self.i
+            while self.peek() not in (")", ""):
+                self.i += 1
+            text = " ".join(token[1] for token in self.tokens[start : self.i])
+            self.take(")")
+            duration = _duration(text)
+            return lambda n: duration
+        if name == "date" and self.peek().lower() in ("today", "now") and self.peek(1) == ")":
+            keyword = self.take().lower()
+            self.take(")")
+            return lambda n: _date(keyword)
+        args = []
+        while self.peek() != ")":
+            args.append(self.expr())
+            if not self.keyword(","):
+                break
+        self.take(")")
+        if name == "date":
+            return lambda n: _date(args[0](n) if args else "today")
+        functions = {
+            "contains": lambda a, b: b in a if isinstance(a, (str, list)) else False,
+            "lower": lambda a: str(a).lower(),
+            "length": lambda a: len(a) if a is not None else 0,
+        }
+        if name not in functions:
+            raise ApiError(400, 40070, f"Unsupported function '{name}'")
+        return lambda n: functions[name](*(arg(n) for arg in args))
+
+    def source(self):
+        matchers = [self.source_term()]
+        joins = []
+        while self.peek().lower() in ("and", "or"):
+            joins.append(self.take().lower())
+            matchers.append(self.source_term())
+
+        def matches(note: dict) -> bool:
+            result = matchers[0](note)
+            for join, matcher in zip(joins, matchers[1:]):
+                result = (result and matcher(note)) if join == "and" else (result or matcher(note))
+            return result
+
+        return matches
+
+    def source_term(self):
+        negate = self.peek() == "-"
+        if negate:
+            self.take()
+        kind, value = self.tokens[self.i][:2] if self.i < len(self.tokens) else ("", "")
+        self.i += 1
+        if kind == "tag":
+            tag = value[1:].lower()
+
+            def matcher(n):
+                return any(t.lower() == tag or t.lower().startswith(tag + "/") for t in n["tags"])
+        elif kind == "string":
+            folder = json.loads(value).strip("/")
+
+            def matcher(n):
+                return n["path"].startswith(folder + "/") or n["path"] in (folder, folder + ".md")
+        else:
+            raise ApiError(400, 40070, f"Unsupported FROM source '{value}'")
+        return (lambda n: not matcher(n)) if negate else matcher
+
+    def parse(self):
+        if not self.keyword("table"):
+            raise ApiError(400, 40070, "Only TABLE dataview queries are supported.")
+        if self.peek().lower() == "without" and self.peek(1).lower() == "id":
+            self.i += 2
+        columns = []
+        while self.peek() and self.peek().lower() not in CLAUSES:
+            start = self.tokens[self.i][2]
+            column = self.expr()
+            header = self.text[start : self.tokens[self.i - 1][3]].strip()
+            if self.keyword("as"):
+                header = self.take().strip('"')
+            columns.append((header, column))
+            if not self.keyword(","):
+                break
+        source = where = None
+        sort: list[tuple[Any, bool]] = []
+        limit = None
+        while self.peek():
+            clause = self.take().lower()
+            if clause == "from":
+                source = self.source()
+            elif clause == "where":
+                where = self.expr()
+            elif clause == "sort":
+                while True:
+                    key = self.expr()
+                    descending = self.keyword("desc", "descending")
+                    if not descending:
+                        self.keyword("asc", "ascending")
+                    sort.append((key, descending))
+                    if not self.keyword(","):
+                        break
+            elif clause == "limit":
+                limit = int(self.take())
+            else:
+                raise ApiError(400, 40070, f"Unsupported clause '{clause.upper()}'")
+        return columns, source, where, sort, limit
+
+
+def _duration(text: str) -> timedelta:
+    total = 0.0
+    for amount, unit in re.findall(r"(\d+(?:\.\d+)?)\s*([a-z]+)", text.lower()):
+        unit = unit.rstrip("s")
+        if unit not in DURATION_UNITS:
+            raise ApiError(400, 40070, f"Unsupported duration unit '{unit}'")
+        total += float(amount) * DURATION_UNITS[unit]
+    return timedelta(seconds=total)
+
+
+def _date(value: Any) -> datetime | None:
+    if isinstance(value, datetime):
+        return value
+    if value in ("today", "now"):
+        now = datetime.now()
+        return now if value == "now" else now.replace(hour=0, minute=0, second=0, microsecond=0)
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def _dql_field(note: dict, name: str) -> Any:
+    path = note["path"]
+    file_fields = {
+        "file.path": lambda: path,
+        "file.name": lambda: path.rsplit("/", 1)[-1].removesuffix(".md"),
+        "file.folder": lambda: path.rsplit("/", 1)[0] if "/" in path else "",
+        "file.ext": lambda: path.rsplit(".", 1)[-1] if "." in path else "",
+        "file.size": lambda: note["stat"]["size"],
+        "file.ctime": lambda: datetime.fromtimestamp(note["stat"]["ctime"] / 1000),
+        "file.mtime": lambda: datetime.fromtimestamp(note["stat"]["mtime"] / 1000),
+        "file.tags": lambda: [f"#{tag}" for tag in note["tags"]],
+    }
+    if name in file_fields:
+        return file_fields[name]()
+    frontmatter = note["frontmatter"]
+    value = _var(frontmatter, name)
+    return value if value is not None else _var({k.lower(): v for k, v in frontmatter.items()}, name.lower())
+
+
+def _dql_add(a: Any, b: Any, sign: int) -> Any:
+    try:
+        return a + b if sign > 0 else a - b
+    except TypeError:
+        return None
+
+
+def _dql_order(a: Any, b: Any) -> int:
+    """Total order for DQL values: null first, then by value, else by text."""
+    if a is None or b is None:
+        return (a is not None) - (b is not None)
+    try:
+        return (a > b) - (a < b)
+    except TypeError:
+        return (str(a) > str(b)) - (str(a) < str(b))
+
+
+def _dql_compare(op: str, a: Any, b: Any) -> bool:
+    if isinstance(a, datetime) and isinstance(b, str):
+        b = _date(b)
+    elif isinstance(b, datetime) and isinstance(a, str):
+        a = _date(a)
+    if op == "=":
+        return a == b
+    if op == "!=":
+        return a != b
+    if a is None or b is None:
+        return False
+    order = _dql_order(a, b)
+    return {"<": order < 0, "<=": order <= 0, ">": order > 0, ">=": order >= 0}[op]
+
+
+def _dql_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.astimezone().isoformat(timespec="milliseconds")
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, list):
+        return [_dql_value(item) for item in value]
+    return value
+
+
+def dataview_search(vault: MockVault, query: str) -> list:
+    columns, source, where, sort, limit = _DQL(query).parse()
+    notes = [vault.note_json(path) for path in list(vault.notes) if path.endswith(".md")]
+    notes = [n for n in notes if (source is None or source(n)) and (where is None or where(n))]
+    for key, descending in reversed(sort):
+        notes.sort(
+            key=functools.cmp_to_key(lambda a, b, key=key: _dql_order(key(a), key(b))),
+            reverse=descending,
+        )
+    return [
+        {"filename": n["path"], "result": {header: _dql_value(col(n)) for header, col in columns}}
+        for n in notes[:limit]
+    ]
+
+
+# --- PATCH -----------------------------------------------------------------
+
+
+def _section(lines: list[str], target: list[str], delimiter: str) -> tuple[int, int]:
+    """(heading line, end line) of the section at heading path ``target``."""
+    stack: list[tuple[int, str]] = []
+    found = None
+    in_fence = False
+    for i, line in enumerate(lines):
+        if line.lstrip().startswith(("```", "~~~")):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING.match(line)
+        if not match:
+            continue
+        level = len(match.group(1))
+        if found is not None and level <= found[1]:
+            return found[0], i
+        stack = [entry for entry in stack if entry[0] < level] + [(level, match.group(2))]
+        if found is None and [name for _, name in stack] == target:
+            found = (i, level)
+    if found is None:
+        raise ApiError(400, 40080, f"Invalid target: {delimiter.join(target)}")
+    return found[0], len(lines)
+
+
+def patch_note(content: str, headers: Any, body: str) -> str:
+    operation = headers.get("Operation", "")
+    target_type = headers.get("Target-Type", "")
+    target = unquote(headers.get("Target", ""))
+    if operation not in ("append", "prepend", "replace"):
+        raise ApiError(400, 40050, f"Invalid operation '{operation}'")
+
+    if target_type == "frontmatter":
+        frontmatter = parse_frontmatter(content)
+        match = FRONTMATTER.match(content)
+        rest = content[match.end() :] if match else content
+        if target not in frontmatter and headers.get("Create-Target-If-Missing") != "true":
+            raise ApiError(400, 40080, f"Invalid target: {target}")
+        value = json.loads(body) if "json" in headers.get("Content-Type", "") else body
+        current = frontmatter.get(target)
+        if operation == "replace" or current is None:
+            frontmatter[target] = value
+        elif isinstance(current, list):
+            extra = value if isinstance(value, list) else [value]
+            frontmatter[target] = current + extra if operation == "append" else extra + current
+        else:
+            frontmatter[target] = f"{current}{value}" if operation == "append" else f"{value}{current}"
+        return dump_frontmatter(frontmatter) + rest
+
+    lines = content.split("\n")
+    insert = body.split("\n")
+    if target_type == "heading":
+        delimiter = headers.get("Target-Delimiter", "::")
+        start, end = _section(lines, target.split(delimiter), delimiter)
+        if operation == "prepend":
+            lines[start + 1 : start + 1] = insert
+        elif operation == "replace":
+            lines[start + 1 : end] = insert
+        else:
+            # Insert after the section's last non-blank line
+            while end > start + 1 and not lines[end - 1].strip():
+                end -= 1
+            lines[end:end] = insert
+    elif target_type == "block":
+        block = re.compile(rf"\s\^{re.escape(target)}\s*$")
+        index = next((i for i, line in enumerate(lines) if block.search(line)), None)
+        if index is None:
+            raise ApiError(400, 40080, f"Invalid target: {target}")
+        if operation == "prepend":
+            lines[index:index] = insert
+        elif operation == "replace":
+            lines[index : index + 1] = insert
+        else:
+            lines[index + 1 : index + 1] = insert
+    else:
+        raise ApiError(400, 40080, f"Invalid target type '{target_type}'")
+    return "\n".join(lines)
+
+
+# --- Fault injection -------------------------------------------------------
+
+
+class Faults:
+    """Injected latency, errors and stalls, drawn from a seeded RNG.
+
+    Args:
+        latency: Base delay in seconds for every request
+        jitter: Extra uniformly random delay, up to this many seconds
+        per_endpoint: Base delay overrides per endpoint class
+        error_rate: Fraction of requests answered with ``error_status``
+        error_status: Status code of injected errors
+        stall_rate: Fraction of requests delayed by ``stall`` seconds
+            (longer than the client's timeout) before being answered
+        stall: Stall duration in seconds
+        seed: RNG seed, for reproducible runs
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        per_endpoint: dict[str, float] | None = None,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        stall_rate: float = 0.0,
+        stall: float = 60.0,
+        seed: int | None = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.per_endpoint = per_endpoint or {}
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.stall_rate = stall_rate
+        self.stall = stall
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self, endpoint: str) -> tuple[float, int | None]:
+        """(delay in seconds, injected error status or None) for one request."""
+        with self._lock:
+            delay = self.per_endpoint.get(endpoint, self.latency)
+            if self.jitter:
+                delay += self._random.uniform(0, self.jitter)
+            if self.stall_rate and self._random.random() < self.stall_rate:
+                delay += self.stall
+            failed = self.error_rate and self._random.random() < self.error_rate
+        return delay, self.error_status if failed else None
+
+
+# --- HTTP ------------------------------------------------------------------
+
+
+class MockObsidianServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections from concurrent clients,
+    # which then wait a full second to retry the SYN
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        vault: MockVault,
+        faults: Faults | None = None,
+        api_key: str = DEFAULT_API_KEY,
+        verbose: bool = False,
+    ):
+        super().__init__(address, MockRequestHandler)
+        self.vault = vault
+        self.faults = faults or Faults()
+        self.api_key = api_key
+        self.verbose = verbose
+        self._stats_lock = threading.Lock()
+        self.counts = {endpoint: 0 for endpoint in ENDPOINTS}
+        self.injected_errors = 0
+
+    @property
+    def url(self) -> str:
+        scheme = "https" if isinstance(self.socket, ssl.SSLSocket) else "http"
+        return f"{scheme}://{self.server_address[0]}:{self.server_address[1]}"
+
+    def count(self, endpoint: str, injected_error: bool) -> None:
+        with self._stats_lock:
+            self.counts[endpoint] += 1
+            self.injected_errors += injected_error
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "requests": dict(self.counts),
+                "injected_errors": self.injected_errors,
+                "notes": len(self.vault.notes),
+            }
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    server: MockObsidianServer
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; don't let Nagle delay the body
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        self.handle_api("GET")
+
+    def do_PUT(self):
+        self.handle_api("PUT")
+
+    def do_POST(self):
+        self.handle_api("POST")
+
+    def do_PATCH(self):
+        self.handle_api("PATCH")
+
+    def do_DELETE(self):
+        self.handle_api("DELETE")
+
+    def send(self, status: int, body: Any = None, content_type: str = "application/json") -> None:
+        if body is None:
+            payload = b""
+        elif isinstance(body, str) and content_type != "application/json":
+            payload = body.encode("utf-8")
+        else:
+            payload = json.dumps(body, default=str).encode("utf-8")
+        self.send_response(status)
+        if payload:
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def handle_api(self, method: str) -> None:
+        url = urlsplit(self.path)
+        path = unquote(url.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode("utf-8")
+
+        if path == "/" and method == "GET":
+            return self.send(200, {
+                "ok": "OK",
+                "service": "Obsidian Local REST API",
+                "authenticated": self.headers.get("Authorization") == f"Bearer {self.server.api_key}",
+                "versions": {"obsidian": "mock", "self": "mock"},
+            })
+        if path == "/_mock/stats":
+            return self.send(200, self.server.stats())
+        if self.headers.get("Authorization") != f"Bearer {self.server.api_key}":
+            return self.send(401, {"errorCode": 40101, "message": "Authorization required"})
+
+        endpoint = self.endpoint_class(method, path)
+        delay, error_status = self.server.faults.draw(endpoint)
+        self.server.count(endpoint, error_status is not None)
+        if delay:
+            time.sleep(delay)
+        if error_status is not None:
+            return self.send(error_status, {"errorCode": error_status * 100, "message": "Injected error"})
+
+        try:
+            with self.server.vault.lock:
+                status, result, content_type = self.route(method, path, params, body)
+        except ApiError as e:
+            return self.send(e.status, {"errorCode": e.code, "message": str(e)})
+        except (ValueError, KeyError) as e:
+            return self.send(400, {"errorCode": 40000, "message": str(e)})
+        self.send(status, result, content_type)
+
+    @staticmethod
+    def endpoint_class(method: str, path: str) -> str:
+        if path.startswith("/search/simple/"):
+            return "search"
+        if path.startswith("/search/"):
+            return "query"
+        if path.startswith(("/commands/", "/open/")):
+            return "command"
+        if method != "GET":
+            return "write"
+        return "list" if path.startswith("/vault/") and path.endswith("/") else "read"
+
+    def route(self, method: str, path: str, params: dict, body: str) -> tuple[int, Any, str]:
+        vault = self.server.vault
+        if path.startswith("/vault/"):
+            target = path[len("/vault/") :]
+            if target.endswith("/") or not target:
+                if method != "GET":
+                    raise ApiError(405, 40500, "Method not allowed on directories")
+                return 200, {"files": vault.listing(target)}, "application/json"
+            return self.file(method, target, body)
+        if path == "/search/simple/" and method == "POST":
+            return 200, simple_search(
+                vault,
+                params.get("query", ""),
+                int(params.get("contextLength", 100)),
+                int(params.get("limit", 100)),
+            ), "application/json"
+        if path == "/search/" and method == "POST":
+            content_type = self.headers.get("Content-Type", "")
+            if "jsonlogic" in content_type:
+                return 200, jsonlogic_search(vault, json.loads(body)), "application/json"
+            if "dataview.dql" in content_type:
+                return 200, dataview_search(vault, body), "application/json"
+            raise ApiError(400, 40070, f"Unsupported Content-Type '{content_type}'")
+        if path.startswith("/periodic/"):
+            period, _, rest = path[len("/periodic/") :].partition("/")
+            if rest == "recent" and method == "GET":
+                return 200, self.recent_periodic(period, params), "application/json"
+            return self.file(method, vault.periodic_path(period), body)
+        if path == "/active/":
+            if vault.active is None:
+                raise ApiError(404, 40400, "No active file")
+            return self.file(method, vault.active, body)
+        if path == "/commands/" and method == "GET":
+            return 200, {"commands": COMMANDS}, "application/json"
+        if path.startswith("/commands/") and method == "POST":
+            command_id = path[len("/commands/") :].strip("/")
+            if command_id not in {command["id"] for command in COMMANDS}:
+                raise ApiError(404, 40400, "Not Found")
+            return 204, None, "application/json"
+        if path.startswith("/open/") and method == "POST":
+            vault.active = path[len("/open/") :]
+            return 200, None, "application/json"
+        raise ApiError(404, 40400, "Not Found")
+
+    def file(self, method: str, path: str, body: str) -> tuple[int, Any, str]:
+        vault = self.server.vault
+        if method == "GET":
+            if "application/vnd.olrapi.note+json" in self.headers.get("Accept", ""):
+                return 200, vault.note_json(path), "application/json"
+            return 200, vault.get(path).content, "text/markdown"
+        if method == "PUT":
+            vault.put(path, body)
+        elif method == "POST":
+            existing = vault.notes.get(path)
+            vault.put(path, (existing.content if existing else "") + body)
+        elif method == "PATCH":
+            vault.put(path, patch_note(vault.get(path).content, self.headers, body))
+        elif method == "DELETE":
+            vault.delete(path)
+        return 204, None, "application/json"
+
+    def recent_periodic(self, period: str, params: dict) -> list:
+        vault = self.server.vault
+        folder = vault.periodic_path(period).rsplit("/", 1)[0] + "/"
+        paths = sorted(
+            (p for p in vault.notes if p.startswith(folder) and "/" not in p[len(folder) :]),
+            reverse=True,
+        )[: int(params.get("limit", 5))]
+        include_content = params.get("includeContent", "false").lower() == "true"
+        return [
+            {"path": p, **({"content": vault.notes[p].content} if include_content else {})}
+            for p in paths
+        ]
+
+
+@contextmanager
+def running(
+    vault: MockVault | None = None,
+    faults: Faults | None = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    api_key: str = DEFAULT_API_KEY,
+) -> Iterator[MockObsidianServer]:
+    """Serve ``vault`` on a background thread for the duration of the block.
+
+    Port 0 picks a free port; read it from ``server.url``.
+    """
+    server = MockObsidianServer((host, port), vault or MockVault.synthetic(), faults, api_key)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def _endpoint_latency(value: str) -> tuple[str, float]:
+    endpoint, _, seconds = value.partition("=")
+    if endpoint not in ENDPOINTS:
+        raise argparse.ArgumentTypeError(f"endpoint must be one of {', '.join(ENDPOINTS)}")
+    return endpoint, float(seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--vault", help="Directory to load notes from")
+    source.add_argument("--notes", type=int, default=1000, help="Size of the synthetic vault")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=27124)
+    parser.add_argument("--api-key", default=os.getenv("OBSIDIAN_API_KEY", DEFAULT_API_KEY))
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra seconds, up to this")
+    parser.add_argument(
+        "--latency-for",
+        type=_endpoint_latency,
+        action="append",
+        default=[],
+        metavar="ENDPOINT=SECONDS",
+        help=f"Latency override for one endpoint class ({', '.join(ENDPOINTS)})",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--stall-rate", type=float, default=0.0)
+    parser.add_argument("--stall", type=float, default=60.0)
+    parser.add_argument("--certfile", help="Serve HTTPS with this certificate")
+    parser.add_argument("--keyfile")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    vault = (
+        MockVault.from_directory(args.vault)
+        if args.vault
+        else MockVault.synthetic(args.notes, args.seed)
+    )
+    faults = Faults(
+        latency=args.latency,
+        jitter=args.jitter,
+        per_endpoint=dict(args.latency_for),
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        stall_rate=args.stall_rate,
+        stall=args.stall,
+        seed=args.seed,
+    )
+    server = MockObsidianServer((args.host, args.port), vault, faults, args.api_key, args.verbose)
+    if args.certfile:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(args.certfile, args.keyfile)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+    print(f"Serving {len(vault.notes)} notes at {server.url} (API key: {args.api_key})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Replay a recorded tool-call trace and diff the latency profiles.
+
+Traces come from running the server with OBSIDIAN_TRACE_FILE set (see
+README). The replayer starts the mock REST server over a vault, launches
+a server build as a subprocess and re-sends every recorded call over MCP
+stdio, at the original pacing, faster, or as fast as possible. The
+replayed server records its own trace, so recorded and replayed
+server-side latencies are compared like for like, per tool.
+
+Redacted strings are replayed as filler of the same length. Paths only
+resolve if the mock serves a copy of the traced vault (--vault).
+
+Usage:
+    uv run python benchmarks/replay_trace.py trace.jsonl --vault ~/vault-copy [--speed 4]
+    uv run python benchmarks/replay_trace.py trace.jsonl --speed 0 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import shlex
+import sys
+import tempfile
+import time
+from typing import Any
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_e2e import summarize  # noqa: E402
+from mock_server import Faults, MockVault, running  # noqa: E402
+
+from mcp_obsidian.trace import read_trace  # noqa: E402
+
+REDACTED = re.compile(r"<redacted:(\d+):[0-9a-f]+>")
+
+
+def unredact(value: Any) -> Any:
+    """Swap redaction placeholders for filler of the original length."""
+    if isinstance(value, dict):
+        return {k: unredact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [unredact(v) for v in value]
+    if isinstance(value, str):
+        match = REDACTED.fullmatch(value)
+        if match:
+            return "x" * int(match.group(1))
+    return value
+
+
+async def replay(entries: list[dict], args, command: list[str], env: dict) -> dict[str, list]:
+    """Re-send ``entries``; return client-side latency and errors per tool."""
+    params = StdioServerParameters(command=command[0], args=command[1:], env=env)
+    client: dict[str, list[float]] = {}
+    errors: dict[str, int] = {}
+    limit = asyncio.Semaphore(args.concurrency if args.speed == 0 else len(entries) or 1)
+
+    async def send(session: ClientSession, entry: dict, at: float):
+        if args.speed:
+            await asyncio.sleep(max(0.0, at - time.perf_counter()))
+        async with limit:
+            start = time.perf_counter()
+            result = await session.call_tool(entry["tool"], unredact(entry["arguments"]))
+            client.setdefault(entry["tool"], []).append(time.perf_counter() - start)
+            errors[entry["tool"]] = errors.get(entry["tool"], 0) + bool(result.isError)
+
+    with open(os.devnull, "w") as errlog:
+        async with stdio_client(params, errlog=errlog) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                origin, first = time.perf_counter(), entries[0]["ts"]
+                await asyncio.gather(
+                    *(
+                        send(session, entry, origin + (entry["ts"] - first) / (args.speed or 1))
+                        for entry in entries
+                    )
+                )
+    return {"client": client, "errors": errors}
+
+
+def profile(entries: list[dict]) -> dict[str, dict]:
+    by_tool: dict[str, list[float]] = {}
+    for entry in entries:
+        by_tool.setdefault(entry["tool"], []).append(entry["duration_ms"] / 1000)
+    return {tool: summarize(samples) for tool, samples in by_tool.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trace", help="JSONL trace written with OBSIDIAN_TRACE_FILE")
+    parser.add_argument("--vault", help="Vault directory for the mock (a copy of the traced vault)")
+    parser.add_argument("--notes", type=int, default=2000, help="Synthetic vault size otherwise")
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="Pacing factor; 0 sends as fast as possible"
+    )
+    parser.add_argument("--concurrency", type=int, default=4, help="Calls in flight at --speed 0")
+    parser.add_argument("--latency", type=float, default=0.002, help="Mock REST latency (s)")
+    parser.add_argument(
+        "--server-command",
+        default=f"{shlex.quote(sys.executable)} -c 'import mcp_obsidian; mcp_obsidian.main()'",
+        help="Command that starts the server build to test",
+    )
+    parser.add_argument("--output", help="Write the comparison to this JSON file")
+    args = parser.parse_args()
+
+    recorded = read_trace(args.trace)
+    if not recorded:
+        parser.error(f"{args.trace} has no calls")
+    vault = MockVault.from_directory(args.vault) if args.vault else MockVault.synthetic(args.notes)
+
+    with tempfile.TemporaryDirectory() as tmp, running(vault, Faults(latency=args.latency)) as mock:
+        replay_trace = os.path.join(tmp, "replay.jsonl")
+        host, port = mock.server_address
+        env = os.environ | {
+            "OBSIDIAN_API_KEY": "mock-api-key",
+            "OBSIDIAN_PROTOCOL": "http",
+            "OBSIDIAN_HOST": host,
+            "OBSIDIAN_PORT": str(port),
+            "OBSIDIAN_TRACE_FILE": replay_trace,
+            "OBSIDIAN_TRACE_REDACT": "all",
+        }
+        started = time.perf_counter()
+        outcome = asyncio.run(replay(recorded, args, shlex.split(args.server_command), env))
+        wall = time.perf_counter() - started
+        replayed = read_trace(replay_trace)
+
+    before, after = profile(recorded), profile(replayed)
+    recorded_errors: dict[str, int] = {}
+    for entry in recorded:
+        recorded_errors[entry["tool"]] = recorded_errors.get(entry["tool"], 0) + bool(entry["error"])
+    span = recorded[-1]["ts"] - recorded[0]["ts"]
+    print(f"Replayed {len(recorded)} calls in {wall:.1f}s (recorded over {span:.1f}s)\n")
+    print(f"{'tool':<36} {'n':>5} {'p50 ms rec -> replay':>24} {'p95 ms rec -> replay':>24} "
+          f"{'errors':>9}")
+    comparison = {}
+    for tool in sorted(before):
+        old, new = before[tool], after.get(tool)
+        if new is None:
+            continue
+        cells = [
+            f"{old[key]:>8.1f} -> {new[key]:>8.1f} {(new[key] - old[key]) / old[key] if old[key] else 0:>+5.0%}"
+            for key in ("p50_ms", "p95_ms")
+        ]
+        errors = f"{recorded_errors.get(tool, 0)}->{outcome['errors'].get(tool, 0)}"
+        print(f"{tool:<36} {old['calls']:>5} {cells[0]:>24} {cells[1]:>24} {errors:>9}")
+        comparison[tool] = {
+            "recorded": old | {"errors": recorded_errors.get(tool, 0)},
+            "replayed": new | {"errors": outcome["errors"].get(tool, 0)},
+            "client": summarize(outcome["client"][tool]),
+        }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"trace": args.trace, "speed": args.speed, "tools": comparison}, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Deterministic synthetic vaults for scaling experiments.
+
+Generates vaults of controlled shape: any number of notes in a folder tree
+of configurable depth and fanout, frontmatter and tags, a wikilink graph
+with a few heavily linked hub notes, and large daily notes. The same seed
+and end date always give the same vault.
+
+Usage:
+    uv run python benchmarks/vault_gen.py /tmp/vault-100k --notes 100000 --seed 1
+    uv run python benchmarks/mock_server.py --vault /tmp/vault-100k
+"""
+
+import argparse
+import os
+import random
+import time
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta
+
+# Vocabulary for titles, prose, folders and tags (tags use the first words)
+WORDS = (
+    "alpha beta gamma delta meeting review garden inbox idea travel project design "
+    "budget launch research draft summary roadmap hiring customer feedback release "
+    "incident metrics planning retro notes reading book podcast recipe health "
+    "finance home family learning python writing archive reference template "
+    "weekly quarterly goal habit journal sprint backlog spec architecture"
+).split()
+
+DAILY_SECTIONS = ["Log", "Tasks", "Meetings", "Notes", "Ideas", "Reading"]
+
+
+def folder_tree(rng: random.Random, depth: int, fanout: int) -> list[str]:
+    """Folders (without the vault root), breadth first, ``fanout`` per level."""
+    folders: list[str] = []
+    level = [""]
+    for _ in range(depth):
+        level = [
+            f"{parent}{rng.choice(WORDS).title()} {i}/"
+            for parent in level
+            for i in range(fanout)
+        ]
+        folders.extend(level)
+    return [folder.rstrip("/") for folder in folders]
+
+
+def _prose(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, k=words)).capitalize() + "."
+
+
+def _frontmatter(rng: random.Random, tags: list[str], created: date) -> str:
+    return (
+        "---\n"
+        f"status: {rng.choice(['todo', 'active', 'done', 'someday'])}\n"
+        f"rating: {rng.randint(1, 5)}\n"
+        f"created: {created.isoformat()}\n"
+        "tags:\n" + "".join(f"  - {tag}\n" for tag in tags) + "---\n"
+    )
+
+
+def generate(
+    notes: int = 1000,
+    depth: int = 3,
+    fanout: int = 4,
+    daily: int = 60,
+    daily_kb: int = 16,
+    links: int = 6,
+    tags: int = 24,
+    words: int = 80,
+    seed: int = 0,
+    end: date | None = None,
+) -> Iterator[tuple[str, str, float]]:
+    """Yield (path, content, mtime) for every file of a synthetic vault.
+
+    Args:
+        notes: Number of regular notes (daily notes come on top)
+        depth: Folder nesting depth
+        fanout: Subfolders per folder
+        daily: Number of daily notes, one per day up to ``end``
+        daily_kb: Approximate size of each daily note in KiB
+        links: Average wikilinks per note; targets are skewed towards a
+            few hub notes, like real vaults
+        tags: Size of the tag vocabulary
+        words: Approximate words of prose per section
+        seed: RNG seed
+        end: Date of the newest daily note and modification time (today
+            if None)
+    """
+    rng = random.Random(seed)
+    end = end or date.today()
+    end_time = datetime.combine(end, datetime.min.time()).timestamp() + 12 * 3600
+    folders = folder_tree(rng, depth, fanout) or [""]
+    vocabulary = WORDS[: max(1, min(tags, len(WORDS)))]
+    titles = [f"{' '.join(rng.sample(WORDS, 2)).title()} {i}" for i in range(notes)]
+
+    for title in titles:
+        folder = rng.choice(folders)
+        age_days = rng.expovariate(1 / 90)
+        created = end - timedelta(days=int(age_days) + rng.randint(0, 365))
+        note_tags = rng.sample(vocabulary, min(len(vocabulary), rng.randint(1, 3)))
+        # rng.random() ** 3 concentrates links on the first titles (hubs)
+        link_line = " ".join(
+            f"[[{titles[int(notes * rng.random() ** 3)]}]]"
+            for _ in range(rng.randint(0, 2 * links))
+        )
+        sections = "".join(
+            f"## {heading.title()}\n\n{_prose(rng, words)} #{rng.choice(vocabulary)}\n\n"
+            for heading in rng.sample(WORDS, rng.randint(2, 4))
+        )
+        content = (
+            _frontmatter(rng, note_tags, created)
+            + f"\n# {title}\n\n{link_line}\n\n{sections}"
+        )
+        path = f"{folder}/{title}.md" if folder else f"{title}.md"
+        yield path, content, end_time - age_days * 86400
+
+    for offset in range(daily):
+        day = end - timedelta(days=offset)
+        parts = [f"# {day.isoformat()}\n"]
+        size = 0
+        target = daily_kb * 1024
+        while size < target:
+            for heading in DAILY_SECTIONS:
+                lines = "".join(
+                    f"- {_prose(rng, 12)}"
+                    + (f" [[{titles[int(notes * rng.random() ** 3)]}]]" if notes else "")
+                    + "\n"
+                    for _ in range(rng.randint(3, 8))
+                )
+                block = f"\n## {heading}\n\n{lines}"
+                parts.append(block)
+                size += len(block)
+            if size < target:
+                parts.append(f"\n# {day.isoformat()} (continued)\n")
+        yield f"Daily/{day.isoformat()}.md", "".join(parts), end_time - offset * 86400
+
+
+def write_vault(root: str, **spec) -> int:
+    """Write a generated vault under ``root``; returns the number of files.
+
+    Keyword arguments are passed to generate().
+    """
+    count = 0
+    made: set[str] = set()
+    for path, content, mtime in generate(**spec):
+        full = os.path.join(root, *path.split("/"))
+        directory = os.path.dirname(full)
+        if directory not in made:
+            os.makedirs(directory, exist_ok=True)
+            made.add(directory)
+        with open(full, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.utime(full, (mtime, mtime))
+        count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", help="Directory to write the vault to")
+    parser.add_argument("--notes", type=int, default=1000)
+    parser.add_argument("--depth", type=int, default=3, help="Folder nesting depth")
+    parser.add_argument("--fanout", type=int, default=4, help="Subfolders per folder")
+    parser.add_argument("--daily", type=int, default=60, help="Number of daily notes")
+    parser.add_argument("--daily-kb", type=int, default=16, help="Size of each daily note")
+    parser.add_argument("--links", type=int, default=6, help="Average wikilinks per note")
+    parser.add_argument("--tags", type=int, default=24, help="Tag vocabulary size")
+    parser.add_argument("--words", type=int, default=80, help="Words per section")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--end", type=date.fromisoformat, help="Newest date (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    if os.path.exists(args.output) and os.listdir(args.output):
+        parser.error(f"{args.output} is not empty")
+    started = time.perf_counter()
+    spec = {k: v for k, v in vars(args).items() if k != "output"}
+    count = write_vault(args.output, **spec)
+    print(f"Wrote {count} files to {args.output} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
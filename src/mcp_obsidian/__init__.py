@@ -1,13 +1,23 @@
-from . import server
 import asyncio
+import importlib
 
 __version__ = "0.6.4"
 
 
 def main():
     """Main entry point for the package."""
+    from . import server
+
     asyncio.run(server.main())
 
 
+def __getattr__(name: str):
+    # Submodules load on first access: importing the package stays cheap
+    # (no MCP SDK, no HTTP stack) until the server actually starts
+    if name == "server":
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # Optionally expose other important items at package level
-__all__ = ["main", "server"]
+__all__ = ["main"]
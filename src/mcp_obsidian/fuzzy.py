@@ -0,0 +1,151 @@
+import re
+import unicodedata
+from bisect import bisect_right
+from collections import Counter
+from itertools import chain
+from typing import NamedTuple
+
+
+class Match(NamedTuple):
+    path: str
+    score: float
+    matched: str  # the name or alias that matched
+
+
+def normalize(text: str) -> str:
+    """Lowercase, NFC-normalize and drop a trailing ".md" for matching."""
+    text = unicodedata.normalize("NFC", text).casefold().strip()
+    return text[:-3] if text.endswith(".md") else text
+
+
+def trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def score(query: str, key: str) -> float:
+    """Score how well a normalized query matches a normalized name (0-1).
+
+    Ranks like a quick switcher: exact name, then prefix, then substring,
+    then an in-order subsequence (tighter spans score higher), with trigram
+    overlap as the tie-breaker for typos.
+    """
+    if not query or not key:
+        return 0.0
+    if key == query:
+        return 1.0
+    if key.startswith(query):
+        return 0.9 + 0.09 * len(query) / len(key)
+    position = key.find(query)
+    if position >= 0:
+        return 0.75 + 0.1 * len(query) / len(key) - 0.05 * position / len(key)
+
+    # Subsequence: every query character in order, as tightly as possible
+    span = _subsequence_span(query, key)
+    if span is not None:
+        return 0.4 + 0.3 * len(query) / span
+
+    q_grams, k_grams = trigrams(query), trigrams(key)
+    return 0.35 * len(q_grams & k_grams) / len(q_grams | k_grams)
+
+
+def _subsequence_span(query: str, key: str) -> int | None:
+    best = None
+    start = key.find(query[0])
+    while start >= 0:
+        position = start
+        for char in query[1:]:
+            position = key.find(char, position + 1)
+            if position < 0:
+                return best
+        span = position - start + 1
+        if best is None or span < best:
+            best = span
+        start = key.find(query[0], start + 1)
+    return best
+
+
+class NoteIndex:
+    """Precomputed fuzzy-lookup index over vault paths and note aliases.
+
+    Every path contributes its file name (without ".md") as a key, and every
+    alias its own key pointing at the same path. Candidates are gathered
+    from a trigram posting list and from one regex pass over all keys
+    joined into a single string (for subsequence matches such as "mtgnts"
+    for "meeting notes"), so only a small set of keys is scored in Python.
+    """
+
+    def __init__(self, paths: list[str], aliases: dict[str, list[str]] | None = None):
+        self.paths = list(paths)
+        self.keys: list[str] = []
+        self.labels: list[str] = []
+        self.targets: list[int] = []
+        for i, path in enumerate(self.paths):
+            name = path.rsplit("/", 1)[-1]
+            self._add_key(name[:-3] if name.endswith(".md") else name, i)
+        path_ids = {path: i for i, path in enumerate(self.paths)}
+        for path, names in (aliases or {}).items():
+            if path in path_ids:
+                for name in names:
+                    self._add_key(name, path_ids[path])
+
+        self._postings: dict[str, list[int]] = {}
+        for key_id, key in enumerate(self.keys):
+            for gram in trigrams(key):
+                self._postings.setdefault(gram, []).append(key_id)
+
+        self._blob = "\n".join(self.keys)
+        self._line_starts = [0]
+        for key in self.keys[:-1]:
+            self._line_starts.append(self._line_starts[-1] + len(key) + 1)
+
+    def _add_key(self, label: str, target: int) -> None:
+        self.keys.append(normalize(label))
+        self.labels.append(label)
+        self.targets.append(target)
+
+    def _candidates(self, query: str, limit: int) -> set[int]:
+        candidates: set[int] = set()
+        # Possessive gaps jump to the next occurrence without backtracking
+        pattern = re.escape(query[0]) + "".join(
+            f"[^\n{re.escape(char)}]*+{re.escape(char)}" for char in query[1:]
+        )
+        for match in re.finditer(pattern, self._blob):
+            candidates.add(bisect_right(self._line_starts, match.start()) - 1)
+
+        if len(candidates) < limit and len(query) >= 3:
+            # Typos: rank keys by shared trigrams and keep the best few
+            grams = trigrams(query)
+            counts = Counter(
+                chain.from_iterable(self._postings.get(gram, ()) for gram in grams)
+            )
+            threshold = max(2, len(grams) // 3)
+            candidates.update(
+                key_id
+                for key_id, count in counts.most_common(limit * 10)
+                if count >= threshold
+            )
+        return candidates
+
+    def search(self, query: str, limit: int = 10) -> list[Match]:
+        """Return the best matching paths, one entry per path, best first."""
+        normalized = normalize(query)
+        if not normalized:
+            return []
+
+        best: dict[int, tuple[float, int]] = {}
+        for key_id in self._candidates(normalized, limit):
+            key_score = score(normalized, self.keys[key_id])
+            if key_score <= 0:
+                continue
+            target = self.targets[key_id]
+            if target not in best or key_score > best[target][0]:
+                best[target] = (key_score, key_id)
+
+        ranked = sorted(
+            best.items(), key=lambda item: (-item[1][0], len(self.paths[item[0]]))
+        )
+        return [
+            Match(self.paths[target], round(key_score, 3), self.labels[key_id])
+            for target, (key_score, key_id) in ranked[:limit]
+        ]
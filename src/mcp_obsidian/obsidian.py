@@ -3,9 +3,57 @@ import requests
 import urllib.parse
 from urllib.parse import quote, unquote
 import unicodedata
+import contextvars
+import hashlib
+import json
 import os
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from fnmatch import fnmatchcase
 from typing import Any
 
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+
+from .outline import (
+    HeadingIndex,
+    Outline,
+    OutlineCache,
+    block_bounds,
+    parse_headings,
+)
+from .fuzzy import NoteIndex
+from .resilience import CircuitBreaker, RetryPolicy, is_transient
+from .scheduler import BULK, Scheduler, priority
+from .query_cache import QueryCache
+from .singleflight import SingleFlight
+from .spans import HTTP_HOOKS, http_span, span, traced, traceparent
+from .timeouts import DeadlineExceeded, TimeoutPolicy, remaining, static_timeouts
+from .vault_tree import VaultTree, build_tree
+
+
+def _content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _in_context(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap ``fn`` to run in the caller's context (e.g. its deadline) when
+    called from a worker thread."""
+    context = contextvars.copy_context()
+    return lambda *args: context.copy().run(fn, *args)
+
+
+def _is_read_timeout(error: Exception) -> bool:
+    """Whether a request failed waiting for (part of) the response."""
+    if isinstance(error, requests.ReadTimeout):
+        return True
+    # Timeouts while reading the body surface as ConnectionError
+    return isinstance(error, requests.ConnectionError) and any(
+        isinstance(arg, ReadTimeoutError) for arg in error.args
+    )
+
 
 class HeadingNotFoundError(Exception):
     """Raised when a target heading is not found in a file."""
@@ -21,6 +69,13 @@ class Obsidian:
         host: str = str(os.getenv("OBSIDIAN_HOST", "127.0.0.1")),
         port: int = int(os.getenv("OBSIDIAN_PORT", "27124")),
         verify_ssl: bool = False,
+        outline_cache: OutlineCache | None = None,
+        vault_tree: VaultTree | None = None,
+        retry_policy: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        timeouts: TimeoutPolicy | None = None,
+        scheduler: Scheduler | None = None,
+        query_cache: QueryCache | None = None,
     ):
         self.api_key = api_key
 
@@ -34,18 +89,46 @@ class Obsidian:
         self.host = host
         self.port = port
         self.verify_ssl = verify_ssl
-        self.timeout = (3, 6)
+        self.timeouts = timeouts if timeouts is not None else TimeoutPolicy()
+        self.scheduler = scheduler if scheduler is not None else Scheduler()
+        self.query_cache = query_cache if query_cache is not None else QueryCache()
+        self.outline_cache = (
+            outline_cache if outline_cache is not None else OutlineCache()
+        )
+        self.vault_tree = vault_tree if vault_tree is not None else VaultTree()
+        self._note_index: (
+            tuple[float, tuple[int, float | None], NoteIndex] | None
+        ) = None
+        self._aliases: tuple[float, dict[str, list[str]]] | None = None
+        self._flights = SingleFlight()
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        # Pooled keep-alive connections instead of a new TCP and TLS
+        # handshake per request; one per request the scheduler lets through
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_maxsize=self.scheduler.heavy.concurrency + self.scheduler.cheap.concurrency
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def get_base_url(self) -> str:
         return f"{self.protocol}://{self.host}:{self.port}"
 
     def _get_headers(self) -> dict:
         headers = {"Authorization": f"Bearer {self.api_key}"}
+        parent = traceparent()
+        if parent is not None:
+            headers["traceparent"] = parent
         return headers
 
-    def _safe_call(self, f) -> Any:
+    def _timeout(self, endpoint: str) -> tuple[float, float]:
+        """(connect, read) timeout for a request to an endpoint class."""
+        return self.timeouts.timeout_for(endpoint)
+
+    def _safe_call(self, f, idempotent: bool = False, endpoint: str = "read") -> Any:
         try:
-            return f()
+            return self._call_with_retries(f, idempotent, endpoint)
         except requests.HTTPError as e:
             # Try to parse JSON error response, fall back to raw text
             error_data = {}
@@ -64,6 +147,147 @@ class Obsidian:
         except requests.exceptions.RequestException as e:
             raise Exception(f"Request failed: {str(e)}")
 
+    def _call_with_retries(
+        self, f: Callable[[], Any], idempotent: bool, endpoint: str = "read"
+    ) -> Any:
+        """Run a request through the circuit breaker, retrying if allowed.
+
+        Each attempt first waits for a slot in the endpoint's scheduler lane.
+        Transient failures (connection errors, timeouts, 5xx) of idempotent
+        requests are retried with jittered exponential backoff, unless the
+        next attempt could not start before the caller's deadline. Errors
+        are re-raised unchanged for ``_safe_call`` to format. Latencies of
+        answered requests feed the endpoint's adaptive timeout.
+
+        A read timeout shorter than the endpoint's static one (adaptive
+        mode) only says the request was slower than usual, not that the API
+        is down: it is recorded as a latency sample instead of a breaker
+        failure, and an idempotent request is retried once, at once, with
+        the static timeout.
+        """
+        attempt = 0
+        static = False
+        while True:
+            probe = self.breaker.before_call()
+            try:
+                result: Any = None
+                error: Exception | None = None
+                # Hold a scheduler slot only while the request is on the wire
+                with self.scheduler.slot(endpoint), static_timeouts(static):
+                    limit = self.timeouts.read_timeout(endpoint)
+                    started = time.monotonic()
+                    try:
+                        with http_span(endpoint=endpoint, attempt=attempt):
+                            result = f()
+                    except DeadlineExceeded:
+                        raise
+                    except Exception as e:
+                        error = e
+                    elapsed = time.monotonic() - started
+
+                if error is not None:
+                    left = remaining()
+                    if isinstance(error, requests.Timeout) and left is not None and left <= 0:
+                        # Cut short by the caller's deadline, not an outage
+                        raise DeadlineExceeded(f"Deadline exceeded: {error}") from error
+                    if _is_read_timeout(error) and limit < self.timeouts.static_timeout(
+                        endpoint
+                    ):
+                        # Slower than usual, not an outage: learn from it
+                        self.timeouts.record(endpoint, max(elapsed, limit))
+                        if not idempotent:
+                            raise error
+                        self.retry_policy.record("retries")
+                        static = True
+                        attempt += 1
+                        continue
+                    if not is_transient(error):
+                        # The API answered; it is up even if the call failed
+                        self.breaker.record_success()
+                        probe = False
+                        self.timeouts.record(endpoint, elapsed)
+                        raise error
+                    self.breaker.record_failure()
+                    probe = False
+                    delay = self.retry_policy.delay(attempt, error)
+                    if (
+                        not idempotent
+                        or attempt >= self.retry_policy.retries
+                        or (left is not None and delay >= left)
+                    ):
+                        if attempt:
+                            self.retry_policy.record("exhausted")
+                        raise error
+                    self.retry_policy.record("retries")
+                    with span("retry backoff", delay_ms=round(delay * 1000, 1)):
+                        time.sleep(delay)
+                    attempt += 1
+                    continue
+
+                self.breaker.record_success()
+                probe = False
+            finally:
+                if probe:
+                    # No verdict on the API (deadline, adaptive timeout): let
+                    # another call probe
+                    self.breaker.release_probe()
+            self.timeouts.record(endpoint, elapsed)
+            if attempt:
+                self.retry_policy.record("recovered")
+            return result
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Health and counters of the client's resilience and caching layers."""
+        return {
+            "circuit_breaker": self.breaker.stats(),
+            "retries": self.retry_policy.stats(),
+            "coalescing": self._flights.stats(),
+            "timeouts": self.timeouts.stats(),
+            "scheduler": self.scheduler.stats(),
+            "dataview_cache": self.query_cache.stats(),
+        }
+
+    @contextmanager
+    def _writing(self, key: str) -> Iterator[None]:
+        """Bracket a write to ``key``: a barrier for reads of the path, and
+        afterwards (even if it failed part way) Dataview results are stale."""
+        try:
+            with self._flights.write(key):
+                yield
+        finally:
+            self.query_cache.invalidate()
+
+    def _shared_read(
+        self,
+        f: Callable[[], Any],
+        method: str,
+        url: str,
+        body: Any = None,
+        path: str | None = None,
+        endpoint: str = "read",
+    ) -> Any:
+        """Like ``_safe_call``, but concurrent identical reads share one request.
+
+        Args:
+            f: Performs the request
+            method: HTTP method, part of the request identity
+            url: Request URL, part of the request identity
+            body: Anything else that distinguishes the request (query
+                parameters, body, Accept header); hashed into the identity
+            path: Vault path (cache key) the read depends on, so writes to
+                it act as barriers; None for vault-wide reads
+            endpoint: Endpoint class, for timeouts and latency tracking
+        """
+        digest = None
+        if body is not None:
+            encoded = json.dumps(body, sort_keys=True, ensure_ascii=False)
+            digest = hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+        return self._flights.do(
+            (method, url, digest),
+            lambda: self._safe_call(f, idempotent=True, endpoint=endpoint),
+            path,
+        )
+
     def _encode_path(self, path: str) -> str:
         """Encode path segments while preserving directory separators and trailing slashes.
 
@@ -117,59 +341,353 @@ class Obsidian:
 
         return encoded_path
 
+    def _cache_key(self, path: str) -> str:
+        """Normalize a vault path for use as a cache key."""
+        return unicodedata.normalize("NFC", unquote(path)).strip("/")
+
+    @traced
     def list_files_in_vault(self) -> Any:
-        url = f"{self.get_base_url()}/vault/"
+        return self._list_directory("")
+
+    @traced
+    def list_files_in_dir(self, dirpath: str) -> Any:
+        directory = self._cache_key(dirpath)
+        return self._list_directory(f"{directory}/" if directory else "")
+
+    @traced
+    def _fetch_listing(self, directory: str) -> list[str]:
+        encoded_path = self._encode_path(directory)
+        url = f"{self.get_base_url()}/vault/{encoded_path}"
 
         def call_fn():
-            response = requests.get(
+            response = self.session.get(
                 url,
                 headers=self._get_headers(),
                 verify=self.verify_ssl,
-                timeout=self.timeout,
+                hooks=HTTP_HOOKS,
+                timeout=self._timeout("list"),
             )
             response.raise_for_status()
 
             return response.json()["files"]
 
-        return self._safe_call(call_fn)
+        return self._shared_read(call_fn, "GET", url, endpoint="list")
 
-    def list_files_in_dir(self, dirpath: str) -> Any:
-        encoded_path = self._encode_path(dirpath)
-        # Ensure exactly one trailing slash for directory endpoint
-        if not encoded_path.endswith("/"):
-            encoded_path += "/"
+    def _list_directory(self, directory: str) -> list[str]:
+        """List one directory ("" for the vault root, else "dir/sub/").
+
+        Answered from the in-memory vault tree when its listing of the
+        directory is fresh; otherwise fetched and merged into the tree.
+        """
+        files = self.vault_tree.listing(directory)
+        if files is None:
+            files = self._fetch_listing(directory)
+            self.vault_tree.store(directory, files)
+        return files
+
+    @traced
+    def list_files_recursive(
+        self,
+        dirpath: str = "",
+        max_depth: int | None = None,
+        pattern: str | None = None,
+        as_tree: bool = False,
+        max_workers: int = int(os.getenv("OBSIDIAN_LIST_CONCURRENCY", "8")),
+    ) -> Any:
+        """List a directory and its subdirectories.
+
+        Crawls breadth-first; all directories of one level are listed
+        concurrently. Directories already known to the in-memory vault tree
+        are not requested again.
+
+        Args:
+            dirpath: Directory to start from (relative to vault root), "" for
+                the whole vault
+            max_depth: Number of directory levels to list (1 lists only
+                ``dirpath``); None for no limit
+            pattern: Optional shell-style glob (e.g. "*.md", "Projects/*/todo.md")
+                matched against full file paths. When set, only matching
+                files are returned.
+            as_tree: Return a nested {"dir/": {...}, "file.md": None} tree
+                instead of a flat list
+            max_workers: Maximum number of directory requests in flight
+
+        Returns:
+            Sorted list of paths relative to the vault root (directories end
+            with "/"), or a nested tree relative to ``dirpath``
+        """
+        root = self._cache_key(dirpath)
+        root = f"{root}/" if root else ""
+
+        paths: list[str] = []
+        level = [root]
+        depth = 0
+        with priority(BULK):
+            # Crawl requests queue behind interactive ones
+            list_in_context = _in_context(self._list_directory)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            while level and (max_depth is None or depth < max_depth):
+                next_level = []
+                for directory, files in zip(
+                    level, executor.map(list_in_context, level)
+                ):
+                    for name in files:
+                        path = directory + name
+                        if name.endswith("/"):
+                            next_level.append(path)
+                            if pattern is None:
+                                paths.append(path)
+                        elif pattern is None or fnmatchcase(path, pattern):
+                            paths.append(path)
+                level = next_level
+                depth += 1
+
+        paths.sort()
+        if as_tree:
+            return build_tree(paths, root)
+        return paths
+
+    @traced
+    def get_aliases(self) -> dict[str, list[str]]:
+        """Get the frontmatter ``aliases`` of every note that has any.
+
+        One JsonLogic search returns only the alias values. Cached for
+        OBSIDIAN_LISTING_TTL seconds.
+
+        Returns:
+            Mapping of note path to its aliases
+        """
+        cached = self._aliases
+        if cached is not None and time.monotonic() - cached[0] <= self.vault_tree.ttl:
+            return cached[1]
+
+        aliases: dict[str, list[str]] = {}
+        for result in self.search_json({"var": "frontmatter.aliases"}):
+            value = result.get("result")
+            if isinstance(value, str):
+                value = [value]
+            if isinstance(value, list):
+                aliases[result["filename"]] = [str(v) for v in value if v]
+        self._aliases = (time.monotonic(), aliases)
+        return aliases
+
+    @traced
+    def resolve_note(
+        self, query: str, limit: int = 10, include_aliases: bool = True
+    ) -> list[dict[str, Any]]:
+        """Find vault files by approximate name, like Obsidian's quick switcher.
+
+        Matches file names and, optionally, frontmatter aliases by exact,
+        prefix, substring, subsequence and trigram similarity. The index is
+        built from the in-memory vault tree and rebuilt only when the set
+        of paths changes.
+
+        Args:
+            query: Note title or fragment (e.g. "mtg notes 0412")
+            limit: Maximum number of results
+            include_aliases: Also match frontmatter aliases (one extra
+                search request, cached)
+
+        Returns:
+            List of {"path", "score", "matched"} dictionaries, best first
+        """
+        aliases: dict[str, list[str]] = {}
+        alias_stamp = None
+        if include_aliases:
+            try:
+                aliases = self.get_aliases()
+                alias_stamp = self._aliases[0] if self._aliases else None
+            except Exception:
+                # Aliases are a bonus; names alone still resolve
+                pass
+
+        cached = self._note_index
+        now = time.monotonic()
+        files: list[str] | None = None
+        if cached is None or now - cached[0] > self.vault_tree.ttl:
+            # Reconcile the tree with the vault, then (re)build
+            files = [p for p in self.list_files_recursive() if not p.endswith("/")]
+            cached = None
+        version = (self.vault_tree.version, alias_stamp)
+        if cached is None or cached[1] != version:
+            if files is None:
+                # Only our own writes changed the tree; no need to re-crawl
+                files = list(self.vault_tree.files())
+            built_at = now if cached is None else cached[0]
+            cached = (built_at, version, NoteIndex(files, aliases))
+            self._note_index = cached
+
+        return [match._asdict() for match in cached[2].search(query, limit)]
+
+    @traced
+    def get_file_contents(self, filepath: str) -> Any:
+        encoded_path = self._encode_path(filepath)
         url = f"{self.get_base_url()}/vault/{encoded_path}"
 
         def call_fn():
-            response = requests.get(
+            response = self.session.get(
                 url,
                 headers=self._get_headers(),
                 verify=self.verify_ssl,
-                timeout=self.timeout,
+                hooks=HTTP_HOOKS,
+                timeout=self._timeout("read"),
             )
             response.raise_for_status()
 
-            return response.json()["files"]
+            return response.text
 
-        return self._safe_call(call_fn)
+        key = self._cache_key(filepath)
+        content = self._shared_read(call_fn, "GET", url, path=key, endpoint="read")
+        self.outline_cache.put(key, Outline.from_content(content))
+        return content
+
+    def _remember_note(self, note: Any) -> None:
+        """Cache the outline of a JSON note representation we already fetched."""
+        if isinstance(note, dict) and "path" in note and "content" in note:
+            mtime = (note.get("stat") or {}).get("mtime")
+            self.outline_cache.put(
+                self._cache_key(note["path"]),
+                Outline.from_content(note["content"], mtime),
+            )
 
-    def get_file_contents(self, filepath: str) -> Any:
+    @traced
+    def _get_note(self, filepath: str) -> tuple[str, Outline]:
+        """Get a note's content together with its parsed outline.
+
+        Requests the JSON note representation, which carries filesystem
+        metadata, so the outline can be stamped with the note's mtime. Falls
+        back to treating the body as plain markdown when the server answers
+        with text (mtime is then unknown). The outline is cached for later
+        heading operations, and a cached outline for the same mtime is reused
+        instead of re-parsing.
+
+        Returns:
+            Tuple of (content, outline)
+        """
         encoded_path = self._encode_path(filepath)
         url = f"{self.get_base_url()}/vault/{encoded_path}"
 
         def call_fn():
-            response = requests.get(
+            response = self.session.get(
                 url,
-                headers=self._get_headers(),
+                headers=self._get_headers()
+                | {"Accept": "application/vnd.olrapi.note+json"},
                 verify=self.verify_ssl,
-                timeout=self.timeout,
+                hooks=HTTP_HOOKS,
+                timeout=self._timeout("read"),
             )
             response.raise_for_status()
 
-            return response.text
+            if "json" in response.headers.get("Content-Type", ""):
+                note = response.json()
+                return note["content"], note.get("stat", {}).get("mtime")
+            return response.text, None
+
+        key = self._cache_key(filepath)
+        content, mtime = self._shared_read(
+            call_fn,
+            "GET",
+            url,
+            "application/vnd.olrapi.note+json",
+            key,
+            endpoint="read",
+        )
+        outline = self.outline_cache.get(key)
+        if outline is None or mtime is None or outline.mtime != mtime:
+            outline = Outline.from_content(content, mtime)
+            self.outline_cache.put(key, outline)
+        else:
+            outline.observed_at = time.monotonic()
+        return content, outline
+
+    @traced
+    def get_outline(
+        self,
+        filepath: str,
+        max_age: float = float(os.getenv("OBSIDIAN_OUTLINE_MAX_AGE", "60")),
+    ) -> dict:
+        """Get the structure of a note without its body.
+
+        Served from the outline cache, which is filled by every note this
+        client reads or writes, as long as the cached outline was confirmed
+        within ``max_age`` seconds. Otherwise the note is fetched once and
+        its outline cached.
+
+        Args:
+            filepath: Path to the file (relative to vault root)
+            max_age: Maximum age in seconds of a cached outline (0 to
+                always refetch)
+
+        Returns:
+            Dictionary with line count, size, mtime, frontmatter extent,
+            headings (level, text, line range, section size in characters)
+            and block IDs
+        """
+        outline = self.outline_cache.get(self._cache_key(filepath))
+        if outline is None or outline.age() > max_age:
+            _, outline = self._get_note(filepath)
+        return outline.to_dict()
 
-        return self._safe_call(call_fn)
+    @traced
+    def get_section(
+        self, filepath: str, target_type: str, target: str | None = None
+    ) -> str:
+        """Get only part of a note: a heading's section, a block or the frontmatter.
 
+        Args:
+            filepath: Path to the file (relative to vault root)
+            target_type: "heading", "block", or "frontmatter"
+            target: Heading text (supports "Parent::Child"), block ID (with
+                or without the leading "^"), or frontmatter field name. For
+                frontmatter, omit to get the whole block.
+
+        Returns:
+            The requested text. A heading section includes its heading line
+            and any subheadings.
+
+        Raises:
+            HeadingNotFoundError: If the heading does not exist
+            Exception: If the block or frontmatter field does not exist
+        """
+        content, outline = self._get_note(filepath)
+        lines = content.split("\n")
+
+        if target_type == "heading":
+            if not target:
+                raise ValueError("target is required for heading sections")
+            found = outline.index.find(target)
+            if found is None:
+                raise HeadingNotFoundError(
+                    f"Heading '{target}' not found in {filepath}"
+                )
+            start = outline.index.headings[found].line
+            end = outline.index.section_end(found)
+            return "\n".join(lines[start:end]).rstrip("\n")
+
+        if target_type == "block":
+            if not target:
+                raise ValueError("target is required for block sections")
+            block_id = target.lstrip("^")
+            if block_id not in outline.blocks:
+                raise Exception(f"Block '^{block_id}' not found in {filepath}")
+            start, end = block_bounds(lines, outline.blocks[block_id])
+            return "\n".join(lines[start:end])
+
+        if target_type == "frontmatter":
+            if outline.frontmatter_end is None:
+                raise Exception(f"No frontmatter in {filepath}")
+            if not target:
+                return "\n".join(lines[1 : outline.frontmatter_end])
+            frontmatter = self._parse_frontmatter(content)
+            if target not in frontmatter:
+                raise Exception(
+                    f"Frontmatter field '{target}' not found in {filepath}"
+                )
+            return frontmatter[target]
+
+        raise ValueError(f"Unknown target type: {target_type}")
+
+    @traced
     def get_batch_file_contents(self, filepaths: list[str]) -> str:
         """Get contents of multiple files and concatenate them with headers.
 
@@ -183,7 +701,8 @@ class Obsidian:
 
         for filepath in filepaths:
             try:
-                content = self.get_file_contents(filepath)
+                with priority(BULK):
+                    content = self.get_file_contents(filepath)
                 result.append(f"# {filepath}\n\n{content}\n\n---\n\n")
             except Exception as e:
                 # Add error message but continue processing other files
@@ -193,40 +712,51 @@ class Obsidian:
 
         return "".join(result)
 
+    @traced
     def search(self, query: str, context_length: int = 100, limit: int = 100) -> Any:
         url = f"{self.get_base_url()}/search/simple/"
         params = {"query": query, "contextLength": context_length, "limit": limit}
 
         def call_fn():
-            response = requests.post(
+            response = self.session.post(
                 url,
                 headers=self._get_headers(),
                 params=params,
                 verify=self.verify_ssl,
-                timeout=self.timeout,
+                hooks=HTTP_HOOKS,
+                timeout=self._timeout("search"),
             )
             response.raise_for_status()
             return response.json()
 
-        return self._safe_call(call_fn)
+        return self._shared_read(call_fn, "POST", url, params, endpoint="search")
 
+    @traced
     def append_content(self, filepath: str, content: str) -> Any:
         encoded_path = self._encode_path(filepath)
         url = f"{self.get_base_url()}/vault/{encoded_path}"
 
         def call_fn():
-            response = requests.post(
+            response = self.session.post(
                 url,
                 headers=self._get_headers() | {"Content-Type": "text/markdown"},
                 data=content,
                 verify=self.verify_ssl,
-                timeout=self.timeout,
+                hooks=HTTP_HOOKS,
+                timeout=self._timeout("write"),
             )
             response.raise_for_status()
             return None
 
-        return self._safe_call(call_fn)
+        key = self._cache_key(filepath)
+        self.outline_cache.invalidate(key)
+        with self._writing(key):
+            result = self._safe_call(call_fn, endpoint="write")
+        # Appending creates the file if it doesn't exist
+        self.vault_tree.add_file(key)
+        return result
 
+    @traced
     def patch_content(
         self,
         filepath: str,
@@ -267,16 +797,25 @@ class Obsidian:
             "Target": urllib.parse.quote(target),
         }
 
-        try:
-            response = requests.patch(
+        def call_fn():
+            response = self.session.patch(
                 url,
                 headers=headers,
                 data=content,
                 verify=self.verify_ssl,
-                timeout=self.timeout,
+                hooks=HTTP_HOOKS,
+                timeout=self._timeout("write"),
             )
             response.raise_for_status()
             return None
+
+        key = self._cache_key(filepath)
+        self.outline_cache.invalidate(key)
+        try:
+            with self._writing(key):
+                return self._call_with_retries(
+                    call_fn, idempotent=False, endpoint="write"
+                )
         except requests.HTTPError as e:
             raise Exception(self._format_http_error(e))
         except requests.exceptions.RequestException as e:
@@ -368,17 +907,7 @@ class Obsidian:
         Returns:
             List of (level, heading_text, line_number) tuples
         """
-        headings: list[tuple[int, str, int]] = []
-        lines = content.split("\n")
-
-        for i, line in enumerate(lines):
-            match = re.match(r"^(#{1,6})\s+(.+)$", line)
-            if match:
-                level = len(match.group(1))
-                text = match.group(2).strip()
-                headings.append((level, text, i))
-
-        return headings
+        return parse_headings(content)
 
     def _find_insertion_point(
         self,
@@ -398,50 +927,9 @@ class Obsidian:
         Returns:
             Line number for insertion, or None if should append to end
         """
-        # Find target heading position in template
-        template_index = None
-        for i, (level, text, _) in enumerate(template_headings):
-            if text == target_heading and level == target_level:
-                template_index = i
-                break
-
-        if template_index is None:
-            # Heading not in template, append to end
-            return None
-
-        # Find the heading that should come AFTER our target in the template
-        next_template_headings = []
-        for i in range(template_index + 1, len(template_headings)):
-            level, text, _ = template_headings[i]
-            # Only consider same or higher level headings as boundaries
-            if level <= target_level:
-                next_template_headings.append((level, text))
-                break
-
-        # Find where any of those "next" headings appear in current content
-        for level, text, line_num in current_headings:
-            for next_level, next_text in next_template_headings:
-                if text == next_text and level == next_level:
-                    # Insert before this heading
-                    return line_num
-
-        # Also check if there's a heading BEFORE our target in template
-        # and find where that section ends
-        for i in range(template_index - 1, -1, -1):
-            prev_level, prev_text, _ = template_headings[i]
-            if prev_level <= target_level:
-                # Find this heading in current content
-                for level, text, line_num in current_headings:
-                    if text == prev_text and level == prev_level:
-                        # Find the end of this section (next same-level heading)
-                        for lvl, txt, ln in current_headings:
-                            if ln > line_num and lvl <= level:
-                                return ln
-                        # No next heading, will append
-                        return None
-                break
-
-        return None
+        return HeadingIndex(current_headings).insertion_point(
+            HeadingIndex(template_headings), target_heading, target_level
+        )
 
     def _find_heading_boundary(
         self,
@@ -476,10 +964,11 @@ class Obsidian:
         self,
         headings: list[tuple[int, str, int]],
         target: str,
-    ) -> tuple[int, int, int] | None:
+    ) -> tuple[int, str, int] | None:
         """Find a heading in the parsed structure.
 
-        Supports nested syntax like "Parent::Child" for finding subheadings.
+        Supports nested syntax like "Parent::Child" (or deeper paths such as
+        "A::B::C") for finding subheadings.
 
         Args:
             headings: Parsed heading structure (level, text, line_num)
@@ -488,42 +977,13 @@ class Obsidian:
         Returns:
             Tuple of (level, text, line_num) or None if not found
         """
-        parts = target.split("::")
-
-        if len(parts) == 1:
-            # Simple heading - find first match
-            for level, text, line_num in headings:
-                if text == target:
-                    return (level, text, line_num)
-            return None
-
-        # Nested heading - find parent first, then child within parent's scope
-        parent_target = parts[0]
-        child_target = parts[-1]
-
-        parent = None
-        for level, text, line_num in headings:
-            if text == parent_target:
-                parent = (level, text, line_num)
-                break
-
-        if parent is None:
+        index = HeadingIndex(headings)
+        found = index.find(target)
+        if found is None:
             return None
+        return index.headings[found]
 
-        parent_level, _, parent_line = parent
-
-        # Find child within parent's scope
-        for level, text, line_num in headings:
-            if line_num <= parent_line:
-                continue
-            # Stop if we hit a heading at parent's level or higher
-            if level <= parent_level:
-                break
-            if text == child_target:
-                return (level, text, line_num)
-
-        return None
-
+    @traced
     def _patch_heading_content(
         self,
         filepath: str,
@@ -537,6 +997,9 @@ class Obsidian:
         heading targeting. Instead, we read the file, parse the structure,
         modify it, and write it back.
 
+        Appends to the last section of a note skip the write-back and POST
+        only the new content.
+
         Args:
             filepath: Path to the file
             operation: "append", "prepend", or "replace"
@@ -550,25 +1013,31 @@ class Obsidian:
             Exception: If heading is not found (triggers fallback to create)
         """
         # Read current content
-        current_content = self.get_file_contents(filepath)
-        lines = current_content.split("\n")
+        current_content, outline = self._get_note(filepath)
 
-        # Parse heading structure
-        headings = self._parse_heading_structure(current_content)
+        if operation == "append":
+            suffix = self._plan_heading_append(outline, target, content)
+            if suffix is not None:
+                result = self.append_content(filepath, suffix)
+                self.outline_cache.put(
+                    self._cache_key(filepath), outline.appended(suffix)
+                )
+                return result
+
+        lines = current_content.split("\n")
+        index = outline.index
 
         # Find target heading
-        found = self._find_heading_in_structure(headings, target)
+        found = index.find(target)
 
         if found is None:
             # Heading not found - raise exception to trigger fallback
             raise HeadingNotFoundError(f"Heading '{target}' not found in {filepath}")
 
-        target_level, _, target_line = found
+        target_line = index.headings[found].line
 
         # Find boundary (where this heading's content ends)
-        boundary_line = self._find_heading_boundary(
-            lines, headings, target_line, target_level
-        )
+        boundary_line = index.section_end(found)
 
         # Perform the operation
         if operation == "append":
@@ -612,6 +1081,36 @@ class Obsidian:
         new_content = "\n".join(lines)
         return self.put_content(filepath, new_content)
 
+    def _plan_heading_append(
+        self, outline: Outline, target: str, content: str
+    ) -> str | None:
+        """Decide whether a heading append reduces to a plain file append.
+
+        That is the case when the target heading's section runs to the end
+        of the note. ``outline`` must come from the note just read as JSON:
+        its mtime shows it describes the current version. Outlines without
+        an mtime (plain-text reads, our own writes) never qualify, since
+        nothing else tells apart same-size edits made in Obsidian.
+
+        Args:
+            outline: Outline of the note as just read
+            target: Heading text (e.g., "Todos" or "Notes::Subsection")
+            content: Content to append
+
+        Returns:
+            Text to append, or None when a full read-modify-write is required
+        """
+        if outline.mtime is None:
+            return None
+        found = outline.index.find(target)
+        if found is None or not outline.index.is_last_section(found):
+            return None
+
+        # Same text the read-modify-write append would add at end of file
+        if not content.startswith("\n"):
+            content = "\n" + content
+        return "\n" + content.rstrip("\n")
+
     def _insert_heading_at_position(
         self,
         filepath: str,
@@ -644,6 +1143,7 @@ class Obsidian:
 
         return self.put_content(filepath, new_content)
 
+    @traced
     def _create_heading_and_append(
         self,
         filepath: str,
@@ -668,7 +1168,7 @@ class Obsidian:
         final_heading = heading_parts[-1]  # Use the last part as the heading text
 
         # Read current file contents
-        current_content = self.get_file_contents(filepath)
+        current_content, _ = self._get_note(filepath)
 
         # Try to find template and use it for positioning
         if use_template:
@@ -679,14 +1179,15 @@ class Obsidian:
             if template:
                 try:
                     template_content = self.get_file_contents(template)
-                    template_headings = self._parse_heading_structure(template_content)
-                    current_headings = self._parse_heading_structure(current_content)
-
-                    insertion_point = self._find_insertion_point(
-                        current_headings,
-                        template_headings,
-                        final_heading,
-                        heading_level,
+                    template_index = HeadingIndex(
+                        self._parse_heading_structure(template_content)
+                    )
+                    current_index = HeadingIndex(
+                        self._parse_heading_structure(current_content)
+                    )
+
+                    insertion_point = current_index.insertion_point(
+                        template_index, final_heading, heading_level
                     )
 
                     if insertion_point is not None:
@@ -709,23 +1210,92 @@ class Obsidian:
 
         return self.put_content(filepath, new_content)
 
+    @traced
     def put_content(self, filepath: str, content: str) -> Any:
         encoded_path = self._encode_path(filepath)
         url = f"{self.get_base_url()}/vault/{encoded_path}"
 
         def call_fn():
-            response = requests.put(
+            response = self.session.put(
                 url,
                 headers=self._get_headers() | {"Content-Type": "text/markdown"},
                 data=content,
                 verify=self.verify_ssl,
-                timeout=self.timeout,
+                hooks=HTTP_HOOKS,
+                timeout=self._timeout("write"),
             )
             response.raise_for_status()
             return None
 
-        return self._safe_call(call_fn)
+        key = self._cache_key(filepath)
+        self.outline_cache.invalidate(key)
+        with self._writing(key):
+            # PUT replaces the whole note, so repeating it is safe
+            result = self._safe_call(call_fn, idempotent=True, endpoint="write")
+        self.vault_tree.add_file(key)
+        # We know exactly what the note now contains
+        self.outline_cache.put(key, Outline.from_content(content))
+        return result
+
+    @traced
+    def put_many(
+        self,
+        files: dict[str, str],
+        max_workers: int = int(os.getenv("OBSIDIAN_WRITE_CONCURRENCY", "4")),
+        skip_unchanged: bool = False,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Create or overwrite many files concurrently.
+
+        Args:
+            files: Mapping of file path to full content
+            max_workers: Maximum number of writes in flight at once
+            skip_unchanged: If True, read each file first and skip the write
+                when the SHA-256 of its current content matches the new one
+            progress: Optional callback invoked as (completed, total) after
+                each file finishes
+
+        Returns:
+            One result per file, in input order, with "filepath", "status"
+            ("written", "unchanged" or "error") and "error" on failure
+        """
+
+        def write_one(filepath: str, content: str) -> dict[str, Any]:
+            try:
+                if skip_unchanged and self._has_same_content(filepath, content):
+                    return {"filepath": filepath, "status": "unchanged"}
+                self.put_content(filepath, content)
+                return {"filepath": filepath, "status": "written"}
+            except Exception as e:
+                return {"filepath": filepath, "status": "error", "error": str(e)}
+
+        results: dict[str, dict[str, Any]] = {}
+        total = len(files)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            with priority(BULK):
+                write_in_context = _in_context(write_one)
+            futures = [
+                executor.submit(write_in_context, filepath, content)
+                for filepath, content in files.items()
+            ]
+            for completed, future in enumerate(as_completed(futures), start=1):
+                result = future.result()
+                results[result["filepath"]] = result
+                if progress is not None:
+                    progress(completed, total)
+
+        return [results[filepath] for filepath in files]
+
+    def _has_same_content(self, filepath: str, content: str) -> bool:
+        """Compare a file's current content with ``content`` by SHA-256."""
+        try:
+            current = self.get_file_contents(filepath)
+        except Exception:
+            # Missing or unreadable - write it
+            return False
+        return _content_hash(current) == _content_hash(content)
 
+    @traced
     def delete_file(self, filepath: str) -> Any:
         """Delete a file or directory from the vault.
 
@@ -739,17 +1309,24 @@ class Obsidian:
         url = f"{self.get_base_url()}/vault/{encoded_path}"
 
         def call_fn():
-            response = requests.delete(
+            response = self.session.delete(
                 url,
                 headers=self._get_headers(),
                 verify=self.verify_ssl,
-                timeout=self.timeout,
+                hooks=HTTP_HOOKS,
+                timeout=self._timeout("write"),
             )
             response.raise_for_status()
             return None
 
-        return self._safe_call(call_fn)
+        key = self._cache_key(filepath)
+        self.outline_cache.invalidate_tree(key)
+        with self._writing(key):
+            result = self._safe_call(call_fn, endpoint="write")
+        self.vault_tree.remove(key)
+        return result
 
+    @traced
     def search_json(self, query: dict) -> Any:
         url = f"{self.get_base_url()}/search/"
 
@@ -758,18 +1335,20 @@ class Obsidian:
         }
 
         def call_fn():
-            response = requests.post(
+            response = self.session.post(
                 url,
                 headers=headers,
                 json=query,
                 verify=self.verify_ssl,
-                timeout=self.timeout,
+                hooks=HTTP_HOOKS,
+                timeout=self._timeout("query"),
             )
             response.raise_for_status()
             return response.json()
 
-        return self._safe_call(call_fn)
+        return self._shared_read(call_fn, "POST", url, query, endpoint="query")
 
+    @traced
     def get_periodic_note(self, period: str, as_json: bool = False) -> Any:
         """Get current periodic note for the specified period.
 
@@ -786,17 +1365,24 @@ class Obsidian:
             headers = self._get_headers()
             if as_json:
                 headers["Accept"] = "application/vnd.olrapi.note+json"
-            response = requests.get(
-                url, headers=headers, verify=self.verify_ssl, timeout=self.timeout
+            response = self.session.get(
+                url,
+                headers=headers,
+                verify=self.verify_ssl,
+                hooks=HTTP_HOOKS,
+                timeout=self._timeout("read"),
             )
             response.raise_for_status()
 
             if as_json:
-                return response.json()
+                note = response.json()
+                self._remember_note(note)
+                return note
             return response.text
 
-        return self._safe_call(call_fn)
+        return self._safe_call(call_fn, idempotent=True, endpoint="read")
 
+    @traced
     def get_recent_periodic_notes(
         self, period: str, limit: int = 5, include_content: bool = False
     ) -> Any:
@@ -814,25 +1400,30 @@ class Obsidian:
         params = {"limit": limit, "includeContent": include_content}
 
         def call_fn():
-            response = requests.get(
+            response = self.session.get(
                 url,
                 headers=self._get_headers(),
                 params=params,
                 verify=self.verify_ssl,
-                timeout=self.timeout,
+                hooks=HTTP_HOOKS,
+                timeout=self._timeout("read"),
             )
             response.raise_for_status()
 
             return response.json()
 
-        return self._safe_call(call_fn)
+        return self._shared_read(call_fn, "GET", url, params, endpoint="read")
 
-    def get_recent_changes(self, limit: int = 10, days: int = 90) -> Any:
+    @traced
+    def get_recent_changes(
+        self, limit: int = 10, days: int = 90, use_cache: bool = True
+    ) -> Any:
         """Get recently modified files in the vault.
 
         Args:
             limit: Maximum number of files to return (default: 10)
             days: Only include files modified within this many days (default: 90)
+            use_cache: Set to False to bypass the Dataview result cache
 
         Returns:
             List of recently modified files with metadata
@@ -848,30 +1439,19 @@ class Obsidian:
         # Join with proper DQL line breaks
         dql_query = "\n".join(query_lines)
 
-        # Make the request to search endpoint
-        url = f"{self.get_base_url()}/search/"
-        headers = self._get_headers() | {
-            "Content-Type": "application/vnd.olrapi.dataview.dql+txt"
-        }
+        return self.dataview_query(dql_query, use_cache=use_cache)
 
-        def call_fn():
-            response = requests.post(
-                url,
-                headers=headers,
-                data=dql_query.encode("utf-8"),
-                verify=self.verify_ssl,
-                timeout=self.timeout,
-            )
-            response.raise_for_status()
-            return response.json()
-
-        return self._safe_call(call_fn)
-
-    def dataview_query(self, dql_query: str) -> Any:
+    @traced
+    def dataview_query(self, dql_query: str, use_cache: bool = True) -> Any:
         """Execute a Dataview DQL query against the vault.
 
+        Results are cached for OBSIDIAN_DATAVIEW_CACHE_TTL seconds, keyed on
+        the query with whitespace normalized; any write through this client
+        clears the cache.
+
         Args:
             dql_query: The Dataview query string (e.g., "TABLE title, status FROM #tag")
+            use_cache: Set to False to bypass the cache and re-run the query
 
         Returns:
             Query results as JSON
@@ -885,18 +1465,24 @@ class Obsidian:
         }
 
         def call_fn():
-            response = requests.post(
+            response = self.session.post(
                 url,
                 headers=headers,
                 data=dql_query.encode("utf-8"),
                 verify=self.verify_ssl,
-                timeout=self.timeout,
+                hooks=HTTP_HOOKS,
+                timeout=self._timeout("query"),
             )
             response.raise_for_status()
             return response.json()
 
-        return self._safe_call(call_fn)
+        return self.query_cache.get_or_fetch(
+            dql_query,
+            lambda: self._shared_read(call_fn, "POST", url, dql_query, endpoint="query"),
+            use_cache,
+        )
 
+    @traced
     def get_active_note(self, as_json: bool = False) -> Any:
         """Get content of the currently active note in Obsidian.
 
@@ -912,17 +1498,24 @@ class Obsidian:
             headers = self._get_headers()
             if as_json:
                 headers["Accept"] = "application/vnd.olrapi.note+json"
-            response = requests.get(
-                url, headers=headers, verify=self.verify_ssl, timeout=self.timeout
+            response = self.session.get(
+                url,
+                headers=headers,
+                verify=self.verify_ssl,
+                hooks=HTTP_HOOKS,
+                timeout=self._timeout("read"),
             )
             response.raise_for_status()
 
             if as_json:
-                return response.json()
+                note = response.json()
+                self._remember_note(note)
+                return note
             return response.text
 
-        return self._safe_call(call_fn)
+        return self._safe_call(call_fn, idempotent=True, endpoint="read")
 
+    @traced
     def list_commands(self) -> Any:
         """List all available Obsidian commands from the command palette.
 
@@ -932,17 +1525,19 @@ class Obsidian:
         url = f"{self.get_base_url()}/commands/"
 
         def call_fn():
-            response = requests.get(
+            response = self.session.get(
                 url,
                 headers=self._get_headers(),
                 verify=self.verify_ssl,
-                timeout=self.timeout,
+                hooks=HTTP_HOOKS,
+                timeout=self._timeout("command"),
             )
             response.raise_for_status()
             return response.json()
 
-        return self._safe_call(call_fn)
+        return self._shared_read(call_fn, "GET", url, endpoint="command")
 
+    @traced
     def execute_command(self, command_id: str) -> Any:
         """Execute a specific Obsidian command by its ID.
 
@@ -959,17 +1554,28 @@ class Obsidian:
         url = f"{self.get_base_url()}/commands/{urllib.parse.quote(command_id)}/"
 
         def call_fn():
-            response = requests.post(
+            response = self.session.post(
                 url,
                 headers=self._get_headers(),
                 verify=self.verify_ssl,
-                timeout=self.timeout,
+                hooks=HTTP_HOOKS,
+                timeout=self._timeout("command"),
             )
             response.raise_for_status()
             return None
 
-        return self._safe_call(call_fn)
-
+        try:
+            return self._safe_call(call_fn, endpoint="command")
+        finally:
+            # Commands can create, move or rewrite any notes (templates,
+            # refactors), so forget everything cached about the vault
+            self.query_cache.invalidate()
+            self.outline_cache.clear()
+            self.vault_tree.clear()
+            self._note_index = None
+            self._aliases = None
+
+    @traced
     def open_file(self, filename: str, new_leaf: bool = False) -> Any:
         """Open a file in Obsidian UI.
 
@@ -985,14 +1591,15 @@ class Obsidian:
         params = {"newLeaf": str(new_leaf).lower()}
 
         def call_fn():
-            response = requests.post(
+            response = self.session.post(
                 url,
                 headers=self._get_headers(),
                 params=params,
                 verify=self.verify_ssl,
-                timeout=self.timeout,
+                hooks=HTTP_HOOKS,
+                timeout=self._timeout("command"),
             )
             response.raise_for_status()
             return None
 
-        return self._safe_call(call_fn)
+        return self._safe_call(call_fn, endpoint="command")
@@ -0,0 +1,397 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from itertools import accumulate
+from typing import NamedTuple
+
+from .spans import traced
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+)$")
+BLOCK_ID_PATTERN = re.compile(r"(?:^|\s)\^([A-Za-z0-9-]+)\s*$")
+
+
+class Heading(NamedTuple):
+    """A heading parsed from a note: (level, text, line_number)."""
+
+    level: int
+    text: str
+    line: int
+
+
+def parse_headings(content: str, line_offset: int = 0) -> list[tuple[int, str, int]]:
+    """Parse markdown to extract heading hierarchy with line positions.
+
+    Args:
+        content: Markdown content
+        line_offset: Added to every line number (for parsing a fragment)
+
+    Returns:
+        List of (level, heading_text, line_number) tuples
+    """
+    headings: list[tuple[int, str, int]] = []
+
+    for i, line in enumerate(content.split("\n")):
+        match = HEADING_PATTERN.match(line)
+        if match:
+            level = len(match.group(1))
+            text = match.group(2).strip()
+            headings.append((level, text, i + line_offset))
+
+    return headings
+
+
+def parse_block_ids(content: str, line_offset: int = 0) -> dict[str, int]:
+    """Map block reference IDs (``^id`` at the end of a line) to line numbers.
+
+    Args:
+        content: Markdown content
+        line_offset: Added to every line number (for parsing a fragment)
+
+    Returns:
+        Dictionary of block ID (without the caret) to line number
+    """
+    blocks: dict[str, int] = {}
+
+    for i, line in enumerate(content.split("\n")):
+        if "^" not in line:
+            continue
+        match = BLOCK_ID_PATTERN.search(line)
+        if match:
+            blocks.setdefault(match.group(1), i + line_offset)
+
+    return blocks
+
+
+def find_frontmatter_end(lines: list[str]) -> int | None:
+    """Return the line number of the closing ``---`` of a frontmatter block."""
+    if not lines or lines[0].rstrip() != "---":
+        return None
+    for i in range(1, len(lines)):
+        if lines[i].rstrip() == "---":
+            return i
+    return None
+
+
+def block_bounds(lines: list[str], line: int) -> tuple[int, int]:
+    """Return the (start, end) lines of the block a block ID belongs to.
+
+    A block is the run of non-blank lines around the ID, stopping at
+    headings. An ID on a line of its own (as used after lists and tables)
+    refers to the block before it. The end is exclusive.
+    """
+    end = line + 1
+    if lines[line].strip().startswith("^"):
+        anchor = line - 1
+        while anchor >= 0 and not lines[anchor].strip():
+            anchor -= 1
+        if anchor < 0:
+            return line, end
+    else:
+        anchor = line
+        while (
+            end < len(lines)
+            and lines[end].strip()
+            and not HEADING_PATTERN.match(lines[end])
+        ):
+            end += 1
+
+    start = anchor
+    if HEADING_PATTERN.match(lines[start]):
+        return start, end
+    while (
+        start > 0
+        and lines[start - 1].strip()
+        and not HEADING_PATTERN.match(lines[start - 1])
+    ):
+        start -= 1
+    return start, end
+
+
+class HeadingIndex:
+    """Lookup structure over a note's heading list, built in a single pass.
+
+    For every heading it records its parent, the heading that closes its
+    section (next heading at the same or higher level) and the nearest
+    preceding heading at the same or higher level. Headings are also
+    indexed by text and by (level, text), so lookups no longer rescan the
+    heading list.
+    """
+
+    def __init__(self, headings: list[tuple[int, str, int]], line_count: int = 0):
+        """Build the index.
+
+        Args:
+            headings: Parsed heading structure (level, text, line_num) in
+                document order
+            line_count: Number of lines in the note, used as the section end
+                for headings that run to the end of the file
+        """
+        self.headings = [Heading(*h) for h in headings]
+        self.line_count = line_count
+        self.parents: list[int | None] = []
+        self.closers: list[int | None] = [None] * len(self.headings)
+        self.previous: list[int | None] = []
+        self._by_text: dict[str, list[int]] = {}
+        self._by_key: dict[tuple[int, str], int] = {}
+
+        # Stack of open sections, strictly increasing in level
+        stack: list[int] = []
+        for i, (level, text, _) in enumerate(self.headings):
+            last_popped = None
+            while stack and self.headings[stack[-1]].level >= level:
+                last_popped = stack.pop()
+                self.closers[last_popped] = i
+
+            if last_popped is not None and self.headings[last_popped].level == level:
+                self.previous.append(last_popped)
+            else:
+                self.previous.append(stack[-1] if stack else None)
+
+            self.parents.append(stack[-1] if stack else None)
+            stack.append(i)
+
+            self._by_text.setdefault(text, []).append(i)
+            self._by_key.setdefault((level, text), i)
+
+    def __len__(self) -> int:
+        return len(self.headings)
+
+    def first(self, text: str, level: int | None = None) -> int | None:
+        """Return the index of the first heading with this text (and level)."""
+        if level is not None:
+            return self._by_key.get((level, text))
+        positions = self._by_text.get(text)
+        return positions[0] if positions else None
+
+    def find(self, target: str) -> int | None:
+        """Resolve a heading target to an index.
+
+        Supports nested syntax of arbitrary depth ("A::B::C"): the last
+        segment must be a heading whose ancestors contain every earlier
+        segment, in order. Intermediate levels may be skipped, so "A::C"
+        also matches C nested under A::B.
+
+        Args:
+            target: Heading text, or "::"-separated heading path
+
+        Returns:
+            Index of the first matching heading in document order, or None
+        """
+        parts = target.split("::")
+        *ancestors, leaf = parts
+
+        for candidate in self._by_text.get(leaf, []):
+            if self._has_ancestors(candidate, ancestors):
+                return candidate
+        return None
+
+    def _has_ancestors(self, index: int, ancestors: list[str]) -> bool:
+        remaining = len(ancestors)
+        parent = self.parents[index]
+        while remaining and parent is not None:
+            if self.headings[parent].text == ancestors[remaining - 1]:
+                remaining -= 1
+            parent = self.parents[parent]
+        return remaining == 0
+
+    def section_end(self, index: int) -> int:
+        """Return the line where a heading's section ends (exclusive).
+
+        This is the line of the next heading at the same or higher level,
+        or the line count when the section runs to the end of the file.
+        """
+        closer = self.closers[index]
+        if closer is None:
+            return self.line_count
+        return self.headings[closer].line
+
+    def is_last_section(self, index: int) -> bool:
+        """Whether a heading's section extends to the end of the file."""
+        return self.closers[index] is None
+
+    def insertion_point(
+        self, template: "HeadingIndex", heading: str, level: int
+    ) -> int | None:
+        """Find where a missing heading belongs, following template order.
+
+        Args:
+            template: Index over the template's headings
+            heading: The heading text to insert
+            level: The heading level (e.g., 2 for ##)
+
+        Returns:
+            Line number to insert before, or None to append to the end
+        """
+        template_pos = template.first(heading, level)
+        if template_pos is None:
+            return None
+
+        # Insert before the heading that follows ours in the template
+        following = template.closers[template_pos]
+        if following is not None:
+            next_level, next_text, _ = template.headings[following]
+            current_pos = self.first(next_text, next_level)
+            if current_pos is not None:
+                return self.headings[current_pos].line
+
+        # Otherwise insert after the section that precedes ours in the template
+        preceding = template.previous[template_pos]
+        if preceding is not None:
+            prev_level, prev_text, _ = template.headings[preceding]
+            current_pos = self.first(prev_text, prev_level)
+            if current_pos is not None and not self.is_last_section(current_pos):
+                return self.section_end(current_pos)
+
+        return None
+
+
+class Outline:
+    """Parsed structure of one note version.
+
+    Holds the heading index, block IDs and frontmatter extent plus the line
+    count and size of the content it was parsed from. ``mtime`` is the
+    note's modification time as reported by the REST API, or None when the
+    outline was derived from content without metadata (plain-text reads, or
+    content this server wrote itself; writes do not return the new mtime).
+    """
+
+    def __init__(
+        self,
+        headings: list[tuple[int, str, int]],
+        line_count: int,
+        size: int,
+        mtime: float | None = None,
+        blocks: dict[str, int] | None = None,
+        frontmatter_end: int | None = None,
+        heading_offsets: list[int] | None = None,
+        length: int = 0,
+    ):
+        self.index = HeadingIndex(headings, line_count)
+        self.line_count = line_count
+        self.size = size
+        self.mtime = mtime
+        self.blocks = blocks or {}
+        self.frontmatter_end = frontmatter_end
+        self.heading_offsets = heading_offsets or [0] * len(headings)
+        self.length = length
+        self.observed_at = time.monotonic()
+
+    @classmethod
+    @traced
+    def from_content(cls, content: str, mtime: float | None = None) -> "Outline":
+        lines = content.split("\n")
+        headings = parse_headings(content)
+        line_starts = [0, *accumulate(len(line) + 1 for line in lines)]
+        return cls(
+            headings,
+            len(lines),
+            len(content.encode("utf-8")),
+            mtime,
+            parse_block_ids(content),
+            find_frontmatter_end(lines),
+            [line_starts[line] for _, _, line in headings],
+            len(content),
+        )
+
+    def appended(self, suffix: str) -> "Outline":
+        """Return the outline of this note after appending ``suffix``.
+
+        Only the appended text is parsed. The suffix must start with a
+        newline so that it cannot extend the note's last line.
+        """
+        if not suffix.startswith("\n"):
+            raise ValueError("suffix must start with a newline")
+        added = Outline.from_content(suffix[1:])
+        shift = self.length + 1
+        return Outline(
+            [(h.level, h.text, h.line) for h in self.index.headings]
+            + [(h.level, h.text, h.line + self.line_count) for h in added.index.headings],
+            self.line_count + suffix.count("\n"),
+            self.size + len(suffix.encode("utf-8")),
+            blocks={k: v + self.line_count for k, v in added.blocks.items()}
+            | self.blocks,
+            frontmatter_end=self.frontmatter_end,
+            heading_offsets=self.heading_offsets
+            + [offset + shift for offset in added.heading_offsets],
+            length=self.length + len(suffix),
+        )
+
+    def age(self) -> float:
+        """Seconds since this outline was last confirmed against the vault."""
+        return time.monotonic() - self.observed_at
+
+    def to_dict(self) -> dict:
+        """Compact map of the note for clients: headings, blocks, frontmatter."""
+        index = self.index
+        headings = []
+        for i, (level, text, line) in enumerate(index.headings):
+            closer = index.closers[i]
+            end_offset = (
+                self.length if closer is None else self.heading_offsets[closer]
+            )
+            headings.append(
+                {
+                    "level": level,
+                    "text": text,
+                    "line": line,
+                    "end_line": index.section_end(i),
+                    "chars": end_offset - self.heading_offsets[i],
+                }
+            )
+        return {
+            "lines": self.line_count,
+            "size": self.size,
+            "mtime": self.mtime,
+            "frontmatter": (
+                None
+                if self.frontmatter_end is None
+                else {"line": 0, "end_line": self.frontmatter_end + 1}
+            ),
+            "headings": headings,
+            "blocks": [
+                {"id": block_id, "line": line}
+                for block_id, line in sorted(self.blocks.items(), key=lambda b: b[1])
+            ],
+        }
+
+
+class OutlineCache:
+    """Thread-safe, size-bounded LRU of note outlines keyed by vault path."""
+
+    def __init__(
+        self, max_entries: int = int(os.getenv("OBSIDIAN_OUTLINE_CACHE_SIZE", "256"))
+    ):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Outline] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> Outline | None:
+        with self._lock:
+            outline = self._entries.get(path)
+            if outline is not None:
+                self._entries.move_to_end(path)
+            return outline
+
+    def put(self, path: str, outline: Outline) -> None:
+        with self._lock:
+            self._entries[path] = outline
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, path: str) -> None:
+        with self._lock:
+            self._entries.pop(path, None)
+
+    def invalidate_tree(self, path: str) -> None:
+        """Drop a path and, if it is a directory, everything beneath it."""
+        prefix = path.rstrip("/") + "/"
+        with self._lock:
+            for key in [k for k in self._entries if k == path or k.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,73 @@
+import json
+import os
+from typing import Any
+
+from .spans import traced
+
+try:
+    import orjson
+except ImportError:  # optional: pip install "mcp-obsidian-ek[fast]"
+    orjson = None
+
+OUTPUT_FORMATS = ("pretty", "compact", "raw")
+
+# Server-wide default; tools accept an ``output_format`` argument to override
+OUTPUT_FORMAT = os.getenv("OBSIDIAN_OUTPUT_FORMAT", "pretty")
+
+OUTPUT_FORMAT_PROPERTY = {
+    "type": "string",
+    "description": "'pretty' for indented JSON, 'compact' for minimal JSON, or 'raw' to return text and path lists unquoted. Defaults to the server setting.",
+    "enum": list(OUTPUT_FORMATS),
+}
+
+
+def _compact(data: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            # e.g. integers beyond 64 bits; the stdlib encoder handles them
+            pass
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def compact_size(data: Any) -> int:
+    """Return the size in bytes of ``data`` encoded as compact JSON."""
+    if orjson is not None:
+        try:
+            return len(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+        except TypeError:
+            pass
+    return len(json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+
+@traced
+def format_output(data: Any, output_format: str | None = None) -> str:
+    """Serialize a tool result for a TextContent response.
+
+    Args:
+        data: JSON-compatible result
+        output_format: "pretty", "compact" or "raw"; None uses
+            OBSIDIAN_OUTPUT_FORMAT
+
+    Returns:
+        - pretty: JSON indented by two spaces (the historical format)
+        - compact: JSON without whitespace, encoded with orjson if installed
+        - raw: strings as-is and lists of strings one per line; anything
+          else as compact JSON
+    """
+    output_format = output_format or OUTPUT_FORMAT
+    if output_format not in OUTPUT_FORMATS:
+        raise RuntimeError(
+            f"Invalid output_format: {output_format}. Must be one of: {', '.join(OUTPUT_FORMATS)}"
+        )
+
+    if output_format == "raw":
+        if isinstance(data, str):
+            return data
+        if isinstance(data, list) and all(isinstance(item, str) for item in data):
+            return "\n".join(data)
+        return _compact(data)
+    if output_format == "compact":
+        return _compact(data)
+    return json.dumps(data, indent=2, ensure_ascii=False)
@@ -0,0 +1,181 @@
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from .output import compact_size
+
+PAGINATION_PROPERTIES = {
+    "max_items": {
+        "type": "integer",
+        "description": "Return at most this many results and a cursor for the rest",
+        "minimum": 1,
+    },
+    "max_bytes": {
+        "type": "integer",
+        "description": "Approximate size budget for the results (compact JSON bytes); the rest is returned via a cursor",
+        "minimum": 1,
+    },
+    "cursor": {
+        "type": "string",
+        "description": "next_cursor from a previous page. Returns the next page without re-running the query; other arguments are ignored except max_items/max_bytes.",
+    },
+}
+
+
+class _Entry:
+    __slots__ = ("tool", "scope", "items", "max_items", "max_bytes", "touched_at")
+
+    def __init__(
+        self,
+        tool: str,
+        items: list,
+        max_items: int | None,
+        max_bytes: int | None,
+        scope: str | None = None,
+    ):
+        self.tool = tool
+        self.scope = scope
+        self.items = items
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.touched_at = time.monotonic()
+
+
+class ResultStore:
+    """Server-side holder for the unread remainder of paginated results.
+
+    Bounded to ``max_entries`` result sets (least recently used are evicted
+    first); a result set not read for ``ttl`` seconds expires. Cursors are
+    "<token>.<offset>", so any page can be fetched again until expiry.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = int(os.getenv("OBSIDIAN_PAGER_MAX_RESULTS", "32")),
+        ttl: float = float(os.getenv("OBSIDIAN_PAGER_TTL", "300")),
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self) -> None:
+        deadline = time.monotonic() - self.ttl
+        while self._entries:
+            token, entry = next(iter(self._entries.items()))
+            if entry.touched_at >= deadline:
+                break
+            del self._entries[token]
+
+    def put(
+        self,
+        tool: str,
+        items: list,
+        max_items: int | None,
+        max_bytes: int | None,
+        scope: str | None = None,
+    ) -> str:
+        token = secrets.token_urlsafe(12)
+        with self._lock:
+            self._expire()
+            self._entries[token] = _Entry(tool, items, max_items, max_bytes, scope)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return token
+
+    def get(self, tool: str, token: str, scope: str | None = None) -> _Entry | None:
+        with self._lock:
+            self._expire()
+            entry = self._entries.get(token)
+            if entry is None or entry.tool != tool or entry.scope != scope:
+                return None
+            entry.touched_at = time.monotonic()
+            self._entries.move_to_end(token)
+            return entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+result_store = ResultStore()
+
+
+def _page_end(
+    items: list, offset: int, max_items: int | None, max_bytes: int | None
+) -> int:
+    end = len(items) if max_items is None else min(len(items), offset + max_items)
+    if max_bytes is None:
+        return end
+    used = 0
+    for i in range(offset, end):
+        used += compact_size(items[i]) + 1
+        # Always return at least one item so paging makes progress
+        if used > max_bytes and i > offset:
+            return i
+    return end
+
+
+def paginate(
+    tool: str,
+    args: dict,
+    fetch: Callable[[], Any],
+    store: ResultStore | None = None,
+    scope: str | None = None,
+) -> Any:
+    """Run a query and return one page of it, or a later page via cursor.
+
+    Without ``max_items``, ``max_bytes`` or ``cursor`` in ``args`` the full
+    result is returned unchanged. Otherwise the result is wrapped as
+    ``{"results": [...], "total": n, "next_cursor": str | None}`` and
+    whatever did not fit is kept in the result store. Non-list results are
+    never paginated.
+
+    Args:
+        tool: Tool name; cursors are only valid for the tool that issued them
+        args: Tool arguments
+        fetch: Runs the query (not called when following a cursor)
+        store: Result store, defaults to the process-wide one
+        scope: What else the results depend on (the vault); cursors are
+            only valid within the scope that issued them
+    """
+    if store is None:
+        store = result_store
+    max_items = args.get("max_items")
+    max_bytes = args.get("max_bytes")
+    for name, value in (("max_items", max_items), ("max_bytes", max_bytes)):
+        if value is not None and (not isinstance(value, int) or value < 1):
+            raise RuntimeError(f"Invalid {name}: {value}. Must be a positive integer")
+
+    cursor = args.get("cursor")
+    if cursor:
+        token, _, offset_text = str(cursor).rpartition(".")
+        entry = store.get(tool, token, scope) if offset_text.isdigit() else None
+        if entry is None:
+            raise RuntimeError(
+                f"Unknown or expired cursor: {cursor}. Run the query again without a cursor"
+            )
+        items, offset = entry.items, int(offset_text)
+        max_items = max_items or entry.max_items
+        max_bytes = max_bytes or entry.max_bytes
+    else:
+        result = fetch()
+        if (max_items is None and max_bytes is None) or not isinstance(result, list):
+            return result
+        items, offset, token = result, 0, None
+
+    end = _page_end(items, offset, max_items, max_bytes)
+    if end < len(items) and token is None:
+        token = store.put(tool, items, max_items, max_bytes, scope)
+    return {
+        "results": items[offset:end],
+        "total": len(items),
+        "next_cursor": f"{token}.{end}" if end < len(items) else None,
+    }
@@ -0,0 +1,174 @@
+import cProfile
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval.
+
+    Samples are kept as collapsed stacks (root first, frames joined by
+    ";"), the input format of flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.002):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="mcp-obsidian-sampler", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                name = os.path.basename(code.co_filename)
+                frames.append(f"{code.co_name} ({name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ToolProfiler:
+    """Opt-in profiling of tool calls.
+
+    A call is profiled if its tool was armed with arm() (the next ``calls``
+    calls of that tool get both cProfile and the stack sampler), or, when
+    ``slow_ms`` is set, if it takes at least that long (every call is then
+    sampled, which is cheap, and only slow ones are written out). Each
+    profiled call writes ``<time>-<tool>-<ms>ms.collapsed`` and, for armed
+    calls, a ``.prof`` dump loadable with pstats or snakeviz to
+    ``directory``.
+
+    Only the thread running the tool is sampled, so requests fanned out to
+    a thread pool show up as time spent waiting on their futures.
+    """
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        slow_ms: float = 0.0,
+        interval: float = 0.002,
+        armed: dict[str, int] | None = None,
+    ):
+        self.directory = directory or os.path.join(tempfile.gettempdir(), "mcp-obsidian-profiles")
+        self.slow_ms = slow_ms
+        self.interval = interval
+        self._armed: dict[str, int] = dict(armed or {})
+        self._lock = threading.Lock()
+        # cProfile cannot profile overlapping calls, so only one armed call at a time
+        self._cprofile = threading.Lock()
+        self._written: deque[str] = deque(maxlen=20)
+        self._profiled = 0
+
+    @classmethod
+    def from_env(cls) -> "ToolProfiler":
+        """Profiler configured by the OBSIDIAN_PROFILE_* variables.
+
+        OBSIDIAN_PROFILE_TOOL is a comma-separated list of ``tool`` or
+        ``tool:N`` entries (N calls, default 1).
+        """
+        armed: dict[str, int] = {}
+        for entry in os.getenv("OBSIDIAN_PROFILE_TOOL", "").split(","):
+            name, _, calls = entry.strip().partition(":")
+            if name:
+                armed[name] = int(calls or 1)
+        return cls(
+            directory=os.getenv("OBSIDIAN_PROFILE_DIR") or None,
+            slow_ms=float(os.getenv("OBSIDIAN_PROFILE_SLOW_MS", "0")),
+            interval=float(os.getenv("OBSIDIAN_PROFILE_INTERVAL_MS", "2")) / 1000,
+            armed=armed,
+        )
+
+    def arm(self, tool: str, calls: int = 1) -> None:
+        """Profile the next ``calls`` calls of ``tool`` (0 disarms)."""
+        with self._lock:
+            if calls > 0:
+                self._armed[tool] = calls
+            else:
+                self._armed.pop(tool, None)
+
+    def _take(self, tool: str) -> bool:
+        with self._lock:
+            remaining = self._armed.get(tool, 0)
+            if remaining <= 0:
+                return False
+            if remaining == 1:
+                del self._armed[tool]
+            else:
+                self._armed[tool] = remaining - 1
+            return True
+
+    @contextmanager
+    def profile(self, tool: str) -> Iterator[None]:
+        """Profile the enclosed tool call if it is armed or may turn out slow."""
+        armed = self._take(tool)
+        if not armed and self.slow_ms <= 0:
+            yield
+            return
+
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        profile = cProfile.Profile() if armed and self._cprofile.acquire(blocking=False) else None
+        sampler.start()
+        if profile is not None:
+            profile.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if profile is not None:
+                profile.disable()
+                self._cprofile.release()
+            sampler.stop()
+            if armed or elapsed_ms >= self.slow_ms:
+                self._write(tool, elapsed_ms, sampler, profile)
+
+    def _write(
+        self, tool: str, elapsed_ms: float, sampler: StackSampler, profile: cProfile.Profile | None
+    ) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        now = time.time()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+        stamp += f".{int(now * 1000) % 1000:03d}"
+        base = os.path.join(
+            self.directory, f"{stamp}-{re.sub(r'[^A-Za-z0-9_.-]', '_', tool)}-{elapsed_ms:.0f}ms"
+        )
+        with open(base + ".collapsed", "w", encoding="utf-8") as f:
+            f.write(sampler.collapsed())
+        if profile is not None:
+            profile.dump_stats(base + ".prof")
+        with self._lock:
+            self._profiled += 1
+            self._written.append(base)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "directory": self.directory,
+                "armed": dict(self._armed),
+                "slow_ms": self.slow_ms,
+                "profiled": self._profiled,
+                "recent": list(self._written),
+            }
@@ -0,0 +1,96 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+
+# A string literal (possibly unterminated) or a run of whitespace
+_DQL_TOKEN = re.compile(r""""(?:[^"\\]|\\.)*(?:"|$)|'(?:[^'\\]|\\.)*(?:'|$)|\s+""")
+
+
+def normalize_dql(query: str) -> str:
+    """Collapse insignificant whitespace so equivalent queries share a key.
+
+    Whitespace inside string literals is kept as is, and case is
+    preserved, since DQL string literals and field names are case
+    sensitive.
+    """
+    return _DQL_TOKEN.sub(lambda m: m.group() if m.group()[0] in "\"'" else " ", query).strip()
+
+
+class QueryCache:
+    """TTL- and size-bounded LRU of Dataview query results.
+
+    Any write through the server invalidates every entry, since a single
+    note change can alter the result of any query. A result whose query
+    started before the latest invalidation is not stored.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = int(os.getenv("OBSIDIAN_DATAVIEW_CACHE_SIZE", "64")),
+        ttl: float = float(os.getenv("OBSIDIAN_DATAVIEW_CACHE_TTL", "60")),
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (result, stored_at, seconds the query took)
+        self._entries: OrderedDict[str, tuple[Any, float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.saved = 0.0
+
+    def get_or_fetch(
+        self, query: str, fetch: Callable[[], Any], use_cache: bool = True
+    ) -> Any:
+        """Return a cached result for ``query`` or run ``fetch`` and cache it.
+
+        Args:
+            query: DQL text (normalized here)
+            fetch: Runs the query against the REST API
+            use_cache: False skips the lookup (the fresh result is still
+                cached for later calls)
+        """
+        key = normalize_dql(query)
+        if use_cache and self.ttl > 0:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and time.monotonic() - entry[1] <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    self.saved += entry[2]
+                    return entry[0]
+                self.misses += 1
+
+        with self._lock:
+            generation = self._generation
+        started = time.monotonic()
+        result = fetch()
+        finished = time.monotonic()
+
+        with self._lock:
+            if generation == self._generation and self.max_entries > 0:
+                self._entries[key] = (result, finished, finished - started)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return result
+
+    def invalidate(self) -> None:
+        """Drop every entry (called after any write)."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "time_saved_ms": round(self.saved * 1000, 1),
+            }
@@ -0,0 +1,144 @@
+import os
+import random
+import threading
+import time
+
+import requests
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the REST API while the circuit is open."""
+
+    pass
+
+
+def is_transient(error: Exception) -> bool:
+    """Whether a request error is worth retrying (and counts as an outage).
+
+    Connection failures, timeouts and 5xx responses are transient; 4xx
+    responses are answers, not failures.
+    """
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code >= 500
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for idempotent requests."""
+
+    def __init__(
+        self,
+        retries: int = int(os.getenv("OBSIDIAN_RETRIES", "2")),
+        backoff: float = float(os.getenv("OBSIDIAN_RETRY_BACKOFF", "0.25")),
+        max_backoff: float = float(os.getenv("OBSIDIAN_RETRY_MAX_BACKOFF", "4")),
+    ):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.counters = {"retries": 0, "recovered": 0, "exhausted": 0}
+        self._lock = threading.Lock()
+
+    def record(self, event: str) -> None:
+        """Count a "retries", "recovered" or "exhausted" event."""
+        with self._lock:
+            self.counters[event] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"max_retries": self.retries, **self.counters}
+
+    def delay(self, attempt: int, error: Exception | None = None) -> float:
+        """Seconds to wait before retry number ``attempt`` (starting at 0).
+
+        A numeric Retry-After header on the failed response is honoured, up
+        to ``max_backoff``.
+        """
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(self.max_backoff, float(retry_after)))
+        return delay
+
+
+class CircuitBreaker:
+    """Fails fast while the REST API is down, then probes for recovery.
+
+    After ``threshold`` consecutive transient failures the circuit opens
+    and calls are rejected without touching the network. Once
+    ``reset_timeout`` seconds have passed, one probe call is let through
+    (half-open): success closes the circuit, failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        threshold: int = int(os.getenv("OBSIDIAN_BREAKER_THRESHOLD", "5")),
+        reset_timeout: float = float(os.getenv("OBSIDIAN_BREAKER_RESET", "10")),
+    ):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.times_opened = 0
+        self.rejected = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> bool:
+        """Raise CircuitOpenError unless a call may go through now.
+
+        Returns True if the call is the half-open probe; it must then end
+        with record_success(), record_failure() or release_probe().
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return False
+            wait = (self.opened_at or 0.0) + self.reset_timeout - time.monotonic()
+            if wait <= 0 and not self._probing:
+                self.state = self.HALF_OPEN
+                self._probing = True
+                return True
+            self.rejected += 1
+        raise CircuitOpenError(
+            f"Obsidian REST API unavailable after {self.failures} consecutive failures; "
+            f"not retrying for {max(wait, 0):.1f}s"
+        )
+
+    def record_success(self) -> None:
+        """Record a call the API answered (including 4xx answers)."""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._probing = False
+
+    def release_probe(self) -> None:
+        """End a probe that gave no verdict (e.g. cut short by a deadline),
+        so that the next call can probe instead."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probing = False
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "times_opened": self.times_opened,
+                "rejected_calls": self.rejected,
+            }
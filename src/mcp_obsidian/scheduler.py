@@ -0,0 +1,174 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from .timeouts import DeadlineExceeded, remaining
+
+INTERACTIVE = 0
+BULK = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BULK: "bulk"}
+
+# Priority of requests made in the current context
+current_priority: ContextVar[int] = ContextVar("current_priority", default=INTERACTIVE)
+
+# Endpoint classes (see timeouts.DEFAULT_TIMEOUTS) that make Obsidian work hard
+HEAVY_ENDPOINTS = frozenset({"search", "query"})
+
+
+@contextmanager
+def priority(level: int) -> Iterator[None]:
+    """Run requests made in this block at the given priority."""
+    token = current_priority.set(level)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+class Lane:
+    """Admission queue for one class of endpoints.
+
+    At most ``concurrency`` requests run at once and, if ``rate`` is
+    positive, requests start at no more than ``rate`` per second (a token
+    bucket holding up to ``burst`` tokens). Waiting requests are admitted
+    in priority order, first come first served within a priority.
+    """
+
+    def __init__(self, name: str, concurrency: int, rate: float = 0, burst: int | None = None):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._cond = threading.Condition()
+        self._queue: list[tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self.active = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.waited = 0.0
+        self.max_queued = 0
+
+    def _refill(self, now: float) -> None:
+        if self.rate > 0:
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._refilled_at) * self.rate
+            )
+        self._refilled_at = now
+
+    def _wait_for_token(self, now: float) -> float | None:
+        """Seconds until a token is available (0 if now), None if unlimited."""
+        if self.rate <= 0:
+            return None
+        self._refill(now)
+        return 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+    def acquire(self, level: int = INTERACTIVE, timeout: float | None = None) -> None:
+        """Wait for a slot (and a token). Raises DeadlineExceeded on timeout."""
+        started = time.monotonic()
+        entry = (level, next(self._sequence))
+        with self._cond:
+            heapq.heappush(self._queue, entry)
+            self.max_queued = max(self.max_queued, len(self._queue))
+            try:
+                while True:
+                    now = time.monotonic()
+                    token_wait = self._wait_for_token(now)
+                    if (
+                        self._queue[0] == entry
+                        and self.active < self.concurrency
+                        and not token_wait
+                    ):
+                        break
+                    wait = token_wait if self._queue[0] == entry else None
+                    if timeout is not None:
+                        left = started + timeout - now
+                        if left <= 0:
+                            self.rejected += 1
+                            raise DeadlineExceeded(
+                                f"Deadline exceeded while queued for the {self.name} lane"
+                            )
+                        wait = left if wait is None else min(wait, left)
+                    self._cond.wait(wait or None)
+            except BaseException:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+                raise
+
+            heapq.heappop(self._queue)
+            if self.rate > 0:
+                self._tokens -= 1
+            self.active += 1
+            self.admitted += 1
+            self.waited += time.monotonic() - started
+            # The next in line may be admissible too
+            self._cond.notify_all()
+
+    def release(self) -> None:
+        with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            queued = {name: 0 for name in PRIORITY_NAMES.values()}
+            for level, _ in self._queue:
+                queued[PRIORITY_NAMES.get(level, str(level))] += 1
+            return {
+                "concurrency": self.concurrency,
+                "rate_per_second": self.rate,
+                "active": self.active,
+                "queued": queued,
+                "max_queued": self.max_queued,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "avg_wait_ms": round(self.waited / self.admitted * 1000, 1)
+                if self.admitted
+                else 0.0,
+            }
+
+
+class Scheduler:
+    """Limits how hard this server can push the Obsidian app.
+
+    Heavy endpoints (searches, Dataview) and cheap ones (vault reads,
+    writes, listings, commands) get separate lanes, so a burst of searches
+    cannot starve note reads and cannot freeze the editor either.
+    """
+
+    def __init__(
+        self,
+        heavy_concurrency: int = int(os.getenv("OBSIDIAN_HEAVY_CONCURRENCY", "2")),
+        heavy_rate: float = float(os.getenv("OBSIDIAN_HEAVY_RATE", "5")),
+        cheap_concurrency: int = int(os.getenv("OBSIDIAN_CHEAP_CONCURRENCY", "8")),
+        cheap_rate: float = float(os.getenv("OBSIDIAN_CHEAP_RATE", "0")),
+    ):
+        self.heavy = Lane("heavy", heavy_concurrency, heavy_rate)
+        self.cheap = Lane("cheap", cheap_concurrency, cheap_rate)
+
+    def lane(self, endpoint: str) -> Lane:
+        return self.heavy if endpoint in HEAVY_ENDPOINTS else self.cheap
+
+    @contextmanager
+    def slot(self, endpoint: str) -> Iterator[None]:
+        """Hold a slot in the endpoint's lane for the duration of a request.
+
+        Waits at the current context's priority, for at most the time left
+        before the caller's deadline.
+        """
+        lane = self.lane(endpoint)
+        lane.acquire(current_priority.get(), remaining())
+        try:
+            yield
+        finally:
+            lane.release()
+
+    def stats(self) -> dict:
+        return {"heavy": self.heavy.stats(), "cheap": self.cheap.stats()}
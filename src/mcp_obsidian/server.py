@@ -1,9 +1,15 @@
+import contextlib
+import hmac
 import logging
 import os
 import sys
+import threading
+import time
+import weakref
 from collections.abc import Sequence
 from typing import Any
 
+import anyio
 from dotenv import load_dotenv
 
 # UTF-8 fix for Windows MCP STDIO communication
@@ -23,7 +29,11 @@ from mcp.types import (
 
 load_dotenv()
 
-from . import tools  # Note: tools.py validates OBSIDIAN_API_KEY at import time
+from . import tools
+from .profiler import ToolProfiler
+from .spans import Tracer
+from .timeouts import deadline_scope
+from .trace import TraceRecorder
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -31,13 +41,61 @@ logger = logging.getLogger("mcp-obsidian")
 
 app = Server("mcp-obsidian")
 
+# Overall time budget per tool call in seconds (0 disables)
+tool_deadline = float(os.getenv("OBSIDIAN_TOOL_DEADLINE", "0"))
+
+# Opt-in log of every tool call (OBSIDIAN_TRACE_FILE)
+trace_recorder = TraceRecorder.from_env()
+
+# Opt-in per-call profiling (OBSIDIAN_PROFILE_*, or armed via the diagnostics tool)
+tool_profiler = ToolProfiler.from_env()
+
+# Opt-in timing spans per tool call (OBSIDIAN_SPANS, OBSIDIAN_SPANS_FILE)
+tracer = Tracer.from_env()
+
+# Tool calls one client session may run at once (0: no per-session limit)
+session_concurrency = int(os.getenv("OBSIDIAN_SESSION_CONCURRENCY", "8"))
+_session_limiters: "weakref.WeakKeyDictionary[Any, anyio.CapacityLimiter]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Tools to expose (OBSIDIAN_TOOLS, comma-separated, "obsidian_" prefix optional); all if unset
+enabled_tools = {
+    name if name.startswith("obsidian_") else f"obsidian_{name}"
+    for name in (part.strip() for part in os.getenv("OBSIDIAN_TOOLS", "").split(","))
+    if name
+}
+
 tool_handlers = {}
 
+# Tool definitions, built once at registration and served by list_tools
+tool_catalog: dict[str, Tool] = {}
+
 
 def add_tool_handler(tool_class: tools.ToolHandler):
     global tool_handlers
 
+    if enabled_tools and tool_class.name not in enabled_tools:
+        return
     tool_handlers[tool_class.name] = tool_class
+    tool = tool_class.get_tool_description()
+    if tools.vaults:
+        tool = _with_vault_argument(tool, tool_class.fan_out)
+    tool_catalog[tool_class.name] = tool
+
+
+def _with_vault_argument(tool: Tool, fan_out: bool) -> Tool:
+    """Add the optional ``vault`` argument to a tool's input schema."""
+    names = list(tools.vaults)
+    description = f"Vault to use (default: {tools.default_vault})"
+    if fan_out:
+        names.append("*")
+        description += "; '*' runs the call against every vault concurrently"
+    schema = dict(tool.inputSchema)
+    schema["properties"] = dict(schema.get("properties", {})) | {
+        "vault": {"type": "string", "enum": names, "description": description}
+    }
+    return tool.model_copy(update={"inputSchema": schema})
 
 
 def get_tool_handler(name: str) -> tools.ToolHandler | None:
@@ -49,11 +107,16 @@ def get_tool_handler(name: str) -> tools.ToolHandler | None:
 
 add_tool_handler(tools.ListFilesInDirToolHandler())
 add_tool_handler(tools.ListFilesInVaultToolHandler())
+add_tool_handler(tools.ListFilesRecursiveToolHandler())
+add_tool_handler(tools.ResolveNoteToolHandler())
 add_tool_handler(tools.GetFileContentsToolHandler())
+add_tool_handler(tools.GetSectionToolHandler())
+add_tool_handler(tools.GetOutlineToolHandler())
 add_tool_handler(tools.SearchToolHandler())
 add_tool_handler(tools.PatchContentToolHandler())
 add_tool_handler(tools.AppendContentToolHandler())
 add_tool_handler(tools.PutContentToolHandler())
+add_tool_handler(tools.BatchPutContentToolHandler())
 add_tool_handler(tools.DeleteFileToolHandler())
 add_tool_handler(tools.ComplexSearchToolHandler())
 add_tool_handler(tools.BatchGetFileContentsToolHandler())
@@ -65,13 +128,118 @@ add_tool_handler(tools.GetActiveNoteToolHandler())
 add_tool_handler(tools.ListCommandsToolHandler())
 add_tool_handler(tools.ExecuteCommandToolHandler())
 add_tool_handler(tools.OpenFileToolHandler())
+add_tool_handler(tools.DiagnosticsToolHandler(tool_profiler, tracer))
+
+if unknown := enabled_tools - tool_handlers.keys():
+    logger.warning(f"OBSIDIAN_TOOLS names unknown tools: {', '.join(sorted(unknown))}")
 
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """List available tools."""
 
-    return [th.get_tool_description() for th in tool_handlers.values()]
+    return list(tool_catalog.values())
+
+
+def _progress_reporter():
+    """Build a progress callback for the current request, if it asked for one.
+
+    The callback is invoked from the worker thread running the tool and hops
+    back onto the event loop to send the notification.
+    """
+    ctx = app.request_context
+    progress_token = ctx.meta.progressToken if ctx.meta else None
+    if progress_token is None:
+        return None
+
+    def report(progress: float, total: float | None = None) -> None:
+        anyio.from_thread.run(
+            ctx.session.send_progress_notification, progress_token, progress, total
+        )
+
+    return report
+
+
+def _incoming_traceparent() -> str | None:
+    """W3C traceparent the client sent in the request's ``_meta``, if any."""
+    meta = app.request_context.meta
+    return (meta.model_extra or {}).get("traceparent") if meta else None
+
+
+def _session_limiter() -> contextlib.AbstractAsyncContextManager:
+    """Limiter for the current client session's concurrent tool calls.
+
+    Sessions share the process-wide worker threads and REST client; the
+    limit stops one busy client from taking all of them.
+    """
+    if session_concurrency <= 0:
+        return contextlib.nullcontext()
+    session = app.request_context.session
+    limiter = _session_limiters.get(session)
+    if limiter is None:
+        limiter = _session_limiters[session] = anyio.CapacityLimiter(session_concurrency)
+    return limiter
+
+
+async def _run_in_thread(
+    tool_handler: tools.ToolHandler, arguments: dict, vault: str | None = None
+) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
+    # Run in a worker thread so blocking HTTP calls don't stall other requests
+    async with _session_limiter():
+        if vault != "*":
+            return await anyio.to_thread.run_sync(_run_tool, tool_handler, arguments, vault)
+        if not tools.vaults:
+            raise ValueError("No vaults are registered (OBSIDIAN_VAULTS)")
+        if not tool_handler.fan_out:
+            raise ValueError(f"{tool_handler.name} cannot run against every vault")
+        if arguments.get("cursor"):
+            # Cursors belong to one vault's results; page through that vault
+            raise ValueError(
+                'cursor cannot be combined with vault "*"; pass the vault it came from'
+            )
+        return await _fan_out(tool_handler, arguments)
+
+
+async def _fan_out(
+    tool_handler: tools.ToolHandler, arguments: dict
+) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
+    """Run a read-only tool against every vault concurrently.
+
+    Results come back per vault, in registry order; a vault that fails
+    reports its error without failing the others.
+    """
+    results: dict[str, Sequence[TextContent | ImageContent | EmbeddedResource]] = {}
+
+    async def run(vault: str) -> None:
+        try:
+            results[vault] = await anyio.to_thread.run_sync(
+                _run_tool, tool_handler, arguments, vault
+            )
+        except Exception as e:
+            results[vault] = [TextContent(type="text", text=f"Error: {e}")]
+
+    async with anyio.create_task_group() as tg:
+        for vault in tools.vaults:
+            tg.start_soon(run, vault)
+    return [
+        TextContent(type="text", text=f"Vault: {vault}\n{content.text}")
+        for vault in tools.vaults
+        for content in results[vault]
+        if isinstance(content, TextContent)
+    ]
+
+
+def _run_tool(
+    tool_handler: tools.ToolHandler, arguments: dict, vault: str | None = None
+) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
+    """Run a tool against a vault so that every REST request it makes
+    shares one deadline."""
+    token = tools.current_vault.set(vault)
+    try:
+        with tool_profiler.profile(tool_handler.name), deadline_scope(tool_deadline):
+            return tool_handler.run_tool(arguments)
+    finally:
+        tools.current_vault.reset(token)
 
 
 @app.call_tool()
@@ -87,16 +255,128 @@ async def call_tool(
     if not tool_handler:
         raise ValueError(f"Unknown tool: {name}")
 
+    vault = arguments.get("vault")
+    tool_arguments = {key: value for key, value in arguments.items() if key != "vault"}
+    token = tools.progress_reporter.set(_progress_reporter())
+    started, start = time.time(), time.perf_counter()
+    result: Sequence[TextContent | ImageContent | EmbeddedResource] = []
+    error = None
     try:
-        return tool_handler.run_tool(arguments)
+        if tracer is None:
+            result = await _run_in_thread(tool_handler, tool_arguments, vault)
+        else:
+            with tracer.trace(
+                f"tools/call {name}", _incoming_traceparent(), **{"mcp.tool.name": name}
+            ):
+                result = await _run_in_thread(tool_handler, tool_arguments, vault)
+        return result
     except Exception as e:
-        logger.error(str(e))
-        raise RuntimeError(f"Caught Exception. Error: {str(e)}")
+        error = str(e)
+        logger.error(error)
+        raise RuntimeError(f"Caught Exception. Error: {error}")
+    finally:
+        tools.progress_reporter.reset(token)
+        if trace_recorder is not None:
+            trace_recorder.record(
+                name,
+                arguments,
+                started,
+                time.perf_counter() - start,
+                sum(len(getattr(content, "text", "")) for content in result),
+                error,
+            )
+
+
+class _StreamableHTTPEndpoint:
+    """ASGI endpoint handing requests to the session manager, after
+    checking the bearer token if one is configured."""
+
+    def __init__(self, manager, token: str):
+        self.manager = manager
+        self.token = token
+
+    async def __call__(self, scope, receive, send) -> None:
+        if self.token:
+            headers = dict(scope.get("headers", []))
+            supplied = headers.get(b"authorization", b"").decode("latin-1")
+            if not hmac.compare_digest(supplied, f"Bearer {self.token}"):
+                from starlette.responses import JSONResponse
+
+                response = JSONResponse({"error": "unauthorized"}, status_code=401)
+                await response(scope, receive, send)
+                return
+        await self.manager.handle_request(scope, receive, send)
+
+
+def create_http_app(
+    host: str = "127.0.0.1", token: str = os.getenv("OBSIDIAN_HTTP_TOKEN", "")
+):
+    """Starlette app serving this server over Streamable HTTP at ``/mcp``.
+
+    Every client session runs in this process, so all of them share the
+    REST client with its connection handling, caches and indexes. When
+    bound to a loopback ``host``, requests must carry a local Host and
+    Origin, so web pages cannot reach the vault through DNS rebinding.
+    Any other ``host`` requires a ``token``: without one, anyone who can
+    reach the port could read, edit and delete notes.
+    """
+    loopback = host in ("127.0.0.1", "localhost", "::1")
+    if not loopback and not token:
+        raise ValueError(
+            f"OBSIDIAN_HTTP_TOKEN is required to serve over HTTP on non-loopback "
+            f"host {host}"
+        )
+
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    from mcp.server.transport_security import TransportSecuritySettings
+    from starlette.applications import Starlette
+    from starlette.routing import Route
+
+    security = None
+    if loopback:
+        local = ["127.0.0.1", "localhost", "[::1]"]
+        security = TransportSecuritySettings(
+            allowed_hosts=[f"{name}:*" for name in local],
+            allowed_origins=[f"http://{name}:*" for name in local],
+        )
+    manager = StreamableHTTPSessionManager(app=app, security_settings=security)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(_):
+        async with manager.run():
+            yield
+
+    return Starlette(
+        routes=[Route("/mcp", endpoint=_StreamableHTTPEndpoint(manager, token))],
+        lifespan=lifespan,
+    )
+
+
+async def main(transport: str = os.getenv("OBSIDIAN_TRANSPORT", "stdio").lower()):
+    if tools.vaults:
+        for vault in tools.vaults.values():
+            vault.require_api_key()
+    else:
+        tools.require_api_key()
+
+    if transport == "http":
+        import uvicorn
 
+        host = os.getenv("OBSIDIAN_HTTP_HOST", "127.0.0.1")
+        port = int(os.getenv("OBSIDIAN_HTTP_PORT", "8000"))
+        config = uvicorn.Config(create_http_app(host), host=host, port=port, log_level="info")
+        threading.Thread(target=tools.get_client, name="warm-up", daemon=True).start()
+        logger.info(f"Serving MCP over Streamable HTTP at http://{host}:{port}/mcp")
+        await uvicorn.Server(config).serve()
+        return
+    if transport != "stdio":
+        raise ValueError(f"Invalid OBSIDIAN_TRANSPORT: {transport}. Must be stdio or http")
 
-async def main():
     # Import here to avoid issues with event loops
     from mcp.server.stdio import stdio_server
 
     async with stdio_server() as (read_stream, write_stream):
+        # Load the REST client while the client initializes the session,
+        # rather than on the first tool call
+        threading.Thread(target=tools.get_client, name="warm-up", daemon=True).start()
         await app.run(read_stream, write_stream, app.create_initialization_options())
@@ -0,0 +1,104 @@
+import threading
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Coalesces concurrent identical reads into one call.
+
+    The first caller for a key runs the call; callers arriving while it is
+    in flight wait and receive the same result (or exception). Nothing is
+    cached once the call returns.
+
+    Writes act as barriers: while a write to a path is in flight, reads of
+    that path wait for it to finish, and a read never joins a flight that
+    started before a write to its path (or, for vault-wide reads such as
+    searches, before any write).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._writes_done = threading.Condition(self._lock)
+        self._flights: dict[tuple[Hashable, str | None], _Flight] = {}
+        self._writing: dict[str, int] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any], path: str | None = None) -> Any:
+        """Run ``fn`` unless an identical call is already in flight.
+
+        Args:
+            key: Identity of the request (method, URL, body hash, ...)
+            fn: Performs the request
+            path: Vault path the read depends on, or None for reads that
+                depend on the whole vault
+        """
+        with self._lock:
+            while path is not None and self._writing.get(path):
+                self._writes_done.wait()
+            flight_key = (key, path)
+
+            flight = self._flights.get(flight_key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[flight_key] = _Flight()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                # A write may have detached this flight already
+                if self._flights.get(flight_key) is flight:
+                    del self._flights[flight_key]
+            flight.done.set()
+
+    @contextmanager
+    def write(self, path: str) -> Iterator[None]:
+        """Mark a write to ``path`` as in flight for the duration of the block."""
+        with self._lock:
+            self._writing[path] = self._writing.get(path, 0) + 1
+            # Reads already in flight may miss this write; later reads must
+            # not join them
+            prefix = path.rstrip("/") + "/"
+            for flight_key in [
+                k
+                for k in self._flights
+                if k[1] is None or k[1] == path or k[1].startswith(prefix)
+            ]:
+                del self._flights[flight_key]
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._writing[path] -= 1
+                if not self._writing[path]:
+                    del self._writing[path]
+                self._writes_done.notify_all()
+
+    def stats(self) -> dict[str, int]:
+        """Requests actually sent and reads that shared another's request."""
+        with self._lock:
+            return {"requests": self.calls, "coalesced": self.coalesced}
@@ -0,0 +1,311 @@
+import functools
+import json
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+# Span of the tool call being traced in this context (None when not tracing)
+current_span: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation in a trace; times are Unix nanoseconds."""
+
+    __slots__ = (
+        "trace",
+        "name",
+        "span_id",
+        "parent_id",
+        "start",
+        "end",
+        "attributes",
+        "error",
+        "downloaded",
+        "kind",
+    )
+
+    def __init__(self, trace: "_Trace", name: str, parent_id: str | None, start: int):
+        self.trace = trace
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start = start
+        self.end = start
+        self.attributes: dict[str, Any] = {}
+        self.error: str | None = None
+        # When an HTTP span's response body had been read
+        self.downloaded: int | None = None
+        # OTLP SpanKind: 1 internal, 2 server (tool call), 3 client (request)
+        self.kind = 1
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end - self.start) / 1e6
+
+    def child(self, name: str, start: int, end: int, **attributes: Any) -> "Span":
+        """Record an already finished sub-operation of this span."""
+        span = Span(self.trace, name, self.span_id, start)
+        span.end = end
+        span.attributes.update(attributes)
+        self.trace.add(span)
+        return span
+
+
+class _Trace:
+    """Spans of one tool call; handed to the tracer when the root ends."""
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """Time the enclosed block as a child of the current span.
+
+    Outside a traced tool call this does nothing and yields None, so
+    instrumentation costs one context variable lookup when tracing is off.
+    """
+    parent = current_span.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(parent.trace, name, parent.span_id, time.time_ns())
+    child.attributes.update(attributes)
+    token = current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current_span.reset(token)
+        child.end = time.time_ns()
+        parent.trace.add(child)
+
+
+def traced(fn):
+    """Decorator: run each call of a method in a span named after it."""
+    name = fn.__qualname__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if current_span.get() is None:
+            return fn(*args, **kwargs)
+        with span(name):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def traceparent() -> str | None:
+    """W3C traceparent header value for the current span, if tracing."""
+    current = current_span.get()
+    if current is None:
+        return None
+    return f"00-{current.trace.trace_id}-{current.span_id}-01"
+
+
+def _on_response(response, *args, **kwargs) -> None:
+    """requests response hook: split the current HTTP span into phases.
+
+    Runs once the status line and headers have arrived (time to first
+    byte, which includes connecting) and reads the body here so the
+    download is timed on its own.
+    """
+    current = current_span.get()
+    if current is None:
+        return
+    first_byte = time.time_ns()
+    body = response.content
+    downloaded = time.time_ns()
+    current.name = f"HTTP {response.request.method}"
+    current.attributes.update(
+        {
+            "http.request.method": response.request.method,
+            "url.path": response.request.path_url,
+            "http.response.status_code": response.status_code,
+            "http.response.body.size": len(body or b""),
+        }
+    )
+    current.child("wait", current.start, first_byte)
+    current.child("download", first_byte, downloaded)
+    current.downloaded = downloaded
+
+
+# Pass as ``hooks=`` to every request so HTTP spans are split into phases
+HTTP_HOOKS = {"response": _on_response}
+
+
+@contextmanager
+def http_span(**attributes: Any) -> Iterator[None]:
+    """Span for one HTTP attempt; time after the body arrived is parsing."""
+    with span("HTTP", **attributes) as current:
+        if current is not None:
+            current.kind = 3
+        yield
+        if current is not None and current.downloaded is not None:
+            current.child("parse", current.downloaded, time.time_ns())
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans: list[Span]) -> dict[str, Any]:
+    """Spans as an OTLP/JSON ExportTraceServiceRequest."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": "mcp-obsidian"}}
+                    ]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "mcp_obsidian"},
+                        "spans": [
+                            {
+                                "traceId": s.trace.trace_id,
+                                "spanId": s.span_id,
+                                **({"parentSpanId": s.parent_id} if s.parent_id else {}),
+                                "name": s.name,
+                                "kind": s.kind,
+                                "startTimeUnixNano": str(s.start),
+                                "endTimeUnixNano": str(s.end),
+                                "attributes": [
+                                    {"key": k, "value": _otlp_value(v)}
+                                    for k, v in s.attributes.items()
+                                ],
+                                "status": (
+                                    {"code": 2, "message": s.error} if s.error else {"code": 1}
+                                ),
+                            }
+                            for s in spans
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+def _tree(spans: list[Span]) -> list[dict[str, Any]]:
+    ids = {s.span_id for s in spans}
+    ordered = sorted(spans, key=lambda s: s.start)
+    children: dict[str, list[Span]] = {}
+    for s in ordered:
+        if s.parent_id in ids:
+            children.setdefault(s.parent_id, []).append(s)
+
+    def node(s: Span) -> dict[str, Any]:
+        entry: dict[str, Any] = {"name": s.name, "ms": round(s.duration_ms, 3)}
+        if s.attributes:
+            entry["attributes"] = s.attributes
+        if s.error:
+            entry["error"] = s.error
+        if s.span_id in children:
+            entry["children"] = [node(c) for c in children[s.span_id]]
+        return entry
+
+    # Roots have no parent here (or a parent in the caller's process)
+    return [node(s) for s in ordered if s.parent_id not in ids]
+
+
+class Tracer:
+    """Records nested timing spans of tool calls.
+
+    Each traced tool call becomes one trace: a root span for the call and
+    child spans for client methods, HTTP attempts (split into wait,
+    download and parse), outline parsing and result serialization. The
+    last ``buffer`` traces are kept in memory for obsidian_get_diagnostics;
+    with ``path`` set, every trace is also appended to that file as one
+    line of OTLP/JSON, which OpenTelemetry collectors and viewers import.
+    """
+
+    def __init__(self, buffer: int = 50, path: str | None = None):
+        self.traces: deque[_Trace] = deque(maxlen=max(1, buffer))
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8") if path else None
+
+    @classmethod
+    def from_env(cls) -> "Tracer | None":
+        """Tracer configured by OBSIDIAN_SPANS / OBSIDIAN_SPANS_FILE, or None."""
+        buffer = int(os.getenv("OBSIDIAN_SPANS", "0"))
+        path = os.getenv("OBSIDIAN_SPANS_FILE", "")
+        if buffer <= 0 and not path:
+            return None
+        return cls(buffer or 50, path or None)
+
+    @contextmanager
+    def trace(
+        self, name: str, parent: str | None = None, **attributes: Any
+    ) -> Iterator[Span]:
+        """Root span of a tool call.
+
+        ``parent`` is an incoming W3C traceparent; the trace then joins
+        the caller's trace instead of starting a new one.
+        """
+        trace_id, parent_id = secrets.token_hex(16), None
+        if parent:
+            parts = parent.split("-")
+            if len(parts) == 4 and len(parts[1]) == 32 and len(parts[2]) == 16:
+                trace_id, parent_id = parts[1], parts[2]
+        root = Span(_Trace(trace_id), name, parent_id, time.time_ns())
+        root.kind = 2
+        root.attributes.update(attributes)
+        token = current_span.set(root)
+        try:
+            yield root
+        except BaseException as e:
+            root.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            current_span.reset(token)
+            root.end = time.time_ns()
+            root.trace.add(root)
+            self._finish(root.trace)
+
+    def _finish(self, trace: _Trace) -> None:
+        line = None
+        if self._file is not None:
+            line = json.dumps(to_otlp(trace.spans), ensure_ascii=False, default=str)
+        with self._lock:
+            self.traces.append(trace)
+            # The file may have been closed since the line was serialized
+            if line is not None and self._file is not None:
+                self._file.write(line + "\n")
+                self._file.flush()
+
+    def recent(self, count: int = 5) -> list[dict[str, Any]]:
+        """The last ``count`` traces as span trees, newest first."""
+        with self._lock:
+            traces = list(self.traces)[-count:] if count > 0 else []
+        return [
+            {"trace_id": t.trace_id, "spans": _tree(t.spans)} for t in reversed(traces)
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
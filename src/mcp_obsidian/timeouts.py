@@ -0,0 +1,169 @@
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Read timeouts in seconds per endpoint class; OBSIDIAN_TIMEOUT_<NAME> overrides
+DEFAULT_TIMEOUTS = {
+    "list": 6.0,  # directory listings
+    "read": 6.0,  # note, periodic and active-note reads
+    "write": 10.0,  # put, append, patch, delete
+    "search": 30.0,  # simple text search
+    "query": 30.0,  # JsonLogic and Dataview queries
+    "command": 6.0,  # command palette and UI actions
+}
+
+# Absolute time.monotonic() by which the current tool call must finish
+deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+# Set while a request is retried after the adaptive timeout cut it short
+_static: ContextVar[bool] = ContextVar("static_timeouts", default=False)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request would start after the caller's deadline."""
+
+    pass
+
+
+@contextmanager
+def deadline_scope(seconds: float | None) -> Iterator[None]:
+    """Give requests made in this block (and this context) a shared deadline.
+
+    Nested scopes can only shorten the deadline. None or 0 leaves it as is.
+    """
+    current = deadline.get()
+    if seconds:
+        limit = time.monotonic() + seconds
+        current = limit if current is None else min(current, limit)
+    token = deadline.set(current)
+    try:
+        yield
+    finally:
+        deadline.reset(token)
+
+
+@contextmanager
+def static_timeouts(enabled: bool = True) -> Iterator[None]:
+    """Use the static read timeouts for requests made in this block, even
+    in adaptive mode."""
+    token = _static.set(enabled or _static.get())
+    try:
+        yield
+    finally:
+        _static.reset(token)
+
+
+def remaining() -> float | None:
+    """Seconds left before the current deadline, or None without one."""
+    limit = deadline.get()
+    return None if limit is None else limit - time.monotonic()
+
+
+class _Latencies:
+    """Ring buffer of recent request durations for one endpoint class."""
+
+    def __init__(self, size: int):
+        self.samples: deque[float] = deque(maxlen=size)
+
+    def percentile(self, q: float) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class TimeoutPolicy:
+    """Per-endpoint request timeouts, optionally adapted to observed latency.
+
+    Every endpoint class has a static read timeout. In adaptive mode, once
+    ``min_samples`` requests to an endpoint have been timed, its read
+    timeout becomes ``multiplier`` times the p99 latency, kept between
+    ``floor`` and the static timeout, so a hung request is abandoned long
+    before the static limit when the endpoint is normally fast. A request
+    the adaptive timeout cuts short is recorded as taking at least that
+    long, so the timeout grows when an endpoint turns slow. Either way the
+    timeout never exceeds the time left before the caller's deadline.
+    """
+
+    def __init__(
+        self,
+        timeouts: dict[str, float] | None = None,
+        connect: float = float(os.getenv("OBSIDIAN_CONNECT_TIMEOUT", "3")),
+        adaptive: bool = os.getenv("OBSIDIAN_ADAPTIVE_TIMEOUTS", "false").lower()
+        in ("1", "true", "yes"),
+        multiplier: float = 3.0,
+        floor: float = 1.0,
+        min_samples: int = 20,
+        window: int = 200,
+    ):
+        self.timeouts = {
+            name: float(os.getenv(f"OBSIDIAN_TIMEOUT_{name.upper()}", default))
+            for name, default in DEFAULT_TIMEOUTS.items()
+        } | (timeouts or {})
+        self.connect = connect
+        self.adaptive = adaptive
+        self.multiplier = multiplier
+        self.floor = floor
+        self.min_samples = min_samples
+        self.window = window
+        self._latencies: dict[str, _Latencies] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        """Record how long a completed request took."""
+        with self._lock:
+            latencies = self._latencies.get(endpoint)
+            if latencies is None:
+                latencies = self._latencies[endpoint] = _Latencies(self.window)
+            latencies.samples.append(seconds)
+
+    def static_timeout(self, endpoint: str) -> float:
+        """Configured read timeout for an endpoint class."""
+        return self.timeouts.get(endpoint, DEFAULT_TIMEOUTS["read"])
+
+    def read_timeout(self, endpoint: str) -> float:
+        """Read timeout for an endpoint class, before deadline clamping."""
+        limit = self.static_timeout(endpoint)
+        if not self.adaptive or _static.get():
+            return limit
+        with self._lock:
+            latencies = self._latencies.get(endpoint)
+            if latencies is None or len(latencies.samples) < self.min_samples:
+                return limit
+            p99 = latencies.percentile(0.99)
+        return min(limit, max(self.floor, p99 * self.multiplier))
+
+    def timeout_for(self, endpoint: str) -> tuple[float, float]:
+        """Return the (connect, read) timeout for a request starting now.
+
+        Raises:
+            DeadlineExceeded: If the caller's deadline has already passed
+        """
+        connect, read = self.connect, self.read_timeout(endpoint)
+        left = remaining()
+        if left is not None:
+            if left <= 0:
+                raise DeadlineExceeded("Deadline exceeded before the request was sent")
+            connect, read = min(connect, left), min(read, left)
+        return connect, read
+
+    def stats(self) -> dict:
+        """Configured timeouts plus observed p50/p99 latency per endpoint."""
+        with self._lock:
+            observed = {
+                name: {
+                    "samples": len(latencies.samples),
+                    "p50_ms": round(latencies.percentile(0.5) * 1000, 1),
+                    "p99_ms": round(latencies.percentile(0.99) * 1000, 1),
+                }
+                for name, latencies in self._latencies.items()
+                if latencies.samples
+            }
+        return {
+            "adaptive": self.adaptive,
+            "connect": self.connect,
+            "read": {name: self.read_timeout(name) for name in self.timeouts},
+            "latency": observed,
+        }
@@ -1,4 +1,5 @@
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
+from contextvars import ContextVar
 from mcp.types import (
     Tool,
     ToolAnnotations,
@@ -6,23 +7,106 @@ from mcp.types import (
     ImageContent,
     EmbeddedResource,
 )
-import json
 import os
-from . import obsidian
+import threading
+from typing import TYPE_CHECKING
+from .output import OUTPUT_FORMAT_PROPERTY, format_output
+from .pager import PAGINATION_PROPERTIES, paginate
+from .profiler import ToolProfiler
+from .spans import Tracer
+from .vaults import load_vaults
+
+if TYPE_CHECKING:
+    from .obsidian import Obsidian
 
 api_key = os.getenv("OBSIDIAN_API_KEY", "")
 obsidian_host = os.getenv("OBSIDIAN_HOST", "127.0.0.1")
+# Default max_concurrency of obsidian_batch_put_content
+write_concurrency = int(os.getenv("OBSIDIAN_WRITE_CONCURRENCY", "4"))
+
+# Registered vaults (OBSIDIAN_VAULTS); empty for a single unnamed vault
+vaults = load_vaults()
+# Vault used when a call names none: the first registered one
+default_vault: str | None = next(iter(vaults), None)
+
+_client: "Obsidian | None" = None
+_vault_clients: "dict[str, Obsidian]" = {}
+_client_lock = threading.Lock()
+
+# Set by the server for calls whose client asked for progress notifications
+progress_reporter: ContextVar[Callable[[float, float | None], None] | None] = (
+    ContextVar("progress_reporter", default=None)
+)
+
+# Set by the server from a call's ``vault`` argument
+current_vault: ContextVar[str | None] = ContextVar("current_vault", default=None)
+
+
+def report_progress(progress: float, total: float | None = None) -> None:
+    """Send a progress notification for the current tool call, if requested."""
+    reporter = progress_reporter.get()
+    if reporter is not None:
+        reporter(progress, total)
+
+
+def require_api_key() -> str:
+    """Return OBSIDIAN_API_KEY, raising if it is not set."""
+    if api_key == "":
+        raise ValueError(
+            f"OBSIDIAN_API_KEY environment variable required. Working directory: {os.getcwd()}"
+        )
+    return api_key
+
+
+def vault_name() -> str | None:
+    """Name of the vault the current call runs against (None without a registry)."""
+    return current_vault.get() or default_vault
+
+
+def get_client(vault: str | None = None) -> "Obsidian":
+    """Return the process-wide REST client of a vault.
+
+    Sharing one client per vault lets caches (such as note outlines)
+    survive across tool calls. ``vault`` defaults to the current call's
+    vault, then the default vault. The client module (and with it the
+    HTTP stack) is imported on first use, so starting the server does not
+    pay for it.
+    """
+    global _client
+
+    name = vault or vault_name()
+    if name is not None and name not in vaults:
+        raise ValueError(f"Unknown vault: {name}. Configured vaults: {', '.join(vaults)}")
+
+    if name is None or name == default_vault:
+        if _client is None:
+            with _client_lock:
+                if _client is None:
+                    if name is None:
+                        from .obsidian import Obsidian
+
+                        _client = Obsidian(api_key=require_api_key(), host=obsidian_host)
+                    else:
+                        _client = vaults[name].connect()
+        return _client
+
+    client = _vault_clients.get(name)
+    if client is None:
+        with _client_lock:
+            client = _vault_clients.get(name)
+            if client is None:
+                client = _vault_clients[name] = vaults[name].connect()
+    return client
 
-if api_key == "":
-    raise ValueError(
-        f"OBSIDIAN_API_KEY environment variable required. Working directory: {os.getcwd()}"
-    )
 
 TOOL_LIST_FILES_IN_VAULT = "obsidian_list_files_in_vault"
 TOOL_LIST_FILES_IN_DIR = "obsidian_list_files_in_dir"
 
 
 class ToolHandler:
+    # Read-only tools that can run against every vault at once (vault "*")
+    fan_out = False
+
     def __init__(self, tool_name: str):
         self.name = tool_name
 
@@ -43,7 +127,14 @@ class ListFilesInVaultToolHandler(ToolHandler):
         return Tool(
             name=self.name,
             description="Lists all files and directories in the root directory of your Obsidian vault.",
-            inputSchema={"type": "object", "properties": {}, "required": []},
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "output_format": OUTPUT_FORMAT_PROPERTY,
+                    **PAGINATION_PROPERTIES,
+                },
+                "required": [],
+            },
             annotations=ToolAnnotations(
                 readOnlyHint=True,
             ),
@@ -52,13 +143,13 @@ class ListFilesInVaultToolHandler(ToolHandler):
     def run_tool(
         self, args: dict
     ) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
-        api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
+        api = get_client()
 
-        files = api.list_files_in_vault()
+        files = paginate(self.name, args, api.list_files_in_vault, scope=vault_name())
 
         return [
             TextContent(
-                type="text", text=json.dumps(files, indent=2, ensure_ascii=False)
+                type="text", text=format_output(files, args.get("output_format"))
             )
         ]
 
@@ -78,6 +169,8 @@ class ListFilesInDirToolHandler(ToolHandler):
                         "type": "string",
                         "description": "Path to list files from (relative to your vault root). Note that empty directories will not be returned.",
                     },
+                    "output_format": OUTPUT_FORMAT_PROPERTY,
+                    **PAGINATION_PROPERTIES,
                 },
                 "required": ["dirpath"],
             },
@@ -92,13 +185,151 @@ class ListFilesInDirToolHandler(ToolHandler):
         if "dirpath" not in args:
             raise RuntimeError("dirpath argument missing in arguments")
 
-        api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
+        api = get_client()
+
+        files = paginate(
+            self.name,
+            args,
+            lambda: api.list_files_in_dir(args["dirpath"]),
+            scope=vault_name(),
+        )
+
+        return [
+            TextContent(
+                type="text", text=format_output(files, args.get("output_format"))
+            )
+        ]
+
+
+class ListFilesRecursiveToolHandler(ToolHandler):
+    def __init__(self):
+        super().__init__("obsidian_list_files_recursive")
+
+    def get_tool_description(self):
+        return Tool(
+            name=self.name,
+            description="Lists files in a directory and all its subdirectories in one call, optionally limited by depth or filtered by a glob pattern.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "dirpath": {
+                        "type": "string",
+                        "description": "Directory to start from (relative to your vault root). Omit for the whole vault.",
+                    },
+                    "max_depth": {
+                        "type": "integer",
+                        "description": "Number of directory levels to list (1 lists only dirpath). Omit for no limit.",
+                        "minimum": 1,
+                    },
+                    "pattern": {
+                        "type": "string",
+                        "description": "Glob matched against full file paths, e.g. '*.md' or 'Projects/*/index.md'. Only matching files are returned.",
+                    },
+                    "format": {
+                        "type": "string",
+                        "description": "'paths' for a flat list of vault paths (default) or 'tree' for a nested tree",
+                        "enum": ["paths", "tree"],
+                        "default": "paths",
+                    },
+                    "output_format": OUTPUT_FORMAT_PROPERTY,
+                    **PAGINATION_PROPERTIES,
+                },
+                "required": [],
+            },
+            annotations=ToolAnnotations(
+                readOnlyHint=True,
+            ),
+        )
+
+    def run_tool(
+        self, args: dict
+    ) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
+        max_depth = args.get("max_depth")
+        if max_depth is not None and (not isinstance(max_depth, int) or max_depth < 1):
+            raise RuntimeError(f"Invalid max_depth: {max_depth}. Must be a positive integer")
+
+        output_format = args.get("format", "paths")
+        if output_format not in ("paths", "tree"):
+            raise RuntimeError(f"Invalid format: {output_format}. Must be 'paths' or 'tree'")
+
+        api = get_client()
+        files = paginate(
+            self.name,
+            args,
+            lambda: api.list_files_recursive(
+                args.get("dirpath", ""),
+                max_depth=max_depth,
+                pattern=args.get("pattern"),
+                as_tree=output_format == "tree",
+            ),
+            scope=vault_name(),
+        )
+
+        return [
+            TextContent(
+                type="text", text=format_output(files, args.get("output_format"))
+            )
+        ]
+
+
+class ResolveNoteToolHandler(ToolHandler):
+    fan_out = True
+
+    def __init__(self):
+        super().__init__("obsidian_resolve_note")
+
+    def get_tool_description(self):
+        return Tool(
+            name=self.name,
+            description="Find notes by approximate title or alias, like Obsidian's quick switcher. Use this to turn a half-remembered or misspelled note name into a vault path.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Note name or fragment, e.g. 'mtg notes 0412'",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of results to return (default: 10)",
+                        "default": 10,
+                        "minimum": 1,
+                        "maximum": 100,
+                    },
+                    "include_aliases": {
+                        "type": "boolean",
+                        "description": "Also match frontmatter aliases (default: true)",
+                        "default": True,
+                    },
+                    "output_format": OUTPUT_FORMAT_PROPERTY,
+                },
+                "required": ["query"],
+            },
+            annotations=ToolAnnotations(
+                readOnlyHint=True,
+            ),
+        )
 
-        files = api.list_files_in_dir(args["dirpath"])
+    def run_tool(
+        self, args: dict
+    ) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
+        if "query" not in args:
+            raise RuntimeError("query argument missing in arguments")
+
+        limit = args.get("limit", 10)
+        if not isinstance(limit, int) or limit < 1 or limit > 100:
+            raise RuntimeError(f"Invalid limit: {limit}. Must be between 1 and 100")
+
+        api = get_client()
+        matches = api.resolve_note(
+            args["query"],
+            limit=limit,
+            include_aliases=args.get("include_aliases", True),
+        )
 
         return [
             TextContent(
-                type="text", text=json.dumps(files, indent=2, ensure_ascii=False)
+                type="text", text=format_output(matches, args.get("output_format"))
             )
         ]
 
@@ -119,6 +350,7 @@ class GetFileContentsToolHandler(ToolHandler):
                         "description": "Path to the relevant file (relative to your vault root).",
                         "format": "path",
                     },
+                    "output_format": OUTPUT_FORMAT_PROPERTY,
                 },
                 "required": ["filepath"],
             },
@@ -133,18 +365,122 @@ class GetFileContentsToolHandler(ToolHandler):
         if "filepath" not in args:
             raise RuntimeError("filepath argument missing in arguments")
 
-        api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
+        api = get_client()
 
         content = api.get_file_contents(args["filepath"])
 
         return [
             TextContent(
-                type="text", text=json.dumps(content, indent=2, ensure_ascii=False)
+                type="text", text=format_output(content, args.get("output_format"))
+            )
+        ]
+
+
+class GetSectionToolHandler(ToolHandler):
+    def __init__(self):
+        super().__init__("obsidian_get_section")
+
+    def get_tool_description(self):
+        return Tool(
+            name=self.name,
+            description="Return only part of a note: the section under a heading, the block for a block reference, or the frontmatter. Cheaper than reading the whole file.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "filepath": {
+                        "type": "string",
+                        "description": "Path to the relevant file (relative to your vault root).",
+                        "format": "path",
+                    },
+                    "target_type": {
+                        "type": "string",
+                        "description": "Type of section to return",
+                        "enum": ["heading", "block", "frontmatter"],
+                    },
+                    "target": {
+                        "type": "string",
+                        "description": "Heading text (use 'Parent::Child' for nested headings), block ID, or frontmatter field. Omit for the whole frontmatter.",
+                    },
+                },
+                "required": ["filepath", "target_type"],
+            },
+            annotations=ToolAnnotations(
+                readOnlyHint=True,
+            ),
+        )
+
+    def run_tool(
+        self, args: dict
+    ) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
+        if "filepath" not in args or "target_type" not in args:
+            raise RuntimeError("filepath and target_type arguments required")
+
+        target_type = args["target_type"]
+        if target_type not in ("heading", "block", "frontmatter"):
+            raise RuntimeError(
+                f"Invalid target_type: {target_type}. Must be one of: heading, block, frontmatter"
+            )
+        if target_type != "frontmatter" and not args.get("target"):
+            raise RuntimeError(f"target argument required for {target_type}")
+
+        api = get_client()
+        content = api.get_section(args["filepath"], target_type, args.get("target"))
+
+        return [TextContent(type="text", text=content)]
+
+
+class GetOutlineToolHandler(ToolHandler):
+    def __init__(self):
+        super().__init__("obsidian_get_outline")
+
+    def get_tool_description(self):
+        return Tool(
+            name=self.name,
+            description="Return the structure of a note without its body: headings with levels, line ranges and section sizes, block IDs and the frontmatter range. Use before editing or reading sections of large notes.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "filepath": {
+                        "type": "string",
+                        "description": "Path to the relevant file (relative to your vault root).",
+                        "format": "path",
+                    },
+                    "refresh": {
+                        "type": "boolean",
+                        "description": "If true, re-read the note instead of using the cached outline (default: false)",
+                        "default": False,
+                    },
+                    "output_format": OUTPUT_FORMAT_PROPERTY,
+                },
+                "required": ["filepath"],
+            },
+            annotations=ToolAnnotations(
+                readOnlyHint=True,
+            ),
+        )
+
+    def run_tool(
+        self, args: dict
+    ) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
+        if "filepath" not in args:
+            raise RuntimeError("filepath argument missing in arguments")
+
+        api = get_client()
+        if args.get("refresh", False):
+            outline = api.get_outline(args["filepath"], max_age=0)
+        else:
+            outline = api.get_outline(args["filepath"])
+
+        return [
+            TextContent(
+                type="text", text=format_output(outline, args.get("output_format"))
             )
         ]
 
 
 class SearchToolHandler(ToolHandler):
+    fan_out = True
+
     def __init__(self):
         super().__init__("obsidian_simple_search")
 
@@ -170,6 +506,8 @@ class SearchToolHandler(ToolHandler):
                         "description": "How many contexts to return at most (default: 100)",
                         "default": 100
                     },
+                    "output_format": OUTPUT_FORMAT_PROPERTY,
+                    **PAGINATION_PROPERTIES,
                 },
                 "required": ["query"],
             },
@@ -184,40 +522,46 @@ class SearchToolHandler(ToolHandler):
         context_length = args.get("context_length", 100)
         limit = args.get("limit", 100)
         
-        api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
-        results = api.search(args["query"], context_length, limit)
-        
-        formatted_results = []
-        total_results = 0
-        for result in results:
-            if total_results >= limit:
-                break
-            formatted_matches = []
-            for match in result.get("matches", []):
+        api = get_client()
+
+        def search():
+            results = api.search(args["query"], context_length, limit)
+
+            formatted_results = []
+            total_results = 0
+            for result in results:
                 if total_results >= limit:
                     break
-                context = match.get("context", "")
-                match_pos = match.get("match", {})
-                start = match_pos.get("start", 0)
-                end = match_pos.get("end", 0)
-
-                formatted_matches.append(
-                    {"context": context, "match_position": {"start": start, "end": end}}
+                formatted_matches = []
+                for match in result.get("matches", []):
+                    if total_results >= limit:
+                        break
+                    context = match.get("context", "")
+                    match_pos = match.get("match", {})
+                    start = match_pos.get("start", 0)
+                    end = match_pos.get("end", 0)
+
+                    formatted_matches.append(
+                        {"context": context, "match_position": {"start": start, "end": end}}
+                    )
+                    total_results = total_results + 1
+
+                formatted_results.append(
+                    {
+                        "filename": result.get("filename", ""),
+                        "score": result.get("score", 0),
+                        "matches": formatted_matches,
+                    }
                 )
-                total_results = total_results + 1
-
-            formatted_results.append(
-                {
-                    "filename": result.get("filename", ""),
-                    "score": result.get("score", 0),
-                    "matches": formatted_matches,
-                }
-            )
+
+            return formatted_results
+
+        formatted_results = paginate(self.name, args, search, scope=vault_name())
 
         return [
             TextContent(
                 type="text",
-                text=json.dumps(formatted_results, indent=2, ensure_ascii=False),
+                text=format_output(formatted_results, args.get("output_format")),
             )
         ]
 
@@ -256,7 +600,7 @@ class AppendContentToolHandler(ToolHandler):
         if "filepath" not in args or "content" not in args:
             raise RuntimeError("filepath and content arguments required")
 
-        api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
+        api = get_client()
         api.append_content(args.get("filepath", ""), args["content"])
 
         return [
@@ -333,7 +677,7 @@ class PatchContentToolHandler(ToolHandler):
                 "filepath, operation, target_type, target and content arguments required"
             )
 
-        api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
+        api = get_client()
         api.patch_content(
             args.get("filepath", ""),
             args.get("operation", ""),
@@ -383,7 +727,7 @@ class PutContentToolHandler(ToolHandler):
         if "filepath" not in args or "content" not in args:
             raise RuntimeError("filepath and content arguments required")
 
-        api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
+        api = get_client()
         api.put_content(args.get("filepath", ""), args["content"])
 
         return [
@@ -393,6 +737,100 @@ class PutContentToolHandler(ToolHandler):
         ]
 
 
+class BatchPutContentToolHandler(ToolHandler):
+    def __init__(self):
+        super().__init__("obsidian_batch_put_content")
+
+    def get_tool_description(self):
+        return Tool(
+            name=self.name,
+            description="Create or overwrite many files in one call. Writes run concurrently; reports success or failure per file.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "files": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "filepath": {
+                                    "type": "string",
+                                    "description": "Path to the file (relative to vault root)",
+                                    "format": "path",
+                                },
+                                "content": {
+                                    "type": "string",
+                                    "description": "Full content of the file",
+                                },
+                            },
+                            "required": ["filepath", "content"],
+                        },
+                        "description": "Files to write",
+                    },
+                    "skip_unchanged": {
+                        "type": "boolean",
+                        "description": "If true, skip files whose current content is identical (default: false)",
+                        "default": False,
+                    },
+                    "max_concurrency": {
+                        "type": "integer",
+                        "description": "Maximum number of writes in flight at once (default: OBSIDIAN_WRITE_CONCURRENCY, 4)",
+                        "default": write_concurrency,
+                        "minimum": 1,
+                        "maximum": 16,
+                    },
+                    "output_format": OUTPUT_FORMAT_PROPERTY,
+                },
+                "required": ["files"],
+            },
+            annotations=ToolAnnotations(
+                destructiveHint=True,
+            ),
+        )
+
+    def run_tool(
+        self, args: dict
+    ) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
+        if "files" not in args:
+            raise RuntimeError("files argument missing in arguments")
+
+        files: dict[str, str] = {}
+        for entry in args["files"]:
+            if not isinstance(entry, dict) or "filepath" not in entry or "content" not in entry:
+                raise RuntimeError("each file requires filepath and content")
+            if entry["filepath"] in files:
+                raise RuntimeError(f"duplicate filepath: {entry['filepath']}")
+            files[entry["filepath"]] = entry["content"]
+
+        max_concurrency = args.get("max_concurrency", write_concurrency)
+        if not isinstance(max_concurrency, int) or not 1 <= max_concurrency <= 16:
+            raise RuntimeError(
+                f"Invalid max_concurrency: {max_concurrency}. Must be between 1 and 16"
+            )
+
+        api = get_client()
+        results = api.put_many(
+            files,
+            max_workers=max_concurrency,
+            skip_unchanged=args.get("skip_unchanged", False),
+            progress=report_progress,
+        )
+
+        summary = {
+            status: sum(1 for r in results if r["status"] == status)
+            for status in ("written", "unchanged", "error")
+        }
+        return [
+            TextContent(
+                type="text",
+                text=format_output(
+                    {"summary": summary, "results": results},
+                    args.get("output_format"),
+                ),
+            )
+        ]
+
+
 class DeleteFileToolHandler(ToolHandler):
     def __init__(self):
         super().__init__("obsidian_delete_file")
@@ -431,7 +869,7 @@ class DeleteFileToolHandler(ToolHandler):
         if not args.get("confirm", False):
             raise RuntimeError("confirm must be set to true to delete a file")
 
-        api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
+        api = get_client()
         api.delete_file(args["filepath"])
 
         return [
@@ -440,6 +878,8 @@ class DeleteFileToolHandler(ToolHandler):
 
 
 class ComplexSearchToolHandler(ToolHandler):
+    fan_out = True
+
     def __init__(self):
         super().__init__("obsidian_complex_search")
 
@@ -479,7 +919,9 @@ class ComplexSearchToolHandler(ToolHandler):
                     "query": {
                         "type": "object",
                         "description": "JsonLogic query object (see examples in tool description)",
-                    }
+                    },
+                    "output_format": OUTPUT_FORMAT_PROPERTY,
+                    **PAGINATION_PROPERTIES,
                 },
                 "required": ["query"],
             },
@@ -491,12 +933,17 @@ class ComplexSearchToolHandler(ToolHandler):
         if "query" not in args:
             raise RuntimeError("query argument missing in arguments")
 
-        api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
-        results = api.search_json(args.get("query", ""))
+        api = get_client()
+        results = paginate(
+            self.name,
+            args,
+            lambda: api.search_json(args.get("query", "")),
+            scope=vault_name(),
+        )
 
         return [
             TextContent(
-                type="text", text=json.dumps(results, indent=2, ensure_ascii=False)
+                type="text", text=format_output(results, args.get("output_format"))
             )
         ]
 
@@ -532,7 +979,7 @@ class BatchGetFileContentsToolHandler(ToolHandler):
         if "filepaths" not in args:
             raise RuntimeError("filepaths argument missing in arguments")
 
-        api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
+        api = get_client()
         content = api.get_batch_file_contents(args["filepaths"])
 
         return [TextContent(type="text", text=content)]
@@ -559,6 +1006,7 @@ class PeriodicNotesToolHandler(ToolHandler):
                         "description": "Whether to return JSON format with metadata (default: false)",
                         "default": False,
                     },
+                    "output_format": OUTPUT_FORMAT_PROPERTY,
                 },
                 "required": ["period"],
             },
@@ -579,13 +1027,13 @@ class PeriodicNotesToolHandler(ToolHandler):
 
         as_json = args.get("as_json", False)
 
-        api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
+        api = get_client()
         content = api.get_periodic_note(period, as_json)
 
         if as_json:
             return [
                 TextContent(
-                    type="text", text=json.dumps(content, indent=2, ensure_ascii=False)
+                    type="text", text=format_output(content, args.get("output_format"))
                 )
             ]
         else:
@@ -620,6 +1068,7 @@ class RecentPeriodicNotesToolHandler(ToolHandler):
                         "description": "Whether to include note content (default: false)",
                         "default": False,
                     },
+                    "output_format": OUTPUT_FORMAT_PROPERTY,
                 },
                 "required": ["period"],
             },
@@ -648,17 +1097,19 @@ class RecentPeriodicNotesToolHandler(ToolHandler):
                 f"Invalid include_content: {include_content}. Must be a boolean"
             )
 
-        api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
+        api = get_client()
         results = api.get_recent_periodic_notes(period, limit, include_content)
 
         return [
             TextContent(
-                type="text", text=json.dumps(results, indent=2, ensure_ascii=False)
+                type="text", text=format_output(results, args.get("output_format"))
             )
         ]
 
 
 class RecentChangesToolHandler(ToolHandler):
+    fan_out = True
+
     def __init__(self):
         super().__init__("obsidian_get_recent_changes")
 
@@ -682,6 +1133,12 @@ class RecentChangesToolHandler(ToolHandler):
                         "minimum": 1,
                         "default": 90,
                     },
+                    "use_cache": {
+                        "type": "boolean",
+                        "description": "Reuse a recent identical query result if available (default: true). Set to false to force a fresh query.",
+                        "default": True,
+                    },
+                    "output_format": OUTPUT_FORMAT_PROPERTY,
                 },
             },
         )
@@ -697,17 +1154,21 @@ class RecentChangesToolHandler(ToolHandler):
         if not isinstance(days, int) or days < 1:
             raise RuntimeError(f"Invalid days: {days}. Must be a positive integer")
 
-        api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
-        results = api.get_recent_changes(limit, days)
+        api = get_client()
+        results = api.get_recent_changes(
+            limit, days, use_cache=args.get("use_cache", True)
+        )
 
         return [
             TextContent(
-                type="text", text=json.dumps(results, indent=2, ensure_ascii=False)
+                type="text", text=format_output(results, args.get("output_format"))
             )
         ]
 
 
 class DataviewQueryToolHandler(ToolHandler):
+    fan_out = True
+
     def __init__(self):
         super().__init__("obsidian_dataview_query")
 
@@ -721,7 +1182,14 @@ class DataviewQueryToolHandler(ToolHandler):
                     "query": {
                         "type": "string",
                         "description": "The Dataview query string (e.g., 'TABLE title, status FROM #tag'). Note: Does not support TABLE WITHOUT ID queries.",
-                    }
+                    },
+                    "use_cache": {
+                        "type": "boolean",
+                        "description": "Reuse a recent identical query result if available (default: true). Set to false to force a fresh query.",
+                        "default": True,
+                    },
+                    "output_format": OUTPUT_FORMAT_PROPERTY,
+                    **PAGINATION_PROPERTIES,
                 },
                 "required": ["query"],
             },
@@ -737,12 +1205,17 @@ class DataviewQueryToolHandler(ToolHandler):
         if not isinstance(query, str):
             raise RuntimeError("query must be a string")
 
-        api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
-        results = api.dataview_query(query)
+        api = get_client()
+        results = paginate(
+            self.name,
+            args,
+            lambda: api.dataview_query(query, use_cache=args.get("use_cache", True)),
+            scope=vault_name(),
+        )
 
         return [
             TextContent(
-                type="text", text=json.dumps(results, indent=2, ensure_ascii=False)
+                type="text", text=format_output(results, args.get("output_format"))
             )
         ]
 
@@ -762,7 +1235,8 @@ class GetActiveNoteToolHandler(ToolHandler):
                         "type": "boolean",
                         "description": "Whether to return JSON format with metadata (default: false)",
                         "default": False,
-                    }
+                    },
+                    "output_format": OUTPUT_FORMAT_PROPERTY,
                 },
             },
         )
@@ -772,13 +1246,13 @@ class GetActiveNoteToolHandler(ToolHandler):
     ) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
         as_json = args.get("as_json", False)
 
-        api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
+        api = get_client()
         content = api.get_active_note(as_json)
 
         if as_json:
             return [
                 TextContent(
-                    type="text", text=json.dumps(content, indent=2, ensure_ascii=False)
+                    type="text", text=format_output(content, args.get("output_format"))
                 )
             ]
         else:
@@ -799,7 +1273,7 @@ class ListCommandsToolHandler(ToolHandler):
     def run_tool(
         self, args: dict
     ) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
-        api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
+        api = get_client()
         commands = api.list_commands()
 
         # Format the commands for better readability
@@ -843,7 +1317,7 @@ class ExecuteCommandToolHandler(ToolHandler):
         if "command_id" not in args:
             raise RuntimeError("command_id argument required")
 
-        api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
+        api = get_client()
         api.execute_command(args["command_id"])
 
         return [
@@ -887,7 +1361,7 @@ class OpenFileToolHandler(ToolHandler):
         filename = args["filename"]
         new_leaf = args.get("new_leaf", False)
 
-        api = obsidian.Obsidian(api_key=api_key, host=obsidian_host)
+        api = get_client()
         api.open_file(filename, new_leaf)
 
         return [
@@ -896,3 +1370,62 @@ class OpenFileToolHandler(ToolHandler):
                 text=f"Successfully opened file: {filename} (new_leaf={new_leaf})",
             )
         ]
+
+
+class DiagnosticsToolHandler(ToolHandler):
+    def __init__(self, profiler: ToolProfiler | None = None, tracer: Tracer | None = None):
+        super().__init__("obsidian_get_diagnostics")
+        self.profiler = profiler
+        self.tracer = tracer
+
+    def get_tool_description(self):
+        return Tool(
+            name=self.name,
+            description="Report the health of the connection to Obsidian: circuit breaker state, retry counters and request coalescing statistics. Does not contact Obsidian. Can also arm profiling of the next calls of a slow tool; profiles are written to a local directory. When span tracing is enabled, shows timing trees of recent tool calls.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "profile_tool": {
+                        "type": "string",
+                        "description": "Profile the next calls of this tool (e.g. obsidian_simple_search)",
+                    },
+                    "profile_calls": {
+                        "type": "integer",
+                        "description": "Number of calls to profile (0 cancels)",
+                        "default": 1,
+                        "minimum": 0,
+                    },
+                    "traces": {
+                        "type": "integer",
+                        "description": "Number of recent tool-call span trees to include, newest first (needs OBSIDIAN_SPANS)",
+                        "default": 3,
+                        "minimum": 0,
+                    },
+                    "output_format": OUTPUT_FORMAT_PROPERTY,
+                },
+                "required": [],
+            },
+            annotations=ToolAnnotations(
+                readOnlyHint=True,
+            ),
+        )
+
+    def run_tool(
+        self, args: dict
+    ) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
+        api = get_client()
+        diagnostics = api.diagnostics()
+
+        if self.profiler is not None:
+            if args.get("profile_tool"):
+                self.profiler.arm(args["profile_tool"], int(args.get("profile_calls", 1)))
+            diagnostics["profiler"] = self.profiler.stats()
+        if self.tracer is not None:
+            diagnostics["traces"] = self.tracer.recent(int(args.get("traces", 3)))
+
+        return [
+            TextContent(
+                type="text",
+                text=format_output(diagnostics, args.get("output_format")),
+            )
+        ]
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Any
+
+# Argument names whose values are redacted unless configured otherwise
+DEFAULT_REDACTED = "content"
+
+
+def _redacted(value: str) -> str:
+    digest = hashlib.sha256(value.encode("utf-8")).hexdigest()[:12]
+    return f"<redacted:{len(value)}:{digest}>"
+
+
+def redact(value: Any, names: frozenset[str], everything: bool = False, key: str = "") -> Any:
+    """Replace sensitive strings with a placeholder keeping their length.
+
+    Strings under an argument named in ``names`` (at any depth) are
+    redacted, or every string if ``everything`` is set. Numbers, booleans
+    and structure are kept so traces still show the shape of each call.
+    """
+    if isinstance(value, dict):
+        return {k: redact(v, names, everything, k) for k, v in value.items()}
+    if isinstance(value, list):
+        return [redact(v, names, everything, key) for v in value]
+    if isinstance(value, str) and (everything or key in names):
+        return _redacted(value)
+    return value
+
+
+class TraceRecorder:
+    """Appends one JSON line per tool call to a local trace file.
+
+    Each line holds the tool name, its (redacted) arguments, when the call
+    started, how long it took and how many characters it returned, so
+    real agent sessions can be replayed later (benchmarks/replay_trace.py).
+    ``redacted`` is a comma-separated list of argument names to redact,
+    "all" for every string argument, or "none".
+    """
+
+    def __init__(self, path: str, redacted: str = DEFAULT_REDACTED):
+        self.path = path
+        names = {name.strip() for name in redacted.split(",") if name.strip()}
+        self.everything = "all" in names
+        self.names = frozenset(names - {"all", "none"})
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    @classmethod
+    def from_env(cls) -> "TraceRecorder | None":
+        """Recorder configured by OBSIDIAN_TRACE_FILE, or None if unset."""
+        path = os.getenv("OBSIDIAN_TRACE_FILE", "")
+        if not path:
+            return None
+        return cls(path, os.getenv("OBSIDIAN_TRACE_REDACT", DEFAULT_REDACTED))
+
+    def record(
+        self,
+        tool: str,
+        arguments: dict,
+        started: float,
+        duration: float,
+        response_chars: int,
+        error: str | None = None,
+    ) -> None:
+        """Append one call; ``started`` is a time.time() timestamp."""
+        entry = {
+            "ts": round(started, 6),
+            "tool": tool,
+            "arguments": redact(arguments, self.names, self.everything),
+            "duration_ms": round(duration * 1000, 3),
+            "response_chars": response_chars,
+            "error": error,
+        }
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def read_trace(path: str) -> list[dict]:
+    """Load a trace written by TraceRecorder, oldest call first."""
+    with open(path, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    return sorted(entries, key=lambda entry: entry["ts"])
@@ -0,0 +1,185 @@
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterator
+
+
+def build_tree(paths: list[str], root: str = "") -> dict:
+    """Nest a flat path list into {"dir/": {...}, "file.md": None} form.
+
+    Args:
+        paths: Paths relative to the vault root; directories end with "/"
+        root: Directory the paths were listed from, stripped from the keys
+    """
+    tree: dict = {}
+    for path in paths:
+        node = tree
+        parts = path[len(root) :].split("/")
+        is_dir = path.endswith("/")
+        segments = parts[:-1] if is_dir else parts
+        for i, segment in enumerate(segments):
+            if i < len(segments) - 1 or is_dir:
+                node = node.setdefault(segment + "/", {})
+            else:
+                node[segment] = None
+    return tree
+
+
+class _Directory:
+    """Trie node. ``children`` maps interned names to a node (directory) or
+    None (file); ``loaded_at`` is when the listing was last fetched, or None
+    if the children are not fully known."""
+
+    __slots__ = ("children", "loaded_at")
+
+    def __init__(self):
+        self.children: dict[str, "_Directory | None"] = {}
+        self.loaded_at: float | None = None
+
+
+class VaultTree:
+    """In-memory snapshot of the vault's paths, kept as a trie.
+
+    Directories are filled in as they are listed, so the snapshot can be
+    partial. Writes and deletes made through this server are applied as
+    deltas; a directory listing older than ``ttl`` seconds is considered
+    stale and gets reconciled with the REST API on next use, which picks up
+    changes made inside Obsidian. Path segments are interned so repeated
+    folder names are stored once.
+
+    Directory keys are "" for the vault root and "dir/sub/" otherwise.
+    """
+
+    def __init__(self, ttl: float = float(os.getenv("OBSIDIAN_LISTING_TTL", "30"))):
+        self.ttl = ttl
+        self._root = _Directory()
+        self._lock = threading.Lock()
+        # Bumped whenever the set of known paths changes
+        self.version = 0
+
+    @staticmethod
+    def _segments(path: str) -> list[str]:
+        return [sys.intern(s) for s in path.strip("/").split("/") if s]
+
+    def _find(self, directory: str) -> _Directory | None:
+        node = self._root
+        for segment in self._segments(directory):
+            child = node.children.get(segment)
+            if child is None:
+                return None
+            node = child
+        return node
+
+    def _is_fresh(self, node: _Directory) -> bool:
+        return node.loaded_at is not None and time.monotonic() - node.loaded_at <= self.ttl
+
+    def listing(self, directory: str) -> list[str] | None:
+        """Return a directory's entries ("name" or "name/"), or None if unknown.
+
+        None is also returned when the listing is due for reconciliation.
+        """
+        with self._lock:
+            node = self._find(directory)
+            if node is None or not self._is_fresh(node):
+                return None
+            return [
+                name if child is None else f"{name}/"
+                for name, child in node.children.items()
+            ]
+
+    def store(self, directory: str, entries: list[str]) -> None:
+        """Record a directory listing fetched from the REST API.
+
+        Known subdirectories that still exist keep their own (possibly
+        loaded) subtrees; entries that disappeared are dropped.
+        """
+        with self._lock:
+            node = self._root
+            for segment in self._segments(directory):
+                child = node.children.get(segment)
+                if child is None:
+                    child = node.children[segment] = _Directory()
+                node = child
+
+            previous = node.children
+            children: dict[str, _Directory | None] = {}
+            for entry in entries:
+                if entry.endswith("/"):
+                    name = sys.intern(entry.rstrip("/"))
+                    existing = previous.get(name)
+                    children[name] = existing if existing is not None else _Directory()
+                else:
+                    children[sys.intern(entry)] = None
+            if children.keys() != previous.keys():
+                self.version += 1
+            node.children = children
+            node.loaded_at = time.monotonic()
+
+    def add_file(self, path: str) -> None:
+        """Apply the creation (or overwrite) of a file."""
+        segments = self._segments(path)
+        if not segments:
+            return
+        with self._lock:
+            node = self._root
+            for segment in segments[:-1]:
+                child = node.children.get(segment)
+                if child is None:
+                    child = node.children[segment] = _Directory()
+                    # A new folder holds exactly this file so far
+                    child.loaded_at = node.loaded_at
+                node = child
+            if segments[-1] not in node.children:
+                node.children[segments[-1]] = None
+                self.version += 1
+
+    def remove(self, path: str) -> None:
+        """Apply the deletion of a file or directory.
+
+        Folders left empty are pruned, since the REST API does not list
+        empty directories.
+        """
+        segments = self._segments(path)
+        if not segments:
+            return
+        with self._lock:
+            trail = [self._root]
+            for segment in segments[:-1]:
+                child = trail[-1].children.get(segment)
+                if child is None:
+                    return
+                trail.append(child)
+            if segments[-1] not in trail[-1].children:
+                return
+            del trail[-1].children[segments[-1]]
+            self.version += 1
+
+            for depth in range(len(trail) - 1, 0, -1):
+                node = trail[depth]
+                if node.children or node.loaded_at is None:
+                    break
+                trail[depth - 1].children.pop(segments[depth - 1], None)
+
+    def files(self, directory: str = "") -> Iterator[str]:
+        """Yield every known file path under a directory."""
+        with self._lock:
+            node = self._find(directory)
+            if node is None:
+                return
+            prefix = "/".join(self._segments(directory))
+            stack = [(f"{prefix}/" if prefix else "", node)]
+            paths = []
+            while stack:
+                base, current = stack.pop()
+                for name, child in current.children.items():
+                    if child is None:
+                        paths.append(base + name)
+                    else:
+                        stack.append((f"{base}{name}/", child))
+        yield from paths
+
+    def clear(self) -> None:
+        with self._lock:
+            self._root = _Directory()
+            self.version += 1
@@ -0,0 +1,98 @@
+import os
+import re
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .obsidian import Obsidian
+
+# Request limits that can be set per vault, as Scheduler keyword arguments
+LIMIT_SETTINGS = {
+    "HEAVY_CONCURRENCY": int,
+    "HEAVY_RATE": float,
+    "CHEAP_CONCURRENCY": int,
+    "CHEAP_RATE": float,
+}
+
+
+def env_prefix(name: str) -> str:
+    """Prefix of a vault's settings, e.g. OBSIDIAN_VAULT_TEAM_ for "team"."""
+    return f"OBSIDIAN_VAULT_{re.sub(r'[^A-Za-z0-9]', '_', name).upper()}_"
+
+
+class Vault:
+    """Connection settings and request limits of one registered vault.
+
+    Each vault gets its own client (see connect()), so connection pool,
+    caches, indexes, circuit breaker and scheduler lanes are never shared
+    between vaults.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        api_key: str,
+        protocol: str = "https",
+        host: str = "127.0.0.1",
+        port: int = 27124,
+        limits: dict[str, Any] | None = None,
+    ):
+        self.name = name
+        self.api_key = api_key
+        self.protocol = protocol
+        self.host = host
+        self.port = port
+        self.limits = dict(limits or {})
+
+    @classmethod
+    def from_env(cls, name: str, environ: Mapping[str, str] = os.environ) -> "Vault":
+        """Settings from OBSIDIAN_VAULT_<NAME>_<SETTING>, falling back to
+        the server-wide OBSIDIAN_<SETTING> for anything not set."""
+        prefix = env_prefix(name)
+
+        def setting(key: str, default: str) -> str:
+            return environ.get(prefix + key) or environ.get(f"OBSIDIAN_{key}") or default
+
+        return cls(
+            name,
+            api_key=setting("API_KEY", ""),
+            protocol=setting("PROTOCOL", "https").lower(),
+            host=setting("HOST", "127.0.0.1"),
+            port=int(setting("PORT", "27124")),
+            limits={
+                key.lower(): convert(environ[prefix + key])
+                for key, convert in LIMIT_SETTINGS.items()
+                if environ.get(prefix + key)
+            },
+        )
+
+    def require_api_key(self) -> str:
+        if not self.api_key:
+            raise ValueError(
+                f"{env_prefix(self.name)}API_KEY (or OBSIDIAN_API_KEY) environment "
+                f"variable required for vault {self.name!r}"
+            )
+        return self.api_key
+
+    def connect(self) -> "Obsidian":
+        """A new REST client for this vault."""
+        from .obsidian import Obsidian
+        from .scheduler import Scheduler
+
+        return Obsidian(
+            api_key=self.require_api_key(),
+            protocol=self.protocol,
+            host=self.host,
+            port=self.port,
+            scheduler=Scheduler(**self.limits),
+        )
+
+
+def load_vaults(environ: Mapping[str, str] = os.environ) -> dict[str, Vault]:
+    """The vault registry configured by OBSIDIAN_VAULTS, in listed order.
+
+    Empty when OBSIDIAN_VAULTS is unset: the server then talks to the one
+    vault configured by OBSIDIAN_API_KEY, OBSIDIAN_HOST and so on.
+    """
+    names = [name.strip() for name in environ.get("OBSIDIAN_VAULTS", "").split(",")]
+    return {name: Vault.from_env(name, environ) for name in names if name}
@@ -2,6 +2,8 @@ import os
 
 # Set required env var before importing mcp_obsidian modules
 os.environ.setdefault("OBSIDIAN_API_KEY", "test-api-key-for-testing")
+# Retry immediately so failure-path tests stay fast
+os.environ.setdefault("OBSIDIAN_RETRY_BACKOFF", "0")
 
 import pytest
 import responses
@@ -27,3 +29,17 @@ def base_url():
 def mock_responses():
     with responses.RequestsMock() as rsps:
         yield rsps
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_client():
+    """Give every test a fresh process-wide client (and empty caches)."""
+    from mcp_obsidian import tools
+    from mcp_obsidian.pager import result_store
+
+    tools._client = None
+    tools._vault_clients.clear()
+    yield
+    tools._client = None
+    tools._vault_clients.clear()
+    result_store.clear()
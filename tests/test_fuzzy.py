@@ -0,0 +1,58 @@
+from mcp_obsidian.fuzzy import NoteIndex, score
+
+
+class TestScore:
+    """Tests for quick-switcher style scoring."""
+
+    def test_ranking_tiers(self):
+        exact = score("inbox", "inbox")
+        prefix = score("inbox", "inbox archive")
+        substring = score("inbox", "old inbox")
+        subsequence = score("inbx", "inbox")
+        typo = score("inbxo", "inbox")
+        assert exact > prefix > substring > subsequence > typo > 0
+
+    def test_tighter_subsequence_scores_higher(self):
+        assert score("mtg", "meeting") > score("mtg", "my long tagline")
+
+    def test_no_match(self):
+        assert score("xyz", "inbox") == 0.0
+
+
+class TestNoteIndex:
+    """Tests for the fuzzy note index."""
+
+    PATHS = [
+        "Inbox.md",
+        "Meetings/Meeting Notes 2024-04-12.md",
+        "Meetings/Meeting Notes 2024-05-01.md",
+        "Projects/Garden.md",
+        "Archive/Inbox old.md",
+    ]
+
+    def test_exact_name_first(self):
+        results = NoteIndex(self.PATHS).search("inbox")
+        assert [r.path for r in results] == ["Inbox.md", "Archive/Inbox old.md"]
+        assert results[0].score == 1.0
+
+    def test_subsequence_across_words(self):
+        results = NoteIndex(self.PATHS).search("mtg notes 0412")
+        assert results[0].path == "Meetings/Meeting Notes 2024-04-12.md"
+
+    def test_typo_falls_back_to_trigrams(self):
+        results = NoteIndex(self.PATHS).search("gardn")
+        assert results[0].path == "Projects/Garden.md"
+        results = NoteIndex(self.PATHS).search("garedn")
+        assert results[0].path == "Projects/Garden.md"
+
+    def test_alias_matches_and_one_result_per_path(self):
+        index = NoteIndex(self.PATHS, {"Projects/Garden.md": ["Veggie patch", "Garden plan"]})
+        results = index.search("veggie")
+        assert results[0].path == "Projects/Garden.md"
+        assert results[0].matched == "Veggie patch"
+        assert [r.path for r in index.search("garden")] == ["Projects/Garden.md"]
+
+    def test_limit_and_empty_query(self):
+        index = NoteIndex(self.PATHS)
+        assert len(index.search("notes", limit=1)) == 1
+        assert index.search("  ") == []
@@ -0,0 +1,119 @@
+import pytest
+import requests
+
+from benchmarks.mock_server import Faults, MockVault, running
+from mcp_obsidian.obsidian import Obsidian
+from mcp_obsidian.timeouts import TimeoutPolicy
+
+NOTE = "---\nstatus: todo\ntags: [project]\n---\n# Plan\n\nFirst step\n\n## Tasks\n\n- one ^task\n\n# Notes\n\nmore #idea\n"
+
+
+@pytest.fixture
+def vault():
+    return MockVault({"Projects/plan.md": NOTE, "Daily/2024-01-01.md": "# Day\n", "inbox.md": "plan later"})
+
+
+def client_for(server) -> Obsidian:
+    host, port = server.server_address
+    return Obsidian(api_key="mock-api-key", protocol="http", host=host, port=port)
+
+
+class TestMockServer:
+    """The benchmark mock server answers the real client like Obsidian would."""
+
+    def test_vault_reads_and_listings(self, vault):
+        with running(vault) as server:
+            client = client_for(server)
+            assert client.list_files_in_vault() == ["Daily/", "Projects/", "inbox.md"]
+            assert client.list_files_in_dir("Projects") == ["plan.md"]
+            assert client.get_file_contents("Projects/plan.md") == NOTE
+            note = requests.get(
+                f"{server.url}/vault/Projects/plan.md",
+                headers={
+                    "Authorization": "Bearer mock-api-key",
+                    "Accept": "application/vnd.olrapi.note+json",
+                },
+            ).json()
+            assert note["frontmatter"] == {"status": "todo", "tags": ["project"]}
+            assert note["tags"] == ["project", "idea"]
+
+    def test_searches(self, vault):
+        with running(vault) as server:
+            client = client_for(server)
+            assert [r["filename"] for r in client.search("LATER")] == ["inbox.md"]
+            assert client.search_json({"in": ["idea", {"var": "tags"}]}) == [
+                {"filename": "Projects/plan.md", "result": True}
+            ]
+            rows = client.dataview_query(
+                'TABLE status AS "State", file.name FROM "Projects" WHERE status = "todo"'
+            )
+            assert rows == [
+                {"filename": "Projects/plan.md", "result": {"State": "todo", "file.name": "plan"}}
+            ]
+            assert len(client.get_recent_changes(days=1)) == 3
+
+    def test_patch_and_write(self, vault):
+        with running(vault) as server:
+            client = client_for(server)
+            client.patch_content("Projects/plan.md", "append", "block", "task", "- two")
+            client.patch_content("Projects/plan.md", "replace", "frontmatter", "status", "done")
+            client.append_content("inbox.md", "\nnow")
+            content = vault.notes["Projects/plan.md"].content
+            assert "- one ^task\n- two\n" in content
+            assert 'status: "done"' in content
+            assert vault.notes["inbox.md"].content == "plan later\nnow"
+
+            response = requests.patch(
+                f"{server.url}/vault/Projects/plan.md",
+                headers={
+                    "Authorization": "Bearer mock-api-key",
+                    "Operation": "replace",
+                    "Target-Type": "heading",
+                    "Target": "Plan::Tasks",
+                },
+                data="- done",
+            )
+            assert response.status_code == 204
+            assert "## Tasks\n- done\n# Notes" in vault.notes["Projects/plan.md"].content
+
+    def test_rejects_bad_api_key(self, vault):
+        with running(vault, api_key="secret") as server:
+            with pytest.raises(Exception, match="40101"):
+                client_for(server).get_file_contents("inbox.md")
+
+    def test_injected_errors_are_retried(self, vault):
+        faults = Faults(error_rate=1.0, seed=0)
+        with running(vault, faults) as server:
+            client = client_for(server)
+            with pytest.raises(Exception, match="Injected error"):
+                client.get_file_contents("inbox.md")
+            assert server.stats()["injected_errors"] == 3
+            faults.error_rate = 0
+            assert client.get_file_contents("inbox.md") == "plan later"
+
+    def test_client_reuses_connections(self, vault):
+        with running(vault) as server:
+            client = client_for(server)
+            client.get_file_contents("inbox.md")
+            client.list_files_in_vault()
+            client.append_content("inbox.md", "\nmore")
+
+            pools = client.session.get_adapter(server.url).poolmanager.pools
+            [pool] = [pools[key] for key in pools.keys()]
+            assert (pool.num_requests, pool.num_connections) == (3, 1)
+            assert client_for(server).session is not client.session
+
+    def test_slow_query_after_fast_warm_up(self, vault):
+        faults = Faults()
+        with running(vault, faults) as server:
+            client = client_for(server)
+            client.timeouts = TimeoutPolicy(adaptive=True, floor=0.1, min_samples=5)
+            for _ in range(10):
+                client.dataview_query("TABLE status", use_cache=False)
+            assert client.timeouts.read_timeout("query") == 0.1
+
+            faults.per_endpoint["query"] = 0.3
+            client.dataview_query("TABLE status", use_cache=False)
+            assert client.breaker.state == client.breaker.CLOSED
+            assert client.timeouts.read_timeout("query") > 0.3
+            client.list_files_in_vault()
@@ -794,3 +794,367 @@ class TestSmarterHeadingPatch:
         # Verify PATCH was used (not GET+PUT)
         assert len(mock_responses.calls) == 1
         assert mock_responses.calls[0].request.method == "PATCH"
+
+
+class TestAppendFastPath:
+    """Tests for heading appends that reduce to a plain POST append."""
+
+    NOTE = "# Title\n\n## Todos\n- [ ] Existing"
+
+    def _note_json(self, content, mtime):
+        return {
+            "content": content,
+            "path": "note.md",
+            "stat": {"ctime": 1, "mtime": mtime, "size": len(content.encode())},
+        }
+
+    def _add_note(self, mock_responses, base_url, content, mtime):
+        mock_responses.add(
+            responses.GET,
+            f"{base_url}/vault/note.md",
+            json=self._note_json(content, mtime),
+            content_type="application/vnd.olrapi.note+json",
+        )
+
+    def test_last_section_append_posts_only_new_content(
+        self, obsidian_client, base_url, mock_responses
+    ):
+        self._add_note(mock_responses, base_url, self.NOTE, 1000)
+        mock_responses.add(responses.POST, f"{base_url}/vault/note.md", status=204)
+        obsidian_client.patch_content("note.md", "append", "heading", "Todos", "- [ ] A")
+
+        methods = [c.request.method for c in mock_responses.calls]
+        assert methods == ["GET", "POST"]
+        assert "json" in mock_responses.calls[0].request.headers["Accept"]
+        assert mock_responses.calls[-1].request.body == "\n\n- [ ] A"
+
+    def test_same_size_reorder_appends_to_moved_heading(
+        self, obsidian_client, base_url, mock_responses
+    ):
+        """A same-size edit in Obsidian must not reuse the old outline."""
+        self._add_note(mock_responses, base_url, "## A\na\n## B\nb", 1000)
+        obsidian_client._get_note("note.md")
+
+        # Sections swapped in Obsidian: same size, B is no longer last
+        mock_responses.replace(
+            responses.GET,
+            f"{base_url}/vault/note.md",
+            json=self._note_json("## B\nb\n## A\na", 2000),
+            content_type="application/vnd.olrapi.note+json",
+        )
+        mock_responses.add(responses.PUT, f"{base_url}/vault/note.md", status=204)
+        obsidian_client.patch_content("note.md", "append", "heading", "B", "new")
+
+        methods = [c.request.method for c in mock_responses.calls]
+        assert methods == ["GET", "GET", "PUT"]
+        assert mock_responses.calls[-1].request.body == "## B\nb\n\nnew\n## A\na"
+
+    def test_plain_text_read_falls_back_to_rewrite(
+        self, obsidian_client, base_url, mock_responses
+    ):
+        mock_responses.add(
+            responses.GET, f"{base_url}/vault/note.md", body=self.NOTE, status=200
+        )
+        mock_responses.add(responses.PUT, f"{base_url}/vault/note.md", status=204)
+        obsidian_client.patch_content("note.md", "append", "heading", "Todos", "- [ ] A")
+
+        methods = [c.request.method for c in mock_responses.calls]
+        assert methods == ["GET", "PUT"]
+        assert mock_responses.calls[-1].request.body == self.NOTE + "\n\n- [ ] A"
+
+    def test_inner_section_append_skips_planner(
+        self, obsidian_client, base_url, mock_responses
+    ):
+        content = "## Todos\n- [ ] Existing\n\n## Notes"
+        mock_responses.add(
+            responses.GET,
+            f"{base_url}/vault/note.md",
+            json=self._note_json(content, 1000),
+            content_type="application/vnd.olrapi.note+json",
+        )
+        mock_responses.add(responses.PUT, f"{base_url}/vault/note.md", status=204)
+        obsidian_client.patch_content("note.md", "append", "heading", "Todos", "- [ ] A")
+
+        methods = [c.request.method for c in mock_responses.calls]
+        assert methods == ["GET", "PUT"]
+
+
+class TestGetSection:
+    """Tests for reading a single section of a note."""
+
+    NOTE = """---
+title: Plan
+status: draft
+---
+# Plan
+
+## Goals
+Ship it ^goal-1
+
+### Stretch
+More
+
+## Risks
+| a | b |
+| - | - |
+
+^risk-table
+"""
+
+    def _add_note(self, mock_responses, base_url, mtime=1000):
+        mock_responses.add(
+            responses.GET,
+            f"{base_url}/vault/plan.md",
+            json={"content": self.NOTE, "stat": {"mtime": mtime}},
+            content_type="application/vnd.olrapi.note+json",
+        )
+
+    def test_heading_section_includes_subheadings(
+        self, obsidian_client, base_url, mock_responses
+    ):
+        self._add_note(mock_responses, base_url)
+        result = obsidian_client.get_section("plan.md", "heading", "Goals")
+        assert result == "## Goals\nShip it ^goal-1\n\n### Stretch\nMore"
+
+    def test_nested_heading_section(self, obsidian_client, base_url, mock_responses):
+        self._add_note(mock_responses, base_url)
+        result = obsidian_client.get_section("plan.md", "heading", "Plan::Goals::Stretch")
+        assert result == "### Stretch\nMore"
+
+    def test_missing_heading_raises(self, obsidian_client, base_url, mock_responses):
+        from mcp_obsidian.obsidian import HeadingNotFoundError
+
+        self._add_note(mock_responses, base_url)
+        with pytest.raises(HeadingNotFoundError):
+            obsidian_client.get_section("plan.md", "heading", "Budget")
+
+    def test_block_inline_and_standalone_ids(
+        self, obsidian_client, base_url, mock_responses
+    ):
+        self._add_note(mock_responses, base_url)
+        assert obsidian_client.get_section("plan.md", "block", "^goal-1") == "Ship it ^goal-1"
+        assert obsidian_client.get_section("plan.md", "block", "risk-table") == (
+            "| a | b |\n| - | - |\n\n^risk-table"
+        )
+
+    def test_frontmatter_block_and_field(self, obsidian_client, base_url, mock_responses):
+        self._add_note(mock_responses, base_url)
+        assert obsidian_client.get_section("plan.md", "frontmatter") == (
+            "title: Plan\nstatus: draft"
+        )
+        assert obsidian_client.get_section("plan.md", "frontmatter", "status") == "draft"
+
+    def test_same_version_reuses_cached_outline(
+        self, obsidian_client, base_url, mock_responses
+    ):
+        self._add_note(mock_responses, base_url)
+        obsidian_client.get_section("plan.md", "heading", "Goals")
+        outline = obsidian_client.outline_cache.get("plan.md")
+        obsidian_client.get_section("plan.md", "heading", "Risks")
+        assert obsidian_client.outline_cache.get("plan.md") is outline
+
+
+class TestGetOutline:
+    """Tests for the cached note outline."""
+
+    NOTE = "---\ntags: x\n---\n# Title\nIntro ^intro\n\n## A\naaaa\n\n## B\nbb"
+
+    def test_outline_from_already_fetched_content(
+        self, obsidian_client, base_url, mock_responses
+    ):
+        mock_responses.add(responses.GET, f"{base_url}/vault/note.md", body=self.NOTE)
+        obsidian_client.get_file_contents("note.md")
+
+        outline = obsidian_client.get_outline("note.md")
+
+        assert len(mock_responses.calls) == 1
+        assert outline["lines"] == 11
+        assert outline["frontmatter"] == {"line": 0, "end_line": 3}
+        assert outline["blocks"] == [{"id": "intro", "line": 4}]
+        assert [(h["text"], h["line"], h["end_line"]) for h in outline["headings"]] == [
+            ("Title", 3, 11),
+            ("A", 6, 9),
+            ("B", 9, 11),
+        ]
+        assert outline["headings"][1]["chars"] == len("## A\naaaa\n\n")
+        assert outline["headings"][2]["chars"] == len("## B\nbb")
+
+    def test_stale_outline_is_refetched(self, obsidian_client, base_url, mock_responses):
+        mock_responses.add(responses.GET, f"{base_url}/vault/note.md", body=self.NOTE)
+        obsidian_client.get_file_contents("note.md")
+
+        obsidian_client.get_outline("note.md", max_age=0)
+
+        assert len(mock_responses.calls) == 2
+
+    def test_appended_outline_matches_full_parse(self):
+        from mcp_obsidian.outline import Outline
+
+        suffix = "\n\n## C ^c\ncc"
+        appended = Outline.from_content(self.NOTE).appended(suffix)
+        full = Outline.from_content(self.NOTE + suffix)
+
+        assert appended.to_dict() == full.to_dict()
+
+
+class TestPutMany:
+    """Tests for concurrent bulk writes."""
+
+    def test_put_many_reports_per_file_results(
+        self, obsidian_client, base_url, mock_responses
+    ):
+        mock_responses.add(responses.PUT, f"{base_url}/vault/a.md", status=204)
+        mock_responses.add(
+            responses.PUT,
+            f"{base_url}/vault/b.md",
+            json={"errorCode": 40500, "message": "Not allowed"},
+            status=405,
+        )
+        mock_responses.add(responses.PUT, f"{base_url}/vault/c.md", status=204)
+        seen = []
+
+        results = obsidian_client.put_many(
+            {"a.md": "A", "b.md": "B", "c.md": "C"},
+            max_workers=3,
+            progress=lambda done, total: seen.append((done, total)),
+        )
+
+        assert [r["status"] for r in results] == ["written", "error", "written"]
+        assert "40500" in results[1]["error"]
+        assert seen == [(1, 3), (2, 3), (3, 3)]
+
+    def test_put_many_skips_unchanged(self, obsidian_client, base_url, mock_responses):
+        mock_responses.add(responses.GET, f"{base_url}/vault/same.md", body="same")
+        mock_responses.add(responses.GET, f"{base_url}/vault/new.md", status=404)
+        mock_responses.add(responses.PUT, f"{base_url}/vault/new.md", status=204)
+
+        results = obsidian_client.put_many(
+            {"same.md": "same", "new.md": "new"}, skip_unchanged=True
+        )
+
+        assert [r["status"] for r in results] == ["unchanged", "written"]
+        assert not any(
+            c.request.method == "PUT" and c.request.url.endswith("same.md")
+            for c in mock_responses.calls
+        )
+
+
+class TestListFilesRecursive:
+    """Tests for the recursive vault crawl."""
+
+    def _add_tree(self, mock_responses, base_url):
+        mock_responses.add(
+            responses.GET, f"{base_url}/vault/", json={"files": ["a.md", "Projects/"]}
+        )
+        mock_responses.add(
+            responses.GET,
+            f"{base_url}/vault/Projects/",
+            json={"files": ["x.md", "Old/"]},
+        )
+        mock_responses.add(
+            responses.GET,
+            f"{base_url}/vault/Projects/Old/",
+            json={"files": ["y.md", "y.png"]},
+        )
+
+    def test_flat_listing(self, obsidian_client, base_url, mock_responses):
+        self._add_tree(mock_responses, base_url)
+        assert obsidian_client.list_files_recursive() == [
+            "Projects/",
+            "Projects/Old/",
+            "Projects/Old/y.md",
+            "Projects/Old/y.png",
+            "Projects/x.md",
+            "a.md",
+        ]
+
+    def test_depth_pattern_and_tree(self, obsidian_client, base_url, mock_responses):
+        self._add_tree(mock_responses, base_url)
+        assert obsidian_client.list_files_recursive(max_depth=2, pattern="*.md") == [
+            "Projects/x.md",
+            "a.md",
+        ]
+        assert obsidian_client.list_files_recursive("Projects", as_tree=True) == {
+            "Old/": {"y.md": None, "y.png": None},
+            "x.md": None,
+        }
+
+    def test_writes_update_the_tree_without_relisting(
+        self, obsidian_client, base_url, mock_responses
+    ):
+        self._add_tree(mock_responses, base_url)
+        mock_responses.add(responses.PUT, f"{base_url}/vault/Projects/New/z.md", status=204)
+        mock_responses.add(responses.DELETE, f"{base_url}/vault/Projects/Old/y.md", status=204)
+        mock_responses.add(responses.DELETE, f"{base_url}/vault/Projects/Old/y.png", status=204)
+        obsidian_client.list_files_recursive()
+        obsidian_client.list_files_recursive()
+        assert len(mock_responses.calls) == 3
+
+        obsidian_client.put_content("Projects/New/z.md", "z")
+        obsidian_client.delete_file("Projects/Old/y.md")
+        obsidian_client.delete_file("Projects/Old/y.png")
+
+        # Old/ is now empty and pruned, like the REST API would list it
+        assert obsidian_client.list_files_recursive() == [
+            "Projects/",
+            "Projects/New/",
+            "Projects/New/z.md",
+            "Projects/x.md",
+            "a.md",
+        ]
+        assert obsidian_client.list_files_in_dir("Projects") == ["x.md", "New/"]
+        assert len(mock_responses.calls) == 6
+
+    def test_stale_listing_is_reconciled(self, obsidian_client, base_url, mock_responses):
+        self._add_tree(mock_responses, base_url)
+        obsidian_client.list_files_recursive()
+
+        obsidian_client.vault_tree.ttl = 0
+        mock_responses.replace(
+            responses.GET, f"{base_url}/vault/", json={"files": ["b.md", "Projects/"]}
+        )
+        assert obsidian_client.list_files_in_vault() == ["b.md", "Projects/"]
+        assert len(mock_responses.calls) == 4
+
+
+class TestResolveNote:
+    """Tests for fuzzy note lookup."""
+
+    def _add_vault(self, mock_responses, base_url):
+        mock_responses.add(
+            responses.GET,
+            f"{base_url}/vault/",
+            json={"files": ["Inbox.md", "Projects/"]},
+        )
+        mock_responses.add(
+            responses.GET,
+            f"{base_url}/vault/Projects/",
+            json={"files": ["Garden.md"]},
+        )
+        mock_responses.add(
+            responses.POST,
+            f"{base_url}/search/",
+            json=[{"filename": "Projects/Garden.md", "result": "Veggie patch"}],
+        )
+
+    def test_matches_names_and_aliases(self, obsidian_client, base_url, mock_responses):
+        self._add_vault(mock_responses, base_url)
+        assert obsidian_client.resolve_note("gardn")[0]["path"] == "Projects/Garden.md"
+        assert obsidian_client.resolve_note("veggie") == [
+            {"path": "Projects/Garden.md", "score": 0.945, "matched": "Veggie patch"}
+        ]
+
+    def test_index_is_reused_and_follows_writes(
+        self, obsidian_client, base_url, mock_responses
+    ):
+        self._add_vault(mock_responses, base_url)
+        mock_responses.add(responses.PUT, f"{base_url}/vault/Projects/Gardening.md", status=204)
+        obsidian_client.resolve_note("garden")
+        obsidian_client.resolve_note("inbox")
+        assert len(mock_responses.calls) == 3
+
+        obsidian_client.put_content("Projects/Gardening.md", "")
+        paths = [m["path"] for m in obsidian_client.resolve_note("garden")]
+        assert paths == ["Projects/Garden.md", "Projects/Gardening.md"]
+        assert len(mock_responses.calls) == 4
+
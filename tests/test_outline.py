@@ -0,0 +1,54 @@
+from mcp_obsidian.outline import HeadingIndex
+
+
+class TestHeadingIndex:
+    """Tests for the one-pass heading index."""
+
+    HEADINGS = [
+        (1, "Title", 0),
+        (2, "Section A", 2),
+        (3, "Details", 4),
+        (4, "Deep", 6),
+        (2, "Section B", 8),
+        (3, "Details", 10),
+        (4, "Deep", 12),
+    ]
+
+    def test_parents_and_closers(self):
+        index = HeadingIndex(self.HEADINGS, line_count=14)
+        assert index.parents == [None, 0, 1, 2, 0, 4, 5]
+        assert index.closers == [None, 4, 4, 4, None, None, None]
+        assert index.section_end(1) == 8
+        assert index.section_end(4) == 14
+
+    def test_find_simple(self):
+        index = HeadingIndex(self.HEADINGS)
+        assert index.find("Section B") == 4
+        assert index.find("Missing") is None
+
+    def test_find_honors_every_segment(self):
+        index = HeadingIndex(self.HEADINGS)
+        assert index.find("Section A::Details::Deep") == 3
+        assert index.find("Section B::Details::Deep") == 6
+        assert index.find("Section B::Section A::Deep") is None
+
+    def test_find_allows_skipped_levels(self):
+        index = HeadingIndex(self.HEADINGS)
+        assert index.find("Section B::Deep") == 6
+        assert index.find("Title::Section B::Deep") == 6
+
+    def test_find_nested_under_later_parent(self):
+        headings = [(2, "Log", 0), (2, "Log", 2), (3, "Done", 3)]
+        index = HeadingIndex(headings)
+        assert index.find("Log::Done") == 2
+
+    def test_insertion_point_after_previous_section(self):
+        template = HeadingIndex([(2, "A", 0), (2, "B", 2), (2, "C", 4)])
+        current = HeadingIndex([(2, "A", 0), (3, "A1", 2), (2, "Other", 5)])
+        # C is not in the note, so B goes at the end of A's section
+        assert current.insertion_point(template, "B", 2) == 5
+
+    def test_insertion_point_previous_section_is_last(self):
+        template = HeadingIndex([(2, "A", 0), (2, "B", 2)])
+        current = HeadingIndex([(2, "A", 0)])
+        assert current.insertion_point(template, "B", 2) is None
@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from mcp_obsidian import output
+from mcp_obsidian.output import format_output
+
+
+class TestFormatOutput:
+    """Tests for tool result serialization."""
+
+    DATA = {"files": ["Notes/café.md", "b.md"], "count": 2}
+
+    def test_pretty_is_the_historical_format(self):
+        assert format_output(self.DATA, "pretty") == json.dumps(
+            self.DATA, indent=2, ensure_ascii=False
+        )
+
+    def test_compact_has_no_whitespace(self):
+        text = format_output(self.DATA, "compact")
+        assert text == '{"files":["Notes/café.md","b.md"],"count":2}'
+
+    def test_compact_without_orjson(self, monkeypatch):
+        monkeypatch.setattr(output, "orjson", None)
+        assert format_output(self.DATA, "compact") == (
+            '{"files":["Notes/café.md","b.md"],"count":2}'
+        )
+
+    def test_raw(self):
+        assert format_output("# Note\n", "raw") == "# Note\n"
+        assert format_output(["a.md", "b/"], "raw") == "a.md\nb/"
+        assert format_output({"a": 1}, "raw") == '{"a":1}'
+
+    def test_server_default(self, monkeypatch):
+        monkeypatch.setattr(output, "OUTPUT_FORMAT", "compact")
+        assert format_output([1, 2]) == "[1,2]"
+        assert format_output([1, 2], "pretty") == "[\n  1,\n  2\n]"
+
+    def test_invalid_format_raises_error(self):
+        with pytest.raises(RuntimeError, match="output_format"):
+            format_output([], "xml")
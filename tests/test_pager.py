@@ -0,0 +1,64 @@
+import pytest
+
+from mcp_obsidian.pager import ResultStore, paginate
+
+
+class TestPaginate:
+    """Tests for the response pager."""
+
+    ITEMS = [f"note-{i}.md" for i in range(10)]
+
+    def _fetch(self):
+        self.fetches += 1
+        return list(self.ITEMS)
+
+    def setup_method(self):
+        self.fetches = 0
+        self.store = ResultStore()
+
+    def test_unbudgeted_result_is_unchanged(self):
+        assert paginate("tool", {}, self._fetch, self.store) == self.ITEMS
+        assert len(self.store) == 0
+
+    def test_pages_follow_cursor_without_refetch(self):
+        page = paginate("tool", {"max_items": 4}, self._fetch, self.store)
+        assert page["results"] == self.ITEMS[:4]
+        assert page["total"] == 10
+
+        seen = page["results"]
+        while page["next_cursor"]:
+            page = paginate("tool", {"cursor": page["next_cursor"]}, self._fetch, self.store)
+            seen += page["results"]
+        assert seen == self.ITEMS
+        assert self.fetches == 1
+
+    def test_byte_budget_returns_at_least_one_item(self):
+        # Each item is 13 compact bytes plus a separator
+        page = paginate("tool", {"max_bytes": 30}, self._fetch, self.store)
+        assert page["results"] == self.ITEMS[:2]
+        page = paginate("tool", {"max_bytes": 1}, self._fetch, self.store)
+        assert page["results"] == self.ITEMS[:1]
+
+    def test_result_that_fits_has_no_cursor(self):
+        page = paginate("tool", {"max_items": 50}, self._fetch, self.store)
+        assert page["next_cursor"] is None
+        assert len(self.store) == 0
+
+    def test_cursor_is_bound_to_tool_and_expires(self):
+        cursor = paginate("tool", {"max_items": 4}, self._fetch, self.store)["next_cursor"]
+        with pytest.raises(RuntimeError, match="cursor"):
+            paginate("other_tool", {"cursor": cursor}, self._fetch, self.store)
+
+        self.store.ttl = 0
+        with pytest.raises(RuntimeError, match="expired cursor"):
+            paginate("tool", {"cursor": cursor}, self._fetch, self.store)
+
+    def test_store_is_bounded(self):
+        self.store.max_entries = 2
+        for _ in range(3):
+            paginate("tool", {"max_items": 1}, self._fetch, self.store)
+        assert len(self.store) == 2
+
+    def test_invalid_budget_raises_error(self):
+        with pytest.raises(RuntimeError, match="max_items"):
+            paginate("tool", {"max_items": 0}, self._fetch, self.store)
@@ -0,0 +1,64 @@
+import pstats
+import time
+
+from mcp_obsidian.profiler import ToolProfiler
+
+
+def busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestToolProfiler:
+    """Tests for per-call tool profiling."""
+
+    def test_unarmed_calls_are_not_profiled(self, tmp_path):
+        profiler = ToolProfiler(str(tmp_path))
+        with profiler.profile("obsidian_simple_search"):
+            busy(0.01)
+
+        assert list(tmp_path.iterdir()) == []
+        assert profiler.stats()["profiled"] == 0
+
+    def test_armed_calls_write_dump_and_collapsed_stacks(self, tmp_path):
+        profiler = ToolProfiler(str(tmp_path), interval=0.001)
+        profiler.arm("obsidian_simple_search", 2)
+
+        for _ in range(3):
+            with profiler.profile("obsidian_simple_search"):
+                busy(0.05)
+
+        stats = profiler.stats()
+        assert stats["profiled"] == 2
+        assert stats["armed"] == {}
+        assert len(list(tmp_path.glob("*-obsidian_simple_search-*ms.prof"))) == 2
+        collapsed = next(tmp_path.glob("*.collapsed")).read_text()
+        stack, count = collapsed.splitlines()[0].rsplit(" ", 1)
+        assert "busy (test_profiler.py:" in stack
+        assert int(count) > 0
+        functions = pstats.Stats(str(next(tmp_path.glob("*.prof")))).stats
+        assert any(name == "busy" for _, _, name in functions)
+
+    def test_slow_threshold(self, tmp_path):
+        profiler = ToolProfiler(str(tmp_path), slow_ms=30, interval=0.001)
+        with profiler.profile("obsidian_get_file_contents"):
+            pass
+        with profiler.profile("obsidian_get_file_contents"):
+            busy(0.05)
+
+        (written,) = tmp_path.iterdir()
+        assert written.suffix == ".collapsed"
+        assert "busy" in written.read_text()
+
+    def test_from_env(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("OBSIDIAN_PROFILE_DIR", str(tmp_path))
+        monkeypatch.setenv(
+            "OBSIDIAN_PROFILE_TOOL", "obsidian_simple_search:3, obsidian_get_outline"
+        )
+        monkeypatch.setenv("OBSIDIAN_PROFILE_SLOW_MS", "500")
+
+        stats = ToolProfiler.from_env().stats()
+        assert stats["directory"] == str(tmp_path)
+        assert stats["armed"] == {"obsidian_simple_search": 3, "obsidian_get_outline": 1}
+        assert stats["slow_ms"] == 500
@@ -0,0 +1,79 @@
+import responses
+
+from mcp_obsidian.query_cache import QueryCache, normalize_dql
+
+
+class TestQueryCache:
+    """Tests for the Dataview result cache."""
+
+    def test_normalize_dql(self):
+        assert normalize_dql("  TABLE  status\n FROM #Tag \n") == "TABLE status FROM #Tag"
+        # Whitespace inside string literals is part of the query
+        assert normalize_dql('LIST WHERE t = "a  b"') == 'LIST WHERE t = "a  b"'
+        assert normalize_dql("LIST  WHERE t = 'a\\'  b'") == "LIST WHERE t = 'a\\'  b'"
+
+    def test_hits_misses_and_ttl(self):
+        cache = QueryCache(ttl=60)
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return [len(calls)]
+
+        assert cache.get_or_fetch("LIST", fetch) == [1]
+        assert cache.get_or_fetch("LIST\n", fetch) == [1]
+        assert cache.get_or_fetch("LIST", fetch, use_cache=False) == [2]
+        assert cache.get_or_fetch("LIST", fetch) == [2]
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 1, 1)
+
+        cache.ttl = 0
+        assert cache.get_or_fetch("LIST", fetch) == [3]
+
+    def test_size_bound(self):
+        cache = QueryCache(max_entries=2)
+        for query in ("A", "B", "C"):
+            cache.get_or_fetch(query, lambda: query)
+        assert cache.stats()["entries"] == 2
+
+    def test_result_from_before_invalidation_is_not_stored(self):
+        cache = QueryCache()
+
+        def fetch_during_write():
+            cache.invalidate()
+            return ["stale"]
+
+        cache.get_or_fetch("LIST", fetch_during_write)
+        assert cache.get_or_fetch("LIST", lambda: ["fresh"]) == ["fresh"]
+
+
+class TestClientQueryCache:
+    """Tests for Dataview caching in the REST client."""
+
+    def test_repeat_queries_until_a_write(self, obsidian_client, base_url, mock_responses):
+        mock_responses.add(responses.POST, f"{base_url}/search/", json=[{"filename": "a.md"}])
+        mock_responses.add(responses.PUT, f"{base_url}/vault/a.md", status=204)
+
+        obsidian_client.dataview_query("LIST FROM #project")
+        obsidian_client.dataview_query("LIST  FROM #project")
+        assert len(mock_responses.calls) == 1
+
+        obsidian_client.put_content("a.md", "# A")
+        obsidian_client.dataview_query("LIST FROM #project")
+        obsidian_client.get_recent_changes(use_cache=False)
+        assert len(mock_responses.calls) == 4
+
+        stats = obsidian_client.diagnostics()["dataview_cache"]
+        assert (stats["hits"], stats["misses"]) == (1, 2)
+
+    def test_commands_invalidate_vault_caches(self, obsidian_client, base_url, mock_responses):
+        mock_responses.add(responses.POST, f"{base_url}/search/", json=[{"filename": "a.md"}])
+        mock_responses.add(responses.POST, f"{base_url}/commands/templater%3Ainsert/")
+        obsidian_client.vault_tree.store("", ["a.md"])
+
+        obsidian_client.dataview_query("LIST")
+        obsidian_client.execute_command("templater:insert")
+        obsidian_client.dataview_query("LIST")
+
+        assert len(mock_responses.calls) == 3
+        assert obsidian_client.vault_tree.listing("") is None
@@ -0,0 +1,149 @@
+import time
+
+import pytest
+import requests
+import responses
+
+from mcp_obsidian.obsidian import Obsidian
+from mcp_obsidian.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+from mcp_obsidian.timeouts import DeadlineExceeded, deadline_scope
+
+
+@pytest.fixture
+def client():
+    return Obsidian(
+        api_key="test-api-key",
+        host="127.0.0.1",
+        port=27124,
+        retry_policy=RetryPolicy(retries=2, backoff=0),
+        breaker=CircuitBreaker(threshold=3, reset_timeout=60),
+    )
+
+
+class TestRetries:
+    """Tests for retrying transient failures."""
+
+    def test_idempotent_read_recovers(self, client, base_url, mock_responses):
+        url = f"{base_url}/vault/note.md"
+        mock_responses.add(responses.GET, url, status=503)
+        mock_responses.add(responses.GET, url, body=requests.ConnectionError("reset"))
+        mock_responses.add(responses.GET, url, body="# Note")
+
+        assert client.get_file_contents("note.md") == "# Note"
+        assert client.retry_policy.stats() == {
+            "max_retries": 2,
+            "retries": 2,
+            "recovered": 1,
+            "exhausted": 0,
+        }
+
+    def test_retries_are_bounded(self, client, base_url, mock_responses):
+        mock_responses.add(responses.GET, f"{base_url}/vault/note.md", status=500)
+
+        with pytest.raises(Exception, match="HTTP 500|Error"):
+            client.get_file_contents("note.md")
+        assert len(mock_responses.calls) == 3
+        assert client.retry_policy.stats()["exhausted"] == 1
+
+    def test_client_errors_are_not_retried(self, client, base_url, mock_responses):
+        mock_responses.add(
+            responses.GET,
+            f"{base_url}/vault/missing.md",
+            status=404,
+            json={"errorCode": 40400, "message": "Not Found"},
+        )
+
+        with pytest.raises(Exception, match="40400"):
+            client.get_file_contents("missing.md")
+        assert len(mock_responses.calls) == 1
+
+    def test_appends_are_not_retried(self, client, base_url, mock_responses):
+        mock_responses.add(responses.POST, f"{base_url}/vault/note.md", status=503)
+
+        with pytest.raises(Exception):
+            client.append_content("note.md", "text")
+        assert len(mock_responses.calls) == 1
+
+    def test_retry_after_is_honoured(self):
+        response = requests.Response()
+        response.headers["Retry-After"] = "2"
+        error = requests.HTTPError(response=response)
+
+        assert RetryPolicy(backoff=0, max_backoff=4).delay(0, error) == 2
+        assert RetryPolicy(backoff=0, max_backoff=1).delay(0, error) == 1
+
+
+class TestCircuitBreaker:
+    """Tests for failing fast while the API is down."""
+
+    def test_opens_after_consecutive_failures(self, client, base_url, mock_responses):
+        client.retry_policy.retries = 0
+        mock_responses.add(responses.GET, f"{base_url}/vault/note.md", status=503)
+
+        for _ in range(3):
+            with pytest.raises(Exception, match="HTTP 503|Error"):
+                client.get_file_contents("note.md")
+        with pytest.raises(CircuitOpenError):
+            client.get_file_contents("note.md")
+
+        assert len(mock_responses.calls) == 3
+        assert client.diagnostics()["circuit_breaker"] == {
+            "state": "open",
+            "consecutive_failures": 3,
+            "times_opened": 1,
+            "rejected_calls": 1,
+        }
+
+    def test_probe_closes_or_reopens(self):
+        breaker = CircuitBreaker(threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        assert breaker.state == breaker.OPEN
+
+        breaker.before_call()
+        assert breaker.state == breaker.HALF_OPEN
+        # Only one probe at a time
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        breaker.record_failure()
+        assert breaker.state == breaker.OPEN
+        breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == breaker.CLOSED
+        assert breaker.stats()["times_opened"] == 2
+
+    def test_probe_cut_short_by_deadline_is_released(
+        self, client, base_url, mock_responses
+    ):
+        client.breaker = CircuitBreaker(threshold=1, reset_timeout=0)
+        client.breaker.record_failure()
+
+        def slow_timeout(request):
+            time.sleep(0.06)
+            raise requests.Timeout("read timed out")
+
+        mock_responses.add_callback(
+            responses.GET, f"{base_url}/vault/note.md", callback=slow_timeout
+        )
+        with deadline_scope(0.05):
+            with pytest.raises(DeadlineExceeded):
+                client.get_file_contents("note.md")
+        assert client.breaker.state == client.breaker.HALF_OPEN
+
+        # The next call probes instead of failing fast forever
+        mock_responses.replace(
+            responses.GET, f"{base_url}/vault/note.md", body="# Note", status=200
+        )
+        assert client.get_file_contents("note.md") == "# Note"
+        assert client.breaker.state == client.breaker.CLOSED
+
+    def test_release_probe_keeps_verdicts(self):
+        breaker = CircuitBreaker(threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        assert breaker.before_call() is True
+        breaker.release_probe()
+        assert breaker.before_call() is True
+
+        breaker.record_failure()
+        breaker.release_probe()
+        assert breaker.state == breaker.OPEN
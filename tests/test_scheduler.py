@@ -0,0 +1,122 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import responses
+
+from mcp_obsidian.resilience import CircuitBreaker
+from mcp_obsidian.scheduler import BULK, INTERACTIVE, Lane, Scheduler
+from mcp_obsidian.timeouts import DeadlineExceeded, deadline_scope
+
+
+def _wait_until(condition):
+    for _ in range(500):
+        if condition():
+            return
+        time.sleep(0.005)
+
+
+class TestLane:
+    """Tests for per-lane admission control."""
+
+    def test_concurrency_limit(self):
+        lane = Lane("heavy", concurrency=2)
+        running, peak = [0], [0]
+        lock = threading.Lock()
+
+        def request():
+            lane.acquire()
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            lane.release()
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            for _ in range(6):
+                pool.submit(request)
+
+        assert peak[0] == 2
+        assert lane.stats()["admitted"] == 6
+
+    def test_interactive_requests_jump_the_bulk_queue(self):
+        lane = Lane("cheap", concurrency=1)
+        lane.acquire()
+        order = []
+
+        def request(level, name):
+            lane.acquire(level)
+            order.append(name)
+            lane.release()
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            pool.submit(request, BULK, "bulk-1")
+            pool.submit(request, BULK, "bulk-2")
+            _wait_until(lambda: lane.stats()["queued"]["bulk"] == 2)
+            pool.submit(request, INTERACTIVE, "interactive")
+            _wait_until(lambda: lane.stats()["queued"]["interactive"] == 1)
+            assert lane.stats()["queued"] == {"interactive": 1, "bulk": 2}
+            lane.release()
+
+        assert order == ["interactive", "bulk-1", "bulk-2"]
+        assert lane.stats()["max_queued"] == 3
+
+    def test_token_bucket_rate(self):
+        lane = Lane("heavy", concurrency=4, rate=20, burst=1)
+        started = time.monotonic()
+        for _ in range(4):
+            lane.acquire()
+            lane.release()
+        # One token up front, then one every 50ms
+        assert time.monotonic() - started >= 0.14
+
+    def test_queue_wait_respects_deadline(self):
+        lane = Lane("heavy", concurrency=1)
+        lane.acquire()
+
+        with pytest.raises(DeadlineExceeded):
+            lane.acquire(timeout=0.02)
+
+        stats = lane.stats()
+        assert stats["rejected"] == 1
+        assert stats["queued"] == {"interactive": 0, "bulk": 0}
+        lane.release()
+        lane.acquire(timeout=0.02)
+
+
+class TestClientScheduling:
+    """Tests for scheduling in the REST client."""
+
+    def test_requests_use_the_endpoint_lane(self, obsidian_client, base_url, mock_responses):
+        obsidian_client.scheduler = Scheduler(heavy_rate=0)
+        mock_responses.add(responses.POST, f"{base_url}/search/", json=[])
+        mock_responses.add(responses.GET, f"{base_url}/vault/a.md", body="a")
+
+        obsidian_client.dataview_query("LIST")
+        obsidian_client.get_file_contents("a.md")
+
+        scheduler = obsidian_client.diagnostics()["scheduler"]
+        assert scheduler["heavy"]["admitted"] == 1
+        assert scheduler["cheap"]["admitted"] == 1
+        assert scheduler["heavy"]["active"] == 0
+
+    def test_probe_expiring_in_queue_is_released(
+        self, obsidian_client, base_url, mock_responses
+    ):
+        obsidian_client.scheduler = Scheduler(cheap_concurrency=1)
+        obsidian_client.breaker = CircuitBreaker(threshold=1, reset_timeout=0)
+        obsidian_client.breaker.record_failure()
+        mock_responses.add(responses.GET, f"{base_url}/vault/a.md", body="a")
+
+        # The probe never gets a slot before its deadline
+        obsidian_client.scheduler.cheap.acquire()
+        with deadline_scope(0.02):
+            with pytest.raises(DeadlineExceeded):
+                obsidian_client.get_file_contents("a.md")
+        obsidian_client.scheduler.cheap.release()
+
+        assert obsidian_client.get_file_contents("a.md") == "a"
+        assert obsidian_client.breaker.state == "closed"
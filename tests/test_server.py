@@ -0,0 +1,204 @@
+import asyncio
+import json
+import socket
+import threading
+import time
+
+import httpx
+import pytest
+import responses
+import uvicorn
+from mcp import ClientSession
+from mcp.client.streamable_http import streamable_http_client
+
+from mcp_obsidian import server, tools
+from mcp_obsidian.vaults import load_vaults
+
+
+@pytest.fixture
+def http_url():
+    """URL of the server's Streamable HTTP endpoint, served from a thread."""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    app = server.create_http_app(token="secret")
+    http = uvicorn.Server(uvicorn.Config(app, log_level="warning"))
+    thread = threading.Thread(target=http.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    while not http.started:
+        time.sleep(0.01)
+    yield f"http://127.0.0.1:{port}/mcp"
+    http.should_exit = True
+    thread.join(5)
+    sock.close()
+
+
+class TestToolCatalog:
+    """Tests for tool registration and the cached tool catalog."""
+
+    def test_catalog_built_once(self, monkeypatch):
+        handler = tools.ListFilesInVaultToolHandler()
+        calls = []
+        build = handler.get_tool_description
+        monkeypatch.setattr(handler, "get_tool_description", lambda: calls.append(1) or build())
+        monkeypatch.setattr(server, "tool_handlers", {})
+        monkeypatch.setattr(server, "tool_catalog", {})
+
+        server.add_tool_handler(handler)
+        first = asyncio.run(server.list_tools())
+        second = asyncio.run(server.list_tools())
+
+        assert [tool.name for tool in first] == ["obsidian_list_files_in_vault"]
+        assert first[0] is second[0]
+        assert len(calls) == 1
+
+    def test_catalog_matches_handlers(self):
+        listed = asyncio.run(server.list_tools())
+        assert [tool.name for tool in listed] == list(server.tool_handlers)
+
+    def test_allowlist(self, monkeypatch):
+        monkeypatch.setattr(server, "enabled_tools", {"obsidian_get_file_contents"})
+        monkeypatch.setattr(server, "tool_handlers", {})
+        monkeypatch.setattr(server, "tool_catalog", {})
+
+        server.add_tool_handler(tools.GetFileContentsToolHandler())
+        server.add_tool_handler(tools.DeleteFileToolHandler())
+
+        assert list(server.tool_catalog) == ["obsidian_get_file_contents"]
+        assert server.get_tool_handler("obsidian_delete_file") is None
+
+
+class TestStreamableHTTP:
+    """Tests for serving several clients from one process over HTTP."""
+
+    def test_sessions_share_one_client(self, http_url):
+        async def session_diagnostics():
+            http = httpx.AsyncClient(headers={"Authorization": "Bearer secret"})
+            async with http, streamable_http_client(http_url, http_client=http) as streams:
+                async with ClientSession(streams[0], streams[1]) as session:
+                    await session.initialize()
+                    result = await session.call_tool(
+                        "obsidian_get_diagnostics", {"output_format": "compact"}
+                    )
+                    return json.loads(result.content[0].text)
+
+        async def both():
+            return await asyncio.gather(session_diagnostics(), session_diagnostics())
+
+        first, second = asyncio.run(both())
+        assert first["circuit_breaker"]["state"] == "closed"
+        assert second["circuit_breaker"]["state"] == "closed"
+        assert tools._client is not None
+
+    def test_requires_token(self, http_url):
+        response = httpx.post(http_url, json={}, headers={"Accept": "application/json"})
+        assert response.status_code == 401
+
+    def test_non_loopback_host_requires_token(self):
+        with pytest.raises(ValueError, match="OBSIDIAN_HTTP_TOKEN"):
+            server.create_http_app("0.0.0.0", token="")
+        server.create_http_app("0.0.0.0", token="secret")
+        server.create_http_app("127.0.0.1", token="")
+
+    def test_session_limiter(self, monkeypatch):
+        class Context:
+            def __init__(self, session):
+                self.session = session
+
+        class Session:
+            pass
+
+        monkeypatch.setattr(server, "session_concurrency", 2)
+        one, two = Session(), Session()
+        limiters = []
+        for session in (one, one, two):
+            monkeypatch.setattr(type(server.app), "request_context", Context(session))
+            limiters.append(server._session_limiter())
+
+        assert limiters[0] is limiters[1]
+        assert limiters[0] is not limiters[2]
+        assert limiters[0].total_tokens == 2
+
+
+class TestVaults:
+    """Tests for the vault argument and cross-vault fan-out."""
+
+    @pytest.fixture(autouse=True)
+    def registry(self, monkeypatch):
+        vaults = load_vaults(
+            {
+                "OBSIDIAN_VAULTS": "personal,team",
+                "OBSIDIAN_API_KEY": "key",
+                "OBSIDIAN_VAULT_TEAM_PORT": "27125",
+            }
+        )
+        monkeypatch.setattr(tools, "vaults", vaults)
+        monkeypatch.setattr(tools, "default_vault", "personal")
+
+    def test_vault_argument_in_schema(self):
+        search = server._with_vault_argument(
+            tools.SearchToolHandler().get_tool_description(), fan_out=True
+        )
+        delete = server._with_vault_argument(
+            tools.DeleteFileToolHandler().get_tool_description(), fan_out=False
+        )
+
+        assert search.inputSchema["properties"]["vault"]["enum"] == ["personal", "team", "*"]
+        assert delete.inputSchema["properties"]["vault"]["enum"] == ["personal", "team"]
+        assert "query" in search.inputSchema["properties"]
+
+    def test_fan_out_search(self, mock_responses):
+        for port, filename in ((27124, "mine.md"), (27125, "ours.md")):
+            mock_responses.add(
+                responses.POST,
+                f"https://127.0.0.1:{port}/search/simple/",
+                json=[{"filename": filename, "score": 1, "matches": []}],
+            )
+
+        result = asyncio.run(server._fan_out(tools.SearchToolHandler(), {"query": "q"}))
+
+        personal, team = (content.text for content in result)
+        assert personal.startswith("Vault: personal\n") and "mine.md" in personal
+        assert team.startswith("Vault: team\n") and "ours.md" in team
+
+    def test_fan_out_reports_failing_vault(self, mock_responses):
+        mock_responses.add(
+            responses.POST,
+            "https://127.0.0.1:27124/search/simple/",
+            json=[{"filename": "mine.md", "score": 1, "matches": []}],
+        )
+        mock_responses.add(
+            responses.POST,
+            "https://127.0.0.1:27125/search/simple/",
+            json={"errorCode": 40101, "message": "Unauthorized"},
+            status=401,
+        )
+
+        result = asyncio.run(server._fan_out(tools.SearchToolHandler(), {"query": "q"}))
+
+        assert "mine.md" in result[0].text
+        assert result[1].text == "Vault: team\nError: Error 40101: Unauthorized"
+
+    def test_cursors_are_scoped_to_their_vault(self, monkeypatch, mock_responses):
+        monkeypatch.setattr(server, "session_concurrency", 0)
+        for port, prefix in ((27124, "mine"), (27125, "ours")):
+            mock_responses.add(
+                responses.POST,
+                f"https://127.0.0.1:{port}/search/simple/",
+                json=[
+                    {"filename": f"{prefix}-{i}.md", "score": 1, "matches": []}
+                    for i in range(2)
+                ],
+            )
+        search = tools.SearchToolHandler()
+        args = {"query": "q", "output_format": "compact"}
+
+        pages = asyncio.run(server._run_in_thread(search, args | {"max_items": 1}, "*"))
+        cursor = json.loads(pages[0].text.split("\n", 1)[1])["next_cursor"]
+
+        page = asyncio.run(server._run_in_thread(search, args | {"cursor": cursor}, "personal"))
+        assert json.loads(page[0].text)["results"][0]["filename"] == "mine-1.md"
+        with pytest.raises(RuntimeError, match="Unknown or expired cursor"):
+            asyncio.run(server._run_in_thread(search, args | {"cursor": cursor}, "team"))
+        with pytest.raises(ValueError, match="cursor cannot be combined"):
+            asyncio.run(server._run_in_thread(search, args | {"cursor": cursor}, "*"))
@@ -0,0 +1,143 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import responses
+
+from mcp_obsidian.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests for read coalescing and write barriers."""
+
+    def _blocked_call(self, result="value"):
+        """Return a call that blocks until ``release`` is set."""
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return result
+
+        return fn, started, release, calls
+
+    def _wait_for_waiters(self, flights: SingleFlight, count: int):
+        for _ in range(500):
+            if flights.stats()["coalesced"] >= count:
+                return
+            threading.Event().wait(0.01)
+
+    def test_concurrent_identical_reads_share_one_call(self):
+        flights = SingleFlight()
+        fn, started, release, calls = self._blocked_call()
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            leader = pool.submit(flights.do, "key", fn, "a.md")
+            started.wait(5)
+            followers = [pool.submit(flights.do, "key", fn, "a.md") for _ in range(3)]
+            self._wait_for_waiters(flights, 3)
+            release.set()
+            results = [leader.result()] + [f.result() for f in followers]
+
+        assert results == ["value"] * 4
+        assert len(calls) == 1
+        assert flights.stats() == {"requests": 1, "coalesced": 3}
+
+    def test_errors_are_shared(self):
+        flights = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+
+        def fail():
+            started.set()
+            release.wait(5)
+            raise ValueError("boom")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(flights.do, "key", fail)
+            started.wait(5)
+            follower = pool.submit(flights.do, "key", fail)
+            self._wait_for_waiters(flights, 1)
+            release.set()
+            for future in (leader, follower):
+                with pytest.raises(ValueError):
+                    future.result()
+
+    def test_sequential_reads_are_not_cached(self):
+        flights = SingleFlight()
+        assert flights.do("key", lambda: 1) == 1
+        assert flights.do("key", lambda: 2) == 2
+
+    def test_write_detaches_in_flight_read(self):
+        flights = SingleFlight()
+        fn, started, release, calls = self._blocked_call("stale")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            stale = pool.submit(flights.do, "key", fn, "a.md")
+            started.wait(5)
+            with flights.write("a.md"):
+                pass
+            # Started after the write, so it must not share the stale read
+            assert flights.do("key", lambda: "fresh", "a.md") == "fresh"
+            release.set()
+            assert stale.result() == "stale"
+
+    def test_read_waits_for_write_to_same_path(self):
+        flights = SingleFlight()
+        order = []
+        writing = threading.Event()
+        finish = threading.Event()
+
+        def write():
+            with flights.write("a.md"):
+                writing.set()
+                finish.wait(5)
+                order.append("write")
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            writer = pool.submit(write)
+            writing.wait(5)
+            other = pool.submit(flights.do, "other", lambda: order.append("other"), "b.md")
+            other.result()
+            reader = pool.submit(flights.do, "key", lambda: order.append("read"), "a.md")
+            threading.Event().wait(0.05)
+            assert order == ["other"]
+            finish.set()
+            writer.result()
+            reader.result()
+
+        assert order == ["other", "write", "read"]
+
+
+class TestClientCoalescing:
+    """Tests for request coalescing in the REST client."""
+
+    def test_parallel_get_file_contents_share_a_request(
+        self, obsidian_client, base_url, mock_responses
+    ):
+        started, release = threading.Event(), threading.Event()
+
+        def slow_read(request):
+            started.set()
+            release.wait(5)
+            return (200, {}, "# Note")
+
+        mock_responses.add_callback(
+            responses.GET, f"{base_url}/vault/note.md", callback=slow_read
+        )
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(obsidian_client.get_file_contents, "note.md")]
+            started.wait(5)
+            futures += [
+                pool.submit(obsidian_client.get_file_contents, "note.md") for _ in range(3)
+            ]
+            for _ in range(500):
+                if obsidian_client._flights.stats()["coalesced"] == 3:
+                    break
+                threading.Event().wait(0.01)
+            release.set()
+            assert [f.result() for f in futures] == ["# Note"] * 4
+
+        assert len(mock_responses.calls) == 1
@@ -0,0 +1,97 @@
+import json
+
+import pytest
+import responses
+
+from mcp_obsidian.spans import Tracer, span, traceparent
+
+
+def names(tree: dict) -> list[str]:
+    return [tree["name"]] + [name for child in tree.get("children", []) for name in names(child)]
+
+
+class TestSpans:
+    """Tests for tool-call timing spans."""
+
+    def test_no_op_outside_a_trace(self):
+        with span("anything") as current:
+            assert current is None
+        assert traceparent() is None
+
+    def test_nested_spans_and_errors(self):
+        tracer = Tracer(buffer=2)
+        with tracer.trace("tools/call demo"):
+            with span("outer", size=3):
+                with span("inner"):
+                    pass
+            with pytest.raises(ValueError):
+                with span("failing"):
+                    raise ValueError("boom")
+
+        (recent,) = tracer.recent()
+        (root,) = recent["spans"]
+        assert root["name"] == "tools/call demo"
+        outer, failing = root["children"]
+        assert outer["attributes"] == {"size": 3}
+        assert outer["children"][0]["name"] == "inner"
+        assert failing["error"] == "ValueError: boom"
+
+    def test_ring_buffer_keeps_latest(self):
+        tracer = Tracer(buffer=2)
+        for i in range(3):
+            with tracer.trace(f"call {i}"):
+                pass
+        assert [t["spans"][0]["name"] for t in tracer.recent(5)] == ["call 2", "call 1"]
+
+    def test_joins_incoming_trace(self):
+        tracer = Tracer()
+        incoming = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+        with tracer.trace("tools/call demo", incoming) as root:
+            assert traceparent().startswith("00-0af7651916cd43dd8448eb211c80319c-")
+        assert root.parent_id == "b7ad6b7169203331"
+
+    def test_http_requests_are_split_into_phases(self, obsidian_client, mock_responses, base_url):
+        mock_responses.add(responses.GET, f"{base_url}/vault/note.md", body="# Note\n")
+        tracer = Tracer()
+        with tracer.trace("tools/call obsidian_get_file_contents"):
+            obsidian_client.get_file_contents("note.md")
+
+        (root,) = tracer.recent(1)[0]["spans"]
+        assert names(root) == [
+            "tools/call obsidian_get_file_contents",
+            "Obsidian.get_file_contents",
+            "HTTP GET",
+            "wait",
+            "download",
+            "parse",
+            "Outline.from_content",
+        ]
+        http = root["children"][0]["children"][0]
+        assert http["attributes"]["http.response.status_code"] == 200
+        assert http["attributes"]["url.path"] == "/vault/note.md"
+        assert mock_responses.calls[0].request.headers["traceparent"].startswith("00-")
+
+    def test_otlp_file_export(self, tmp_path):
+        path = tmp_path / "spans.jsonl"
+        tracer = Tracer(path=str(path))
+        with tracer.trace("tools/call demo", **{"mcp.tool.name": "demo"}):
+            with span("child"):
+                pass
+        tracer.close()
+
+        (line,) = path.read_text().splitlines()
+        spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        child, root = spans
+        assert root["kind"] == 2
+        assert root["attributes"] == [{"key": "mcp.tool.name", "value": {"stringValue": "demo"}}]
+        assert child["parentSpanId"] == root["spanId"]
+        assert child["traceId"] == root["traceId"]
+        assert int(child["endTimeUnixNano"]) >= int(child["startTimeUnixNano"])
+
+    def test_from_env(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("OBSIDIAN_SPANS", raising=False)
+        monkeypatch.delenv("OBSIDIAN_SPANS_FILE", raising=False)
+        assert Tracer.from_env() is None
+
+        monkeypatch.setenv("OBSIDIAN_SPANS", "10")
+        assert Tracer.from_env().traces.maxlen == 10
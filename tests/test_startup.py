@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from mcp_obsidian import tools
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+def loaded_after(statement: str, env: dict | None = None) -> set[str]:
+    """Modules loaded by a fresh interpreter after running ``statement``."""
+    result = subprocess.run(
+        [sys.executable, "-c", f"import sys; {statement}; print('\\n'.join(sys.modules))"],
+        env=(env or os.environ) | {"PYTHONPATH": SRC},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+class TestStartup:
+    """Tests that startup defers heavy imports until first use."""
+
+    def test_package_import_is_light(self):
+        modules = loaded_after("import mcp_obsidian", {"PATH": os.environ.get("PATH", "")})
+        assert "mcp" not in modules
+        assert "mcp_obsidian.server" not in modules
+
+    def test_server_defers_http_stack(self):
+        modules = loaded_after("import mcp_obsidian.server")
+        assert "mcp_obsidian.server" in modules
+        assert "requests" not in modules
+        assert "mcp_obsidian.obsidian" not in modules
+
+    def test_client_requires_api_key(self, monkeypatch):
+        monkeypatch.setattr(tools, "api_key", "")
+        with pytest.raises(ValueError, match="OBSIDIAN_API_KEY"):
+            tools.get_client()
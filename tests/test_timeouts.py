@@ -0,0 +1,143 @@
+import json
+import time
+
+import pytest
+import requests
+import responses
+
+from mcp_obsidian.obsidian import Obsidian
+from mcp_obsidian.resilience import RetryPolicy
+from mcp_obsidian.timeouts import (
+    DeadlineExceeded,
+    TimeoutPolicy,
+    deadline_scope,
+    remaining,
+)
+
+
+class TestTimeoutPolicy:
+    """Tests for per-endpoint and adaptive timeouts."""
+
+    def test_static_per_endpoint(self):
+        policy = TimeoutPolicy(timeouts={"query": 90}, connect=2)
+        assert policy.timeout_for("query") == (2, 90)
+        assert policy.timeout_for("read") == (2, 6)
+
+    def test_env_override(self, monkeypatch):
+        monkeypatch.setenv("OBSIDIAN_TIMEOUT_SEARCH", "45")
+        assert TimeoutPolicy().read_timeout("search") == 45
+
+    def test_adaptive_uses_p99_within_bounds(self):
+        policy = TimeoutPolicy(adaptive=True, min_samples=5, floor=0.5)
+        for _ in range(4):
+            policy.record("read", 0.3)
+        # Not enough samples yet
+        assert policy.read_timeout("read") == 6
+        policy.record("read", 0.4)
+        assert policy.read_timeout("read") == pytest.approx(1.2)
+
+        for _ in range(5):
+            policy.record("list", 0.01)
+        assert policy.read_timeout("list") == 0.5
+        for _ in range(5):
+            policy.record("query", 50)
+        assert policy.read_timeout("query") == 30
+
+    def test_deadline_clamps_and_expires(self):
+        policy = TimeoutPolicy()
+        with deadline_scope(2):
+            connect, read = policy.timeout_for("query")
+            assert read <= 2 and connect <= 2
+            with deadline_scope(60):
+                # Nested scopes cannot extend the deadline
+                assert remaining() <= 2
+        assert remaining() is None
+
+        with deadline_scope(0.001):
+            time.sleep(0.002)
+            with pytest.raises(DeadlineExceeded):
+                policy.timeout_for("read")
+
+
+class TestClientTimeouts:
+    """Tests for timeouts and deadlines in the REST client."""
+
+    @pytest.fixture
+    def client(self):
+        return Obsidian(
+            api_key="test-api-key",
+            host="127.0.0.1",
+            port=27124,
+            retry_policy=RetryPolicy(retries=3, backoff=10, max_backoff=10),
+            timeouts=TimeoutPolicy(timeouts={"query": 120}),
+        )
+
+    def test_endpoint_timeout_is_sent(self, client, base_url, mock_responses):
+        mock_responses.add(responses.POST, f"{base_url}/search/", json=[])
+
+        client.dataview_query("LIST")
+
+        assert mock_responses.calls[0].request.req_kwargs["timeout"] == (3, 120)
+        assert client.diagnostics()["timeouts"]["latency"]["query"]["samples"] == 1
+
+    def test_no_retry_past_deadline(self, client, base_url, mock_responses):
+        mock_responses.add(
+            responses.GET,
+            f"{base_url}/vault/note.md",
+            status=503,
+            headers={"Retry-After": "5"},
+        )
+
+        with deadline_scope(1):
+            with pytest.raises(Exception, match="HTTP 503|Error"):
+                client.get_file_contents("note.md")
+
+        # Waiting 5s for a retry would overrun the 1s deadline
+        assert len(mock_responses.calls) == 1
+        assert client.retry_policy.stats()["retries"] == 0
+
+    def test_timeout_at_deadline_does_not_trip_breaker(
+        self, client, base_url, mock_responses
+    ):
+        def slow_timeout(request):
+            time.sleep(0.06)
+            raise requests.Timeout("read timed out")
+
+        mock_responses.add_callback(
+            responses.GET, f"{base_url}/vault/note.md", callback=slow_timeout
+        )
+
+        with deadline_scope(0.05):
+            with pytest.raises(DeadlineExceeded):
+                client.get_file_contents("note.md")
+
+        assert client.breaker.stats()["consecutive_failures"] == 0
+        assert len(mock_responses.calls) == 1
+
+    def test_adaptive_timeout_retries_with_static_limit(
+        self, client, base_url, mock_responses
+    ):
+        client.timeouts = TimeoutPolicy(timeouts={"query": 30}, adaptive=True, min_samples=5)
+        for _ in range(25):
+            client.timeouts.record("query", 0.01)
+        assert client.timeouts.read_timeout("query") == 1.0
+
+        answers = iter([requests.ReadTimeout("read timed out"), [{"filename": "a.md"}]])
+
+        def slow_then_done(request):
+            answer = next(answers)
+            if isinstance(answer, Exception):
+                raise answer
+            return 200, {}, json.dumps(answer)
+
+        mock_responses.add_callback(
+            responses.POST, f"{base_url}/search/", callback=slow_then_done
+        )
+
+        assert client.dataview_query("LIST", use_cache=False) == [{"filename": "a.md"}]
+
+        timeouts = [c.request.req_kwargs["timeout"] for c in mock_responses.calls]
+        assert timeouts == [(3, 1.0), (3, 30)]
+        # Counted as a slow answer, not an outage, and the limit went up
+        assert client.breaker.stats()["consecutive_failures"] == 0
+        assert client.timeouts.read_timeout("query") >= 3.0
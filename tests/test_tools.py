@@ -1,8 +1,12 @@
+import json
+
 import pytest
 import responses
 from mcp.types import TextContent
 
 from mcp_obsidian import tools
+from mcp_obsidian.profiler import ToolProfiler
+from mcp_obsidian.spans import Tracer
 
 
 class TestToolHandlerBase:
@@ -62,6 +66,59 @@ class TestListFilesInDirToolHandler:
             handler.run_tool({})
 
 
+class TestListFilesRecursiveToolHandler:
+    """Tests for the recursive listing tool."""
+
+    def test_run_tool(self, mock_responses, base_url):
+        mock_responses.add(
+            responses.GET, f"{base_url}/vault/", json={"files": ["a.md", "sub/"]}
+        )
+        mock_responses.add(
+            responses.GET, f"{base_url}/vault/sub/", json={"files": ["b.md"]}
+        )
+
+        handler = tools.ListFilesRecursiveToolHandler()
+        result = handler.run_tool({"pattern": "*.md"})
+
+        assert "sub/b.md" in result[0].text
+
+    def test_output_format_override(self, mock_responses, base_url):
+        mock_responses.add(
+            responses.GET, f"{base_url}/vault/", json={"files": ["a.md", "b.md"]}
+        )
+
+        handler = tools.ListFilesRecursiveToolHandler()
+
+        assert handler.run_tool({"output_format": "raw"})[0].text == "a.md\nb.md"
+        assert handler.run_tool({"output_format": "compact"})[0].text == '["a.md","b.md"]'
+
+    def test_invalid_format_raises_error(self):
+        handler = tools.ListFilesRecursiveToolHandler()
+
+        with pytest.raises(RuntimeError, match="format"):
+            handler.run_tool({"format": "xml"})
+
+
+class TestResolveNoteToolHandler:
+    """Tests for the fuzzy note lookup tool."""
+
+    def test_run_tool(self, mock_responses, base_url):
+        mock_responses.add(
+            responses.GET, f"{base_url}/vault/", json={"files": ["Inbox.md"]}
+        )
+
+        handler = tools.ResolveNoteToolHandler()
+        result = handler.run_tool({"query": "inbx", "include_aliases": False})
+
+        assert '"path": "Inbox.md"' in result[0].text
+
+    def test_missing_query_raises_error(self):
+        handler = tools.ResolveNoteToolHandler()
+
+        with pytest.raises(RuntimeError, match="query"):
+            handler.run_tool({})
+
+
 class TestGetFileContentsToolHandler:
     """Tests for the get file contents tool."""
 
@@ -86,6 +143,49 @@ class TestGetFileContentsToolHandler:
             handler.run_tool({})
 
 
+class TestGetSectionToolHandler:
+    """Tests for the get section tool."""
+
+    def test_run_tool(self, mock_responses, base_url):
+        mock_responses.add(
+            responses.GET,
+            f"{base_url}/vault/note.md",
+            body="# Note\n\n## Todos\n- [ ] Task\n\n## Log\nLong log",
+            status=200,
+        )
+
+        handler = tools.GetSectionToolHandler()
+        result = handler.run_tool(
+            {"filepath": "note.md", "target_type": "heading", "target": "Todos"}
+        )
+
+        assert result[0].text == "## Todos\n- [ ] Task"
+
+    def test_missing_target_raises_error(self):
+        handler = tools.GetSectionToolHandler()
+
+        with pytest.raises(RuntimeError, match="target"):
+            handler.run_tool({"filepath": "note.md", "target_type": "block"})
+
+
+class TestGetOutlineToolHandler:
+    """Tests for the get outline tool."""
+
+    def test_run_tool(self, mock_responses, base_url):
+        mock_responses.add(
+            responses.GET,
+            f"{base_url}/vault/note.md",
+            body="# Note\n\n## Todos\n- [ ] Task",
+            status=200,
+        )
+
+        handler = tools.GetOutlineToolHandler()
+        result = handler.run_tool({"filepath": "note.md"})
+
+        assert '"text": "Todos"' in result[0].text
+        assert "Task" not in result[0].text
+
+
 class TestSearchToolHandler:
     """Tests for the simple search tool."""
 
@@ -110,6 +210,26 @@ class TestSearchToolHandler:
         assert "note.md" in result[0].text
         assert "test query here" in result[0].text
 
+    def test_paginated_results(self, mock_responses, base_url):
+        mock_responses.add(
+            responses.POST,
+            f"{base_url}/search/simple/",
+            json=[
+                {"filename": f"note{i}.md", "score": 1, "matches": []} for i in range(3)
+            ],
+        )
+
+        handler = tools.SearchToolHandler()
+        first = json.loads(handler.run_tool({"query": "q", "max_items": 2})[0].text)
+        second = json.loads(
+            handler.run_tool({"query": "q", "cursor": first["next_cursor"]})[0].text
+        )
+
+        assert [r["filename"] for r in first["results"]] == ["note0.md", "note1.md"]
+        assert [r["filename"] for r in second["results"]] == ["note2.md"]
+        assert second["next_cursor"] is None
+        assert len(mock_responses.calls) == 1
+
     def test_missing_query_raises_error(self):
         handler = tools.SearchToolHandler()
 
@@ -160,6 +280,63 @@ class TestPutContentToolHandler:
         assert "Successfully" in result[0].text
 
 
+class TestBatchPutContentToolHandler:
+    """Tests for the batch put content tool."""
+
+    def test_run_tool(self, mock_responses, base_url):
+        mock_responses.add(responses.PUT, f"{base_url}/vault/a.md", status=204)
+        mock_responses.add(responses.PUT, f"{base_url}/vault/b.md", status=204)
+
+        handler = tools.BatchPutContentToolHandler()
+        result = handler.run_tool(
+            {
+                "files": [
+                    {"filepath": "a.md", "content": "A"},
+                    {"filepath": "b.md", "content": "B"},
+                ]
+            }
+        )
+
+        assert '"written": 2' in result[0].text
+
+    def test_default_concurrency_from_env(self, monkeypatch):
+        seen = []
+
+        def put_many(files, max_workers, **kwargs):
+            seen.append(max_workers)
+            return []
+
+        monkeypatch.setattr(tools, "write_concurrency", 2)
+        monkeypatch.setattr(tools.get_client(), "put_many", put_many)
+        handler = tools.BatchPutContentToolHandler()
+        handler.run_tool({"files": [{"filepath": "a.md", "content": "A"}]})
+        assert seen == [2]
+
+        monkeypatch.setattr(tools, "write_concurrency", 32)
+        with pytest.raises(RuntimeError, match="max_concurrency: 32"):
+            handler.run_tool({"files": [{"filepath": "a.md", "content": "A"}]})
+
+    def test_missing_content_raises_error(self):
+        handler = tools.BatchPutContentToolHandler()
+
+        with pytest.raises(RuntimeError, match="content"):
+            handler.run_tool({"files": [{"filepath": "a.md"}]})
+
+    def test_duplicate_filepath_raises_error(self, mock_responses):
+        handler = tools.BatchPutContentToolHandler()
+
+        with pytest.raises(RuntimeError, match="duplicate filepath: a.md"):
+            handler.run_tool(
+                {
+                    "files": [
+                        {"filepath": "a.md", "content": "A"},
+                        {"filepath": "a.md", "content": "B"},
+                    ]
+                }
+            )
+        assert len(mock_responses.calls) == 0
+
+
 class TestDeleteFileToolHandler:
     """Tests for the delete file tool."""
 
@@ -480,3 +657,34 @@ class TestOpenFileToolHandler:
 
         with pytest.raises(RuntimeError, match="filename"):
             handler.run_tool({})
+
+
+class TestDiagnosticsToolHandler:
+    """Tests for the diagnostics tool."""
+
+    def test_run_tool(self):
+        handler = tools.DiagnosticsToolHandler()
+        result = json.loads(handler.run_tool({})[0].text)
+
+        assert result["circuit_breaker"]["state"] == "closed"
+        assert result["retries"]["retries"] == 0
+        assert "coalesced" in result["coalescing"]
+
+    def test_arms_profiler(self, tmp_path):
+        profiler = ToolProfiler(str(tmp_path))
+        handler = tools.DiagnosticsToolHandler(profiler)
+        result = json.loads(
+            handler.run_tool({"profile_tool": "obsidian_simple_search", "profile_calls": 2})[0].text
+        )
+
+        assert result["profiler"]["armed"] == {"obsidian_simple_search": 2}
+        assert result["profiler"]["directory"] == str(tmp_path)
+
+    def test_shows_recent_traces(self):
+        tracer = Tracer()
+        with tracer.trace("tools/call obsidian_get_outline"):
+            pass
+        handler = tools.DiagnosticsToolHandler(tracer=tracer)
+        result = json.loads(handler.run_tool({"traces": 1})[0].text)
+
+        assert result["traces"][0]["spans"][0]["name"] == "tools/call obsidian_get_outline"
@@ -0,0 +1,57 @@
+from mcp_obsidian.trace import TraceRecorder, read_trace, redact
+
+
+class TestRedact:
+    """Tests for trace argument redaction."""
+
+    def test_named_arguments_at_any_depth(self):
+        arguments = {
+            "filepath": "a.md",
+            "files": [{"filepath": "b.md", "content": "secret"}],
+            "content": "hello",
+            "limit": 5,
+        }
+        redacted = redact(arguments, frozenset({"content"}))
+        assert redacted["filepath"] == "a.md"
+        assert redacted["files"][0]["filepath"] == "b.md"
+        assert redacted["files"][0]["content"].startswith("<redacted:6:")
+        assert redacted["content"].startswith("<redacted:5:")
+        assert redacted["limit"] == 5
+
+    def test_everything(self):
+        redacted = redact({"filepath": "a.md", "confirm": True}, frozenset(), everything=True)
+        assert redacted["filepath"].startswith("<redacted:4:")
+        assert redacted["confirm"] is True
+
+
+class TestTraceRecorder:
+    """Tests for the tool-call trace recorder."""
+
+    def test_records_calls_in_order(self, tmp_path):
+        path = tmp_path / "trace.jsonl"
+        recorder = TraceRecorder(str(path), redacted="none")
+        recorder.record("obsidian_simple_search", {"query": "x"}, 200.0, 0.25, 42)
+        recorder.record("obsidian_get_file_contents", {"filepath": "a.md"}, 100.0, 0.01, 0, "boom")
+        recorder.close()
+
+        first, second = read_trace(str(path))
+        assert first["tool"] == "obsidian_get_file_contents"
+        assert first["error"] == "boom"
+        assert second == {
+            "ts": 200.0,
+            "tool": "obsidian_simple_search",
+            "arguments": {"query": "x"},
+            "duration_ms": 250.0,
+            "response_chars": 42,
+            "error": None,
+        }
+
+    def test_from_env(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("OBSIDIAN_TRACE_FILE", raising=False)
+        assert TraceRecorder.from_env() is None
+
+        monkeypatch.setenv("OBSIDIAN_TRACE_FILE", str(tmp_path / "t.jsonl"))
+        monkeypatch.setenv("OBSIDIAN_TRACE_REDACT", "content,query")
+        recorder = TraceRecorder.from_env()
+        assert recorder.names == {"content", "query"}
+        recorder.close()
@@ -0,0 +1,34 @@
+from datetime import date
+
+from benchmarks.mock_server import MockVault
+from benchmarks.vault_gen import generate, write_vault
+
+END = date(2024, 6, 30)
+
+
+class TestVaultGen:
+    """Tests for the synthetic vault generator."""
+
+    def test_deterministic_by_seed(self):
+        first = list(generate(notes=50, daily=3, daily_kb=2, seed=7, end=END))
+        assert first == list(generate(notes=50, daily=3, daily_kb=2, seed=7, end=END))
+        assert first != list(generate(notes=50, daily=3, daily_kb=2, seed=8, end=END))
+
+    def test_shape(self):
+        generated = generate(notes=200, depth=2, fanout=3, daily=5, daily_kb=8, end=END)
+        files = {path: content for path, content, _ in generated}
+        notes = [p for p in files if not p.startswith("Daily/")]
+        assert len(notes) == 200
+        assert max(p.count("/") for p in notes) == 2
+        assert "Daily/2024-06-30.md" in files
+        assert len(files["Daily/2024-06-26.md"]) >= 8 * 1024
+        assert all(files[p].startswith("---\nstatus:") for p in notes)
+        assert sum("[[" in files[p] for p in notes) > 150
+
+    def test_written_vault_loads_in_mock_server(self, tmp_path):
+        count = write_vault(str(tmp_path), notes=20, daily=2, daily_kb=1, end=END)
+        vault = MockVault.from_directory(str(tmp_path))
+        assert len(vault.notes) == count == 22
+        note = vault.note_json(next(p for p in vault.notes if not p.startswith("Daily/")))
+        assert note["frontmatter"]["status"] in ("todo", "active", "done", "someday")
+        assert note["tags"]
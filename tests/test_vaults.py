@@ -0,0 +1,75 @@
+import pytest
+
+from mcp_obsidian import tools
+from mcp_obsidian.vaults import Vault, load_vaults
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Two vaults, personal (default) and team, on different ports."""
+    vaults = load_vaults(
+        {
+            "OBSIDIAN_VAULTS": "personal, team",
+            "OBSIDIAN_API_KEY": "shared-key",
+            "OBSIDIAN_VAULT_TEAM_API_KEY": "team-key",
+            "OBSIDIAN_VAULT_TEAM_PORT": "27125",
+        }
+    )
+    monkeypatch.setattr(tools, "vaults", vaults)
+    monkeypatch.setattr(tools, "default_vault", "personal")
+    return vaults
+
+
+class TestLoadVaults:
+    """Tests for the vault registry configuration."""
+
+    def test_unset_means_single_vault(self):
+        assert load_vaults({"OBSIDIAN_API_KEY": "key"}) == {}
+
+    def test_settings_fall_back_to_server_wide(self):
+        vaults = load_vaults(
+            {
+                "OBSIDIAN_VAULTS": "personal,team-notes",
+                "OBSIDIAN_API_KEY": "shared",
+                "OBSIDIAN_PROTOCOL": "HTTP",
+                "OBSIDIAN_VAULT_TEAM_NOTES_API_KEY": "team",
+                "OBSIDIAN_VAULT_TEAM_NOTES_HOST": "10.0.0.2",
+                "OBSIDIAN_VAULT_TEAM_NOTES_HEAVY_RATE": "0.5",
+            }
+        )
+
+        assert list(vaults) == ["personal", "team-notes"]
+        personal, team = vaults.values()
+        assert (personal.api_key, personal.protocol, personal.port) == ("shared", "http", 27124)
+        assert (team.api_key, team.host) == ("team", "10.0.0.2")
+        assert team.limits == {"heavy_rate": 0.5}
+
+    def test_missing_api_key(self):
+        with pytest.raises(ValueError, match="OBSIDIAN_VAULT_ARCHIVE_API_KEY"):
+            Vault("archive", api_key="").connect()
+
+
+class TestVaultClients:
+    """Tests for routing tool calls to per-vault clients."""
+
+    def test_each_vault_has_its_own_client(self, registry):
+        personal = tools.get_client()
+        team = tools.get_client("team")
+
+        assert personal is tools.get_client("personal")
+        assert team is tools.get_client("team")
+        assert (personal.port, team.port) == (27124, 27125)
+        assert team.api_key == "team-key"
+        assert personal.outline_cache is not team.outline_cache
+        assert personal.scheduler is not team.scheduler
+
+    def test_current_vault(self, registry):
+        token = tools.current_vault.set("team")
+        try:
+            assert tools.get_client().port == 27125
+        finally:
+            tools.current_vault.reset(token)
+
+    def test_unknown_vault(self, registry):
+        with pytest.raises(ValueError, match="Unknown vault: work"):
+            tools.get_client("work")